@@ -96,7 +96,7 @@ def splitThousands(someNumber):
         errorMsg()
         return someNumber
 
-def getNASISbreakdownCounts():
+def getNASISbreakdownCounts(maxTilePedons=25000,minTileSize=0.25,maxWorkers=8):
     """ This function will send the bounding coordinates to the 'Web Export Pedon Box' NASIS report
         and return a list of pedons within the bounding coordinates.  Pedons include regular
         NASIS pedons and LAB pedons.  Each record in the report will contain the following values:
@@ -109,7 +109,16 @@ def getNASISbreakdownCounts():
         '102858': ('S1954MN161113B', '40A1695', '-93.6455002', '43.8899956','N')}
         theURL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_EXPORT_PEDON_BOX_COUNT&Lat1=44.070820&Lat2=44.596950&Long1=-91.166274&Long2=-90.311911'
 
-        returns a pedonDictionary"""
+        The world is covered with an adaptive quadtree of tiles instead of fixed 5x5 degree blocks.
+        Starting from the 4 world quadrants, the number of pedons in every tile is requested from the
+        cheap 'WEB_ANALYSIS_PC_PEDON_NUMBER_SUM' report.  A tile with more than maxTilePedons pedons is
+        split into 4 tiles (down to minTileSize degrees) that are counted again; the other tiles are
+        requested from the 'WEB_NASIS_Pedons_WFS_Metrics_AD' report.  Empty tiles are skipped.  Up to
+        maxWorkers tiles are requested at the same time.  A pedon that falls on the border of 2 tiles
+        is returned by both.  The duplicates are kept so they can be compared with the
+        WEB_PEDON_PEIID_LIST_ALL_OF_NASIS report.
+
+        returns a list of the pedonIDs of every tile (including duplicates) or False if a tile could not be requested"""
 
         #-------------------------- KSSL Pedon and Undisclosed Metrics ----------------------------------
         #------------------------------------------------------------------------------------------------
@@ -121,6 +130,67 @@ def getNASISbreakdownCounts():
         # Iterate through the getWebExportPedon function 4 times to request all pedons from NASIS and get a
         # Lab pedon and undisclosed count stricly for metrics.
 
+    def runPedonCountReport(coordinates):
+        # returns the number of pedons within the coordinates or None if the report failed
+        try:
+            URL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_ANALYSIS_PC_PEDON_NUMBER_SUM' + coordinates
+
+            """ --------------------------------------  Try connecting to NASIS to read the report ------------------------"""
+            try:
+                theReport = urllib.request.urlopen(URL).readlines()
+            except:
+                try:
+                    AddMsgAndPrint(".\t2nd attempt at requesting data")
+                    theReport = urllib.request.urlopen(URL).readlines()
+
+                except:
+                    try:
+                        AddMsgAndPrint(".\t3rd attempt at requesting data")
+                        theReport = urllib.request.urlopen(URL).readlines()
+
+                    except URLError as e:
+                        AddMsgAndPrint('URL Error' + str(e),2)
+                        return None
+
+                    except HTTPError as e:
+                        AddMsgAndPrint('HTTP Error' + str(e),2)
+                        return None
+
+                    except socket.timeout as e:
+                        AddMsgAndPrint(".\n.\t" + URL)
+                        AddMsgAndPrint(".\tServer Timeout Error", 2)
+                        return None
+
+                    except socket.error as e:
+                        AddMsgAndPrint(".\n.\t" + URL)
+                        AddMsgAndPrint(".\tNASIS Reports Website connection failure", 2)
+                        return None
+
+            """ --------------------------------------  Read the NASIS report ------------------------------------"""
+            bValidRecord = False
+
+            # START 94 STOP
+            for theValue in theReport:
+                theValue = theValue.decode('utf-8').strip()
+
+                if bValidRecord:
+                    if theValue == "STOP":
+                        break
+
+                    try:
+                        return int(theValue)
+                    except:
+                        continue
+
+                elif theValue.startswith('<div id="ReportData">START'):
+                    bValidRecord = True
+
+            return None
+
+        except:
+            errorMsg()
+            return None
+
     def runWebMetricReport(coordinates):
         try:
             #AddMsgAndPrint(".\nGetting a NASIS pedon count using the above bounding coordinates")
@@ -234,73 +304,73 @@ def getNASISbreakdownCounts():
 
         except:
             errorMsg()
-            return [0,0,0]
+            return False
 
     try:
         Starttest = tic()
 
-        latNorth = 49
-        latSouth = 24
-        longWest = -125
-        longEast = -65
-        degreeSize = 5
-
-        # list of coordinates for the 5x5 degree blocks covering the US
-        USdegreeblocks = []
-
-        # Create list of coordinates for 5x5 degree blocks for US
-        for lat in range(latSouth,latNorth,degreeSize):
-            for long in range(longWest,longEast,degreeSize):
-                USdegreeblocks.append([lat,lat+degreeSize,long,long+degreeSize])
-
-        # List of coordinates for 4 boxes around the US for the NW hemisphere
-        #NW_hemisphere = [[0,90,-179.5,longWest],[0,latSouth,longWest,-0.1],[latSouth,90,longEast,-0.1],[latNorth,90,longWest,longEast]]
-        NW_hemisphere = [[0,90,-180,longWest],[0,latSouth,longWest,0],[latSouth,90,longEast,0],[latNorth,90,longWest,longEast]]
-
-        # Lat1, Lat2, Long1, Long2 -- S,N,W,E -- NE, SW, ,SE hemishpere
-        # This represents the master list of coordinates to send to NASIS report
-        #worldQuadrant = [[0.0,90.0,0.5,179.5],[-90.0,0.0,-179.5,-0.5],[-90.0,0.0,0.5,179.5]]
-        worldQuadrant = [[0,90,0,180],[-90,0,-180,0],[-90,0,0,180]]
-
-        # Add NW Hemisphere box coordinates to worldQuadrant list
-        for coordLst in NW_hemisphere:
-            worldQuadrant.append(coordLst)
-
-        # Add US degree block coordinates to worldQuadrant list
-        for coordLst in USdegreeblocks:
-            worldQuadrant.append(coordLst)
-
-##        i=0
-##        for coord in worldQuadrant:
-##            i+=1
-##            Left = coord[2]
-##            Right = coord[3]
-##            Top = coord[1]
-##            Bottom = coord[0]
-##            outName = f"{Bottom}_{Top}_{Left}_{Right}"
-##            outFC = f"N:\\flex\\NCSS_Pedons\\NASIS_Pedons\\Web_Feature_Service\\degreeBlocks\\quad_{outName}.shp"
-##            origin_coord = f"{Left} {Bottom}"
-##            y_axis_coord = f"{Left} {Bottom + 10}"
-##            cell_width = abs(Left - Right)
-##            cell_height = abs(Top - Bottom)
-##            rows = 0
-##            columns = 0
-##            corner_coord = f"{Right} {Top}"
-##            template = f"{Left} {Bottom} {Right} {Top}"
-##            arcpy.CreateFishnet_management(outFC,origin_coord,y_axis_coord,cell_width,cell_height,rows,columns,corner_coord,'NO_LABELS',template,"POLYGON")
-
-        undisclosedLabRecs = 0
-        disclosedLabRecs = 0
-        undisclosedNASISrecs = 0
-        disclosedNASISrecs = 0
-        TOTAL = 0
-
-        peIIDlist = list()
+        # Lat1, Lat2, Long1, Long2 -- S,N,W,E -- NE, NW, SW, SE quadrants of the world
+        worldQuadrant = [[0,90,0,180],[0,90,-180,0],[-90,0,-180,0],[-90,0,0,180]]
+
+        peIIDlist = list()          # pedonIDs returned by every tile including border duplicates
+        numOfCountReports = 0
+        metricTiles = list()        # [coordinates, coordinate string, pedonIDs] of every tile requested from the metric report
+        bFailed = False
+
+        def coordinateString(coordLst):
+            return f"&Lat1={coordLst[0]}&Lat2={coordLst[1]}&Long1={coordLst[2]}&Long2={coordLst[3]}"
+
+        with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+
+            # {future:('count' or 'metric',coordinates)}
+            futures = {executor.submit(runPedonCountReport,coordinateString(coordLst)):('count',coordLst) for coordLst in worldQuadrant}
+
+            while futures:
+                done,notDone = wait(list(futures), return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    reportType,coordLst = futures.pop(future)
+                    coordStr = coordinateString(coordLst)
+
+                    if reportType == 'count':
+                        numOfCountReports += 1
+                        numOfPedons = future.result()
+
+                        if numOfPedons is None:
+                            AddMsgAndPrint(f".\tFailed to get a pedon count for {coordStr}",2)
+                            bFailed = True
+
+                        elif numOfPedons == 0:
+                            continue
+
+                        # Too many pedons for 1 metric report; split the tile into 4
+                        elif numOfPedons > maxTilePedons and (coordLst[1] - coordLst[0]) / 2 >= minTileSize:
+                            midLat = (coordLst[0] + coordLst[1]) / 2
+                            midLong = (coordLst[2] + coordLst[3]) / 2
+
+                            for tile in ([coordLst[0],midLat,coordLst[2],midLong],[coordLst[0],midLat,midLong,coordLst[3]],
+                                         [midLat,coordLst[1],coordLst[2],midLong],[midLat,coordLst[1],midLong,coordLst[3]]):
+                                futures[executor.submit(runPedonCountReport,coordinateString(tile))] = ('count',tile)
+
+                        else:
+                            futures[executor.submit(runWebMetricReport,coordStr)] = ('metric',coordLst)
+
+                    else:
+                        pedonCounts = future.result()
+
+                        if pedonCounts is False:
+                            AddMsgAndPrint(f".\tFailed to get pedon metrics for {coordStr}",2)
+                            bFailed = True
+                            continue
+
+                        print(f"Ran report on {coordStr}: {len(pedonCounts)} pedons")
+                        metricTiles.append([coordLst,coordStr,pedonCounts])
+                        peIIDlist.extend(pedonCounts)
+
+        # Create a block shapefile of every tile that was requested from the metric report
         outFCs = list()
 
-        # Gather global metrics w/out using US degree blocks.
-        for coordLst in worldQuadrant:
-            coordStr = f"&Lat1={coordLst[0]}&Lat2={coordLst[1]}&Long1={coordLst[2]}&Long2={coordLst[3]}"
+        for coordLst,coordStr,pedonCounts in metricTiles:
 
             Left = coordLst[2]
             Right = coordLst[3]
@@ -323,8 +393,6 @@ def getNASISbreakdownCounts():
             arcpy.AddField_management(outFC,"num_pedons","LONG","#","#","#","Number of Pedons")
             arcpy.AddField_management(outFC,"duplic_ids","LONG","#","#","#","Number of duplicates")
 
-            print(f"Running report on {coordStr}")
-            pedonCounts = runWebMetricReport(coordStr)
             duplicateIDS = len(pedonCounts) - len(list(set(pedonCounts)))
 
             arcpy.CalculateField_management(outFC,"coord_str",r'"' + coordStr + r'"',"PYTHON3")
@@ -333,23 +401,17 @@ def getNASISbreakdownCounts():
             arcpy.CalculateField_management(outFC,"duplic_ids",duplicateIDS,"PYTHON3")
             outFCs.append(outFC)
 
-            for id in pedonCounts:
-                peIIDlist.append(id)
-
-##            undisclosedLabRecs+=pedonCounts[0]
-##            disclosedLabRecs+=pedonCounts[1]
-##            undisclosedNASISrecs+=pedonCounts[2]
-##            disclosedNASISrecs+=pedonCounts[3]
-##
-##            TOTAL+=pedonCounts[4]
-##            if pedonCounts[5]:
-##                exit()
-
         print("Merging Block_grids")
         arcpy.Merge_management(outFCs,f"N:\\flex\\NCSS_Pedons\\NASIS_Pedons\\Web_Feature_Service\\degreeBlocks\\All_Blocks.shp")
 
+        AddMsgAndPrint(f".\n{splitThousands(numOfCountReports)} pedon count reports and {splitThousands(len(metricTiles))} metric reports were run")
+        AddMsgAndPrint(f".\t{splitThousands(len(peIIDlist) - len(set(peIIDlist)))} pedons on tile borders were returned more than once")
+
         print(toc(Starttest))
-        #return [undisclosedLabRecs,disclosedLabRecs,undisclosedNASISrecs,disclosedNASISrecs,TOTAL]
+
+        if bFailed:
+            return False
+
         return peIIDlist
 
     except:
@@ -463,7 +525,7 @@ from collections import deque
 from urllib.error import HTTPError, URLError
 from urllib.request import Request
 
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
 
 if __name__ == '__main__':
 
@@ -476,6 +538,11 @@ if __name__ == '__main__':
         allPedons = True
 
         boxCountIDs = getNASISbreakdownCounts()
+
+        if boxCountIDs is False:
+            AddMsgAndPrint("\nFailed to request every tile of the WEB_NASIS_Pedons_WFS_Metrics_AD report; the reports cannot be compared",2)
+            exit()
+
         boxCountIdsSet = list(set(boxCountIDs))
 
         boxCountIDsDuplicateNum = len(boxCountIDs) - len(boxCountIdsSet)
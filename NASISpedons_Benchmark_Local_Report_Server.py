@@ -0,0 +1,313 @@
+#-------------------------------------------------------------------------------
+# Name:  NASISpedons_Benchmark_Local_Report_Server.py
+#
+# Author: Adolfo.Diaz
+# e-mail: adolfo.diaz@wi.usda.gov
+# phone: 608.662.4422 ext. 216
+#
+# Created:     10/18/2026
+# Copyright:   (c) Adolfo.Diaz 2026
+#
+# End-to-end throughput benchmark of the pedon extraction script against the local
+# stand-in NASIS Reports website (NASISpedons_Local_Report_Server.py).  No requests are
+# sent to nasis.sc.egov.usda.gov; the NASIS session of the extraction script is given a
+# transport adapter that redirects every NASIS report request to the local server.
+#
+# The functions of the extraction script are used as-is and every stage is timed separately:
+#
+#   ID Discovery   - WEB_PEDON_PEIID_LIST_ALL_OF_NASIS        (getDictionaryOfAllPedonIDs)
+#   Box Discovery  - WEB_EXPORT_PEDON_BOX_COUNT for CONUS     (getNASISpedonIDsByBox)
+#   Download       - WEB_AnalysisPC_MAIN_URL_EXPORT reports   (getNASISreport; network only)
+#   Organize       - organizing the downloaded reports        (organizeFutureInstanceIntoPedonDict; parse only)
+#   Fetch Engine   - fetchPedonReports in streaming and non-streaming mode and with parser
+#                    processes (download + organize)
+#
+# and reported as pedons per second.  Results can be appended to a CSV file to track
+# throughput across changes.  The server settings are deterministic (seeded) so runs
+# with the same settings are comparable.
+#
+# This script must be run from the ArcGIS Pro python environment (arcpy and requests):
+#
+#   python NASISpedons_Benchmark_Local_Report_Server.py --pedons 20000 --sample 5000 --latency 0.2 --results benchmark.csv
+
+# Import modules
+import sys, os, traceback, time, asyncio, argparse, importlib.util, csv, requests, multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0,os.path.dirname(os.path.abspath(__file__)))
+import NASISpedons_Local_Report_Server as localServer
+
+nasisReportsURL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx'
+
+## ===================================================================================
+def AddMsgAndPrint(msg, severity=0):
+    # prints message to screen
+    try:
+        print(msg)
+    except:
+        pass
+
+## ===================================================================================
+def errorMsg():
+    try:
+
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        theMsg = "\t" + traceback.format_exception(exc_type, exc_value, exc_traceback)[1] + "\n\t" + traceback.format_exception(exc_type, exc_value, exc_traceback)[-1]
+
+        if theMsg.find("exit") > -1:
+            AddMsgAndPrint("\n\n")
+            pass
+        else:
+            AddMsgAndPrint(theMsg,2)
+
+    except:
+        AddMsgAndPrint("Unhandled error in unHandledException method", 2)
+        pass
+
+## ===================================================================================
+class LocalReportsAdapter(requests.adapters.HTTPAdapter):
+    """ Transport adapter that sends NASIS report requests to the local report server
+        instead of the NASIS Reports website."""
+
+    def __init__(self,localReportsURL,**kwargs):
+        self.localReportsURL = localReportsURL
+        requests.adapters.HTTPAdapter.__init__(self,**kwargs)
+
+    def send(self,request,**kwargs):
+        request.url = request.url.replace(nasisReportsURL,self.localReportsURL)
+        return requests.adapters.HTTPAdapter.send(self,request,**kwargs)
+
+## ===================================================================================
+def loadExtractor(scriptPath,reportSchema,localReportsURL,poolSize,timeout,tableProfile=""):
+    # Description
+    # This function will load the pedon extraction script as a module and set the global
+    # variables that its main body would normally set.  The NASIS session is pointed at the
+    # local report server and the pedon tables are taken from the report schema instead of
+    # a pedon database.  If a tableProfile is passed only the selected tables are kept, the
+    # same as a pedon database trimmed by createPedonDB.
+
+    # Parameters
+    # scriptPath - path to the pedon extraction script
+    # reportSchema - report schema from localServer.getReportSchema
+    # localReportsURL - URL of limsreport.aspx on the local report server
+    # poolSize - number of pooled connections
+    # timeout - (connect,read) timeout in seconds
+    # tableProfile - tables to extract (getPedonTableSelection); "" for all tables
+
+    # Returns
+    # the extraction script module or False if it could not be loaded
+
+    try:
+        spec = importlib.util.spec_from_file_location("nasisPedonExtractor",scriptPath)
+        extractor = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = extractor   # parser processes look up its functions by module name
+        spec.loader.exec_module(extractor)
+
+        session = extractor.createNASISsession(poolSize)
+        session.mount(nasisReportsURL,LocalReportsAdapter(localReportsURL,pool_connections=1,pool_maxsize=poolSize,pool_block=True))
+
+        extractor.nasisSession = session
+        extractor.nasisTimeout = timeout
+        extractor.prefix = ""
+        extractor.textFilePath = ""
+        extractor.tableSelection = extractor.getPedonTableSelection(tableProfile)
+        extractor.tableFldDict = {table:[info[0],len(info[1]),[field[0] for field in info[1]],[extractor.getValueConverter(field[1]) for field in info[1]]] for table,info in reportSchema.items()
+                                  if not extractor.tableSelection or table in extractor.tableSelection}
+        extractor.pedonTableTree = extractor.getPedonTableTree(extractor.tableFldDict)
+        extractor.reportCache = None
+        extractor.reportArchive = None
+        extractor.reportTransferStats = list()
+        extractor.fetchBatchStats = list()
+        extractor.pedonRowCounts = extractor.PedonRowCounts()
+        resetPedonTables(extractor)
+
+        return extractor
+
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+def resetPedonTables(extractor):
+    # Empties the pedon tables of the extraction script between stages
+    extractor.pedonDBtablesDict = extractor.createPedonTableBuffers(extractor.tableFldDict)
+
+## ===================================================================================
+def runStage(stageName,stageFunction,results):
+    # Description
+    # Runs a benchmark stage and records its throughput.
+
+    # Parameters
+    # stageName - name of the stage reported in the results
+    # stageFunction - callable that runs the stage and returns the number of pedons processed
+    # results - list that the (stage, pedons, seconds, pedons/sec) results are appended to
+
+    # Returns
+    # the number of pedons processed by the stage
+
+    try:
+        AddMsgAndPrint(f"\nRunning {stageName}")
+        startTime = time.perf_counter()
+        numOfPedons = stageFunction()
+        seconds = time.perf_counter() - startTime
+
+        pedonsPerSec = numOfPedons / seconds if seconds else 0
+        results.append((stageName,numOfPedons,round(seconds,3),round(pedonsPerSec,1)))
+        AddMsgAndPrint(f"\t{numOfPedons:,} pedons in {seconds:.2f} seconds ({pedonsPerSec:,.1f} pedons/sec)")
+        return numOfPedons
+
+    except:
+        errorMsg()
+        return 0
+
+## ===================================================================================
+def downloadReports(extractor,URLlist,poolSize):
+    # Downloads the raw pedon reports without organizing them; failed requests are skipped
+
+    def download(url):
+        try:
+            return extractor.getNASISreport(url)
+        except requests.exceptions.RequestException:
+            return None
+
+    with ThreadPoolExecutor(max_workers=poolSize) as executor:
+        return [theReport for theReport in executor.map(download,URLlist) if theReport is not None]
+
+## ===================================================================================
+def organizeReports(extractor,theReports):
+    # Organizes downloaded pedon reports into the pedon tables; returns the number of pedons organized
+    resetPedonTables(extractor)
+    for theReport in theReports:
+        extractor.organizeFutureInstanceIntoPedonDict(theReport)
+    return len(extractor.pedonDBtablesDict['pedon'])
+
+## ===================================================================================
+def runFetchEngine(extractor,URLlist,settings,bStream,parseProcesses=0):
+    # Runs the fetch engine of the extraction script; returns the number of pedons organized
+    resetPedonTables(extractor)
+    extractor.reportTransferStats = list()
+    extractor.fetchBatchStats = list()
+    extractor.pedonRowCounts = extractor.PedonRowCounts()
+    controller = extractor.AIMDController(settings['initialRequestsInFlight'],1,settings['maxRequestsInFlight'],settings['latencyTarget'])
+    unrecoverablePedons,poisonPedons = asyncio.run(extractor.fetchPedonReports(URLlist,controller,4,100,baseDelay=0.5,maxDelay=5,bStream=bStream,parseProcesses=parseProcesses))
+
+    if unrecoverablePedons or poisonPedons:
+        AddMsgAndPrint(f"\t{len(unrecoverablePedons):,} unrecoverable pedons; {len(poisonPedons):,} poison pedons")
+
+    return len(extractor.pedonDBtablesDict['pedon'])
+
+## ===================================================================================
+def writeResults(resultsFile,results,settings):
+    # Appends the benchmark results and the settings they were run with to a CSV file
+    try:
+        bNewFile = not os.path.exists(resultsFile)
+        runTime = time.strftime("%Y-%m-%d %H:%M:%S")
+        settingsStr = ";".join([f"{key}={settings[key]}" for key in sorted(settings) if not key in ('templateDB','results')])
+
+        with open(resultsFile,'a',newline='') as f:
+            writer = csv.writer(f)
+            if bNewFile:
+                writer.writerow(['run','script','stage','pedons','seconds','pedons_per_sec','settings'])
+            for stage,numOfPedons,seconds,pedonsPerSec in results:
+                writer.writerow([runTime,os.path.basename(settings['script']),stage,numOfPedons,seconds,pedonsPerSec,settingsStr])
+
+        AddMsgAndPrint(f"\nResults were appended to {resultsFile}")
+
+    except:
+        errorMsg()
+
+# =========================================== Main Body ==========================================
+if __name__ == '__main__':
+
+    try:
+        scriptFolder = os.path.dirname(os.path.abspath(__file__))
+
+        parser = argparse.ArgumentParser(description="Benchmark the pedon extraction script against the local NASIS report server")
+        parser.add_argument('--script',default=os.path.join(scriptFolder,"NASISpedons_Extract_Pedons_from_NASIS _MultiThreading_ArcGISPro_SQL.py"),help="pedon extraction script to benchmark")
+        parser.add_argument('--template',dest='templateDB',default=localServer.defaultSettings['templateDB'])
+        parser.add_argument('--pedons',type=int,default=20000,help="number of synthetic pedons served")
+        parser.add_argument('--sample',type=int,default=5000,help="number of pedons requested in the download and fetch stages")
+        parser.add_argument('--latency',type=float,default=localServer.defaultSettings['latency'])
+        parser.add_argument('--latency-per-pedon',dest='latencyPerPedon',type=float,default=localServer.defaultSettings['latencyPerPedon'])
+        parser.add_argument('--slow-request-rate',dest='slowRequestRate',type=float,default=localServer.defaultSettings['slowRequestRate'])
+        parser.add_argument('--http-error-rate',dest='httpErrorRate',type=float,default=0.0)
+        parser.add_argument('--drop-rate',dest='dropRate',type=float,default=0.0)
+        parser.add_argument('--poison-rate',dest='poisonRate',type=float,default=0.0)
+        parser.add_argument('--max-requests',dest='maxRequestsInFlight',type=int,default=16)
+        parser.add_argument('--initial-requests',dest='initialRequestsInFlight',type=int,default=4)
+        parser.add_argument('--latency-target',dest='latencyTarget',type=float,default=120)
+        parser.add_argument('--parse-processes',dest='parseProcesses',type=int,default=2,help="number of parser processes of the parse stage; 0 to skip the stage")
+        parser.add_argument('--tables',dest='tableProfile',default='',help="tables to extract: a profile (morphology, lab) or a comma separated list of tables; all tables by default")
+        parser.add_argument('--results',default='',help="CSV file that the results are appended to")
+        settings = vars(parser.parse_args())
+
+        serverSettings = {key:settings[key] for key in ('templateDB','pedons','latency','latencyPerPedon','slowRequestRate','httpErrorRate','dropRate','poisonRate')}
+        serverSettings['port'] = 0   # any free port
+
+        server = localServer.startLocalReportServer(serverSettings)
+        if not server:
+            exit()
+
+        AddMsgAndPrint(f"\nServing {len(server.pedons.pedonIDs):,} synthetic pedons at {server.reportsURL}")
+
+        extractor = loadExtractor(settings['script'],server.pedons.reportSchema,server.reportsURL,settings['maxRequestsInFlight'],(15,300),settings['tableProfile'])
+        if not extractor:
+            exit()
+
+        results = list()
+
+        """ ------------------------------------------ Pedon ID Discovery ------------------------------------------"""
+        discoveredPedons = dict()
+        def discoverAllPedons():
+            discoveredPedons.update(extractor.getDictionaryOfAllPedonIDs() or {})
+            return len(discoveredPedons)
+
+        runStage("ID Discovery",discoverAllPedons,results)
+        runStage("Box Discovery",lambda: len(extractor.getNASISpedonIDsByBox("&Lat1=24&Lat2=49&Long1=-125&Long2=-65") or {}),results)
+
+        if not discoveredPedons:
+            AddMsgAndPrint("\nNo pedons were discovered; the remaining stages were skipped",2)
+            exit()
+
+        """ ------------------------------------------ Pedon Requests ------------------------------------------"""
+        samplePedons = list(discoveredPedons)[:settings['sample']]
+        extractor.pedonDict = extractor.PedonIndex(samplePedons)
+        listOfPedonStrings,numOfPedonStrings = extractor.parsePedonsIntoLists(samplePedons)
+
+        extractor.URLlist = [nasisReportsURL + '?report_name=WEB_AnalysisPC_MAIN_URL_EXPORT&pedonid_list=' + pedonString for pedonString in listOfPedonStrings]
+        extractor.numOfPedonStrings = numOfPedonStrings
+        extractor.i = 1
+
+        theReports = list()
+        def download():
+            theReports.extend(downloadReports(extractor,extractor.URLlist,settings['maxRequestsInFlight']))
+            return len(samplePedons)
+
+        runStage("Download",download,results)
+        runStage("Organize",lambda: organizeReports(extractor,theReports),results)
+        del theReports[:]
+
+        runStage("Fetch Engine (stream)",lambda: runFetchEngine(extractor,extractor.URLlist,settings,True),results)
+        runStage("Fetch Engine",lambda: runFetchEngine(extractor,extractor.URLlist,settings,False),results)
+
+        # Spawned processes cannot import the extraction script by its module name
+        if settings['parseProcesses'] and multiprocessing.get_start_method() == 'fork':
+            runStage("Fetch Engine (parse)",lambda: runFetchEngine(extractor,extractor.URLlist,settings,False,settings['parseProcesses']),results)
+        elif settings['parseProcesses']:
+            AddMsgAndPrint("\nThe Fetch Engine (parse) stage needs the 'fork' start method; it was skipped",1)
+
+        """ ------------------------------------------ Report Results ------------------------------------------"""
+        AddMsgAndPrint(f"\n{'Stage' : <25}{'Pedons' : >10}{'Seconds' : >12}{'Pedons/sec' : >14}")
+        AddMsgAndPrint("=" * 61)
+        for stage,numOfPedons,seconds,pedonsPerSec in results:
+            AddMsgAndPrint(f"{stage : <25}{numOfPedons : >10,}{seconds : >12,.2f}{pedonsPerSec : >14,.1f}")
+
+        AddMsgAndPrint(f"\nServer: {server.stats}")
+
+        if settings['results']:
+            writeResults(settings['results'],results,settings)
+
+        server.shutdown()
+
+    except:
+        errorMsg()
@@ -113,31 +113,27 @@ def getDictionaryOfAllPedonIDs():
 
         """ --------------------------------------  Try connecting to NASIS to read the report ------------------------"""
         try:
-            theReport = urllib.request.urlopen(URL).readlines()
+            theReport = getNASISreport(URL)
         except:
             try:
                 AddMsgAndPrint("\t2nd attempt at requesting data")
-                theReport = urllib.request.urlopen(URL).readlines()
+                theReport = getNASISreport(URL)
 
             except:
                 try:
                     AddMsgAndPrint("\t3rd attempt at requesting data")
-                    theReport = urllib.request.urlopen(URL).readlines()
+                    theReport = getNASISreport(URL)
 
-                except URLError as e:
-                    AddMsgAndPrint('URL Error' + str(e),2)
-                    return False
-
-                except HTTPError as e:
+                except requests.exceptions.HTTPError as e:
                     AddMsgAndPrint('HTTP Error' + str(e),2)
                     return False
 
-                except socket.timeout as e:
+                except requests.exceptions.Timeout as e:
                     AddMsgAndPrint("\n\t" + URL)
                     AddMsgAndPrint("\tServer Timeout Error", 2)
                     return False
 
-                except socket.error as e:
+                except requests.exceptions.ConnectionError as e:
                     AddMsgAndPrint("\n\t" + URL)
                     AddMsgAndPrint("\tNASIS Reports Website connection failure", 2)
                     return False
@@ -220,31 +216,27 @@ def getNASISbreakdownCounts():
 
             """ --------------------------------------  Try connecting to NASIS to read the report ------------------------"""
             try:
-                theReport = urllib.request.urlopen(URL).readlines()
+                theReport = getNASISreport(URL)
             except:
                 try:
                     AddMsgAndPrint(".\t2nd attempt at requesting data")
-                    theReport = urllib.request.urlopen(URL).readlines()
+                    theReport = getNASISreport(URL)
 
                 except:
                     try:
                         AddMsgAndPrint(".\t3rd attempt at requesting data")
-                        theReport = urllib.request.urlopen(URL).readlines()
-
-                    except URLError as e:
-                        AddMsgAndPrint('URL Error' + str(e),2)
-                        return False
+                        theReport = getNASISreport(URL)
 
-                    except HTTPError as e:
+                    except requests.exceptions.HTTPError as e:
                         AddMsgAndPrint('HTTP Error' + str(e),2)
                         return False
 
-                    except socket.timeout as e:
+                    except requests.exceptions.Timeout as e:
                         AddMsgAndPrint(".\n.\t" + URL)
                         AddMsgAndPrint(".\tServer Timeout Error", 2)
                         return False
 
-                    except socket.error as e:
+                    except requests.exceptions.ConnectionError as e:
                         AddMsgAndPrint(".\n.\t" + URL)
                         AddMsgAndPrint(".\tNASIS Reports Website connection failure", 2)
                         return False
@@ -1046,6 +1038,84 @@ def getObjectSize(obj, handlers={}, verbose=False):
         errorMsg()
         pass
 
+## ===================================================================================
+def createNASISsession(poolSize=16):
+    # Description
+    # This function will create a single HTTP session that is shared by every NASIS report
+    # request in this script.  Before, every request went through urllib.request.urlopen which
+    # opened (and TLS negotiated) a brand new connection to the NASIS Reports website.  The
+    # session keeps a bounded pool of keep-alive connections that are reused by all threads.
+    # The urllib3 connection pool behind the session is thread-safe; the session is only ever
+    # used for GET requests so no cookies or headers are modified once it is created.
+
+    # Parameters
+    # poolSize - maximum number of keep-alive connections kept open to the NASIS Reports website.
+    #            Threads requesting a connection when all of them are in use will wait (pool_block)
+    #            instead of opening additional connections.
+
+    # Returns
+    # a requests.Session object
+
+    try:
+        session = requests.Session()
+        session.headers['Accept-Encoding'] = 'gzip, deflate'   # reports are repetitive text; compress them in transit
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=poolSize, pool_block=True)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+def getNASISreport(URL):
+    # Description
+    # This function will request a NASIS report using the shared NASIS session and return
+    # the lines of the report.  It is a drop-in replacement for urllib.request.urlopen(URL).readlines()
+
+    # Parameters
+    # URL - the NASIS report URL including all of its parameters
+
+    # Returns
+    # A list of lines (bytes) from the report.  requests exceptions are raised and are
+    # expected to be handled by the calling function.
+
+    response = nasisSession.get(URL, timeout=nasisTimeout)
+    response.raise_for_status()
+    return response.content.splitlines()
+
+## ===================================================================================
+def summarizeReportTransfer(transferStats):
+    # Description
+    # This function will report the number of bytes that were received from NASIS for the pedon
+    # requests.  Reports are requested with gzip/deflate compression; the number of bytes sent over
+    # the wire (compressed) is compared to the number of bytes after decompression.
+
+    # Parameters
+    # transferStats - list of (number of pedons, compressed bytes, uncompressed bytes, content encoding)
+    #                 tuples; one for every pedon request.
+
+    # Returns
+    # Nothing
+
+    try:
+        if not transferStats:
+            return
+
+        compressedBytes = sum([stat[1] for stat in transferStats])
+        uncompressedBytes = sum([stat[2] for stat in transferStats])
+        numOfCompressed = len([stat for stat in transferStats if stat[3] in ('gzip','deflate')])
+
+        AddMsgAndPrint(f"\nReceived {splitThousands(round(compressedBytes / 1048576.0,1))} MB from NASIS for {splitThousands(len(transferStats))} requests "
+                       f"({splitThousands(round(uncompressedBytes / 1048576.0,1))} MB uncompressed)")
+
+        if uncompressedBytes:
+            AddMsgAndPrint(f"\t{splitThousands(numOfCompressed)} compressed responses; bandwidth saved: {round(100 - (compressedBytes / uncompressedBytes * 100),1)}%")
+
+    except:
+        errorMsg()
+
 ## ===================================================================================
 def openURL(url):
     # Description
@@ -1087,34 +1157,201 @@ def openURL(url):
         if not i == len(URLlist):
             i+=1  # request number
 
-        response = urllib.request.urlopen(url)
+        response = nasisSession.get(url, timeout=nasisTimeout)
         arcpy.SetProgressorLabel("")
 
-        if response.code == 200:
-            return response.readlines()
+        if response.status_code == 200:
+            theReport = response.content
+            reportTransferStats.append((numOfPedonsInThisString,response.raw.tell(),len(theReport),response.headers.get('Content-Encoding','identity')))
+            return theReport.splitlines()
         else:
             AddMsgAndPrint("\nFailed to open URL: " + str(url),2)
             return None
 
-    except URLError as e:
-        AddMsgAndPrint('\tURL Error' + str(e),2)
-        return None
-
-    except HTTPError as e:
+    except requests.exceptions.HTTPError as e:
         AddMsgAndPrint('\tHTTP Error' + str(e),2)
         return None
 
-    except socket.timeout as e:
+    except requests.exceptions.Timeout as e:
         AddMsgAndPrint("\tServer Timeout Error", 2)
         return None
 
-    except socket.error as e:
+    except requests.exceptions.ConnectionError as e:
         AddMsgAndPrint("\tNASIS Reports Website connection failure", 2)
         return None
 
-    except errorMsg():
+    except:
+        errorMsg()
         return None
 
+## ===================================================================================
+def fetchPedonReports(URLlist,maxWorkers,hedgePercentile=95,hedgeMinSamples=10,maxHedgesInFlight=4,hedgeMode='duplicate',checkInterval=1):
+    # Description
+    # This function will request every pedon report in the URLlist and organize it into the
+    # pedonDBtablesDict.  It replaces the ThreadPoolExecutor/as_completed loop in which the last
+    # few requests of an all-pedon run regularly took several times longer than the rest and
+    # the entire run waited on them.
+    #
+    # No more than maxWorkers requests are in flight at one time.  The latency of every completed
+    # request is tracked.  Once hedgeMinSamples requests have completed, any request that has been
+    # in flight longer than the hedgePercentile latency is hedged (only once):
+    #   'duplicate' - the same request is sent again
+    #   'split'     - the pedons of the request are split in half and sent as 2 requests
+    # Whichever copy completes first is organized; the response of the other copy is ignored.
+    # Hedged requests use their own threads (up to maxHedgesInFlight) so they do not wait behind
+    # requests that have not been sent yet.  The copy that lost keeps its thread until NASIS
+    # responds but the run does not wait for it once every batch is complete.
+
+    # Parameters
+    # URLlist - list of pedon report URLs to request
+    # maxWorkers - max number of requests (not counting hedges) sent to NASIS at one time
+    # hedgePercentile - latency percentile of completed requests after which a request is hedged
+    # hedgeMinSamples - number of completed requests needed before any request is hedged
+    # maxHedgesInFlight - max number of hedged requests sent to NASIS at one time
+    # hedgeMode - 'duplicate' or 'split'
+    # checkInterval - seconds between checks for slow requests
+
+    # Returns
+    # list of pedonIDs from requests that failed.  The pedonDBtablesDict is populated by
+    # organizeFutureInstanceIntoPedonDict
+
+    try:
+        pendingURLs = deque(URLlist)
+        latencies = list()          # latency of every completed request
+        failedPedons = list()
+
+        # Every URL is a batch.  A batch has 1 or 2 sets of requests: the original request and
+        # the hedge.  A batch is complete when all of the requests of one of its sets are complete.
+        # {batchID:{'url':url,'start':time,'sets':[{'urls':[url],'results':{},'failed':False}],'done':False}}
+        batches = dict()
+        futureInfo = dict()         # {future:(batchID,set index,url)}
+        numOfBatches = 0
+        primaryInFlight = 0
+        hedgesInFlight = 0
+        numOfHedges = 0
+        numOfHedgesWon = 0
+
+        def submitRequest(batchID,setIndex,url):
+            futureInfo[executor.submit(openURL,url)] = (batchID,setIndex,url)
+
+        # The executor is not used as a context manager b/c that waits for every thread to finish,
+        # including requests that lost to their hedge.  Their responses are not needed.
+        executor = ThreadPoolExecutor(max_workers=maxWorkers + maxHedgesInFlight)
+
+        while pendingURLs or not all([batch['done'] for batch in batches.values()]):
+
+            # Keep maxWorkers requests in flight
+            while pendingURLs and primaryInFlight < maxWorkers:
+                url = pendingURLs.popleft()
+                batchID = numOfBatches
+                numOfBatches += 1
+                batches[batchID] = {'url':url,'start':time.time(),'sets':[{'urls':[url],'results':{},'failed':False}],'done':False}
+                submitRequest(batchID,0,url)
+                primaryInFlight += 1
+
+            done,notDone = wait(list(futureInfo), timeout=checkInterval, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                batchID,setIndex,url = futureInfo.pop(future)
+                batch = batches[batchID]
+
+                if setIndex == 0:
+                    primaryInFlight -= 1
+                else:
+                    hedgesInFlight -= 1
+
+                try:
+                    theReport = future.result()
+                except:
+                    theReport = None
+
+                # The other copy of this batch already completed
+                if batch['done']:
+                    continue
+
+                requestSet = batch['sets'][setIndex]
+
+                if theReport is None:
+                    requestSet['failed'] = True
+
+                    # Wait for the other copy if it is still in flight
+                    if not all([theSet['failed'] for theSet in batch['sets']]):
+                        continue
+
+                    batch['done'] = True
+                    failedPedons.extend(batch['url'].split('=')[2].split(','))
+                    arcpy.SetProgressorPosition()
+                    continue
+
+                requestSet['results'][url] = theReport
+
+                # A split hedge is complete once both halves are received
+                if requestSet['failed'] or len(requestSet['results']) < len(requestSet['urls']):
+                    continue
+
+                batch['done'] = True
+                latencies.append(time.time() - batch['start'])
+
+                if setIndex > 0:
+                    numOfHedgesWon += 1
+
+                for theReport in requestSet['results'].values():
+                    organizeFutureInstanceIntoPedonDict(theReport)
+
+                arcpy.SetProgressorPosition()
+
+            # forget completed batches once none of their requests are in flight
+            batchesInFlight = set([info[0] for info in futureInfo.values()])
+            for batchID in [batchID for batchID,batch in batches.items() if batch['done'] and not batchID in batchesInFlight]:
+                del batches[batchID]
+
+            """ --------------------------------- Hedge slow requests ------------------------------------"""
+            if len(latencies) < hedgeMinSamples:
+                continue
+
+            orderedLatencies = sorted(latencies)
+            hedgeLatency = orderedLatencies[int(hedgePercentile / 100.0 * (len(orderedLatencies) - 1))]
+            now = time.time()
+
+            for batchID,batch in batches.items():
+
+                if hedgesInFlight >= maxHedgesInFlight:
+                    break
+
+                if batch['done'] or len(batch['sets']) > 1 or now - batch['start'] <= hedgeLatency:
+                    continue
+
+                pedonIDs = batch['url'].split('=')[2].split(',')
+
+                if hedgeMode == 'split' and len(pedonIDs) > 1:
+                    baseURL = batch['url'][:batch['url'].find('pedonid_list=') + len('pedonid_list=')]
+                    half = len(pedonIDs) // 2
+                    hedgeURLs = [baseURL + ",".join(pedonIDs[:half]),baseURL + ",".join(pedonIDs[half:])]
+                else:
+                    hedgeURLs = [batch['url']]
+
+                # a split hedge is 2 requests; both must fit under maxHedgesInFlight
+                if hedgesInFlight + len(hedgeURLs) > maxHedgesInFlight:
+                    continue
+
+                batch['sets'].append({'urls':hedgeURLs,'results':{},'failed':False})
+                for hedgeURL in hedgeURLs:
+                    submitRequest(batchID,1,hedgeURL)
+                    hedgesInFlight += 1
+
+                numOfHedges += 1
+
+        executor.shutdown(wait=False)
+
+        if numOfHedges:
+            AddMsgAndPrint(f"\n{splitThousands(numOfHedges)} slow requests were hedged; the hedge completed first for {splitThousands(numOfHedgesWon)} of them")
+
+        return failedPedons
+
+    except:
+        errorMsg()
+        return False
+
 ## ===================================================================================
 def addPedonReportHyperlink(pedonFC):
     # Description:
@@ -1298,7 +1535,7 @@ from arcgis.gis import GIS
 from urllib.error import HTTPError, URLError
 from urllib.request import Request
 
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
 
 if __name__ == '__main__':
 
@@ -1318,6 +1555,19 @@ if __name__ == '__main__':
         arcpy.env.parallelProcessingFactor = "100%"
         arcpy.env.overwriteOutput = True
 
+        # Connection settings for the NASIS Reports website.  All report requests share
+        # a single keep-alive session instead of opening a new connection per request.
+        maxRequestsInFlight = multiprocessing.cpu_count()  # max number of pedon requests sent to NASIS at one time
+        hedgePercentile = 95         # a pedon request slower than this percentile of completed requests is hedged
+        hedgeMinSamples = 10         # number of completed requests before any request is hedged
+        maxHedgesInFlight = 4        # max number of hedged requests sent to NASIS at one time
+        hedgeMode = 'duplicate'      # 'duplicate' resends a slow request; 'split' resends it as 2 requests of half the pedons
+        nasisPoolSize = maxRequestsInFlight + maxHedgesInFlight  # max number of pooled connections to the NASIS Reports website
+        nasisConnectTimeout = 15     # seconds to wait for a connection to be established
+        nasisReadTimeout = 300       # seconds to wait for the server to send data
+        nasisTimeout = (nasisConnectTimeout,nasisReadTimeout)
+        nasisSession = createNASISsession(nasisPoolSize)
+
         # Text file path
         textFilePath = outputFolder + os.sep + "NASIS_Pedon_WFS_logFile.txt"
         metricsTextFile = outputFolder + os.sep + "NASIS_Pedon_Metrics.txt"
@@ -1395,19 +1645,15 @@ if __name__ == '__main__':
             URLlist.append(URL)
 
         arcpy.SetProgressor("step", "Sending Pedon Requests", 0, len(URLlist), 1)
+        reportTransferStats = list()  # (# of pedons, compressed bytes, uncompressed bytes, encoding) for every request
 
-        # Create an Executor to manage all tasks.  Using the with statement creates a context
-        # manager, which ensures any stray threads or processes get cleaned up properly when done.
-        with ThreadPoolExecutor(max_workers=multiprocessing.cpu_count()) as executor:
+        # Send the pedon requests; requests that are much slower than the rest are hedged
+        failedPedons = fetchPedonReports(URLlist,maxRequestsInFlight,hedgePercentile,hedgeMinSamples,maxHedgesInFlight,hedgeMode)
 
-            # use a set comprehension to start all tasks.  This creates a future object
-            future_to_url = {executor.submit(openURL, url): url for url in URLlist}
+        if failedPedons:
+            AddMsgAndPrint("\n" + splitThousands(len(failedPedons)) + " pedons could not be retrieved from NASIS",2)
 
-            # yield future objects as they are done.
-            for future in as_completed(future_to_url):
-                #futureResults.append(future.result())
-                organizeFutureInstanceIntoPedonDict(future.result())
-                arcpy.SetProgressorPosition()
+        summarizeReportTransfer(reportTransferStats)
 
         santaPedons = 0
 
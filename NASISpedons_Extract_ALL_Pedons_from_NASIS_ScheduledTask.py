@@ -99,7 +99,7 @@ def splitThousands(someNumber):
         return someNumber
 
 ## ================================================================================================================
-def getNASISbreakdownCounts():
+def getNASISbreakdownCounts(maxTilePedons=25000,minTileSize=0.25,maxWorkers=8):
     """ This function will send the bounding coordinates to the 'Web Export Pedon Box' NASIS report
         and return a list of pedons within the bounding coordinates.  Pedons include regular
         NASIS pedons and LAB pedons.  Each record in the report will contain the following values:
@@ -112,7 +112,15 @@ def getNASISbreakdownCounts():
         '102858': ('S1954MN161113B', '40A1695', '-93.6455002', '43.8899956','N')}
         theURL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_EXPORT_PEDON_BOX_COUNT&Lat1=44.070820&Lat2=44.596950&Long1=-91.166274&Long2=-90.311911'
 
-        returns a pedonDictionary"""
+        The world is covered with an adaptive quadtree of tiles instead of fixed 5x5 degree blocks.
+        Starting from the 4 world quadrants, the number of pedons in every tile is requested from the
+        cheap 'WEB_ANALYSIS_PC_PEDON_NUMBER_SUM' report.  A tile with more than maxTilePedons pedons is
+        split into 4 tiles (down to minTileSize degrees) that are counted again; the other tiles are
+        requested from the 'WEB_NASIS_Pedons_WFS_Metrics_AD' report.  Empty tiles are skipped.  Up to
+        maxWorkers tiles are requested at the same time.  A pedon that falls on the border of 2 tiles
+        is returned by both; a set removes the duplicates.
+
+        returns a list of unique pedonIDs or False if a tile could not be requested"""
 
         #-------------------------- KSSL Pedon and Undisclosed Metrics ----------------------------------
         #------------------------------------------------------------------------------------------------
@@ -124,6 +132,63 @@ def getNASISbreakdownCounts():
         # Iterate through the getWebExportPedon function 4 times to request all pedons from NASIS and get a
         # Lab pedon and undisclosed count stricly for metrics.
 
+    def runPedonCountReport(coordinates):
+        # returns the number of pedons within the coordinates or None if the report failed
+        try:
+            URL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_ANALYSIS_PC_PEDON_NUMBER_SUM' + coordinates
+
+            """ --------------------------------------  Try connecting to NASIS to read the report ------------------------"""
+            try:
+                theReport = getNASISreport(URL)
+            except:
+                try:
+                    AddMsgAndPrint(".\t2nd attempt at requesting data")
+                    theReport = getNASISreport(URL)
+
+                except:
+                    try:
+                        AddMsgAndPrint(".\t3rd attempt at requesting data")
+                        theReport = getNASISreport(URL)
+
+                    except requests.exceptions.HTTPError as e:
+                        AddMsgAndPrint('HTTP Error' + str(e),2)
+                        return None
+
+                    except requests.exceptions.Timeout as e:
+                        AddMsgAndPrint(".\n.\t" + URL)
+                        AddMsgAndPrint(".\tServer Timeout Error", 2)
+                        return None
+
+                    except requests.exceptions.ConnectionError as e:
+                        AddMsgAndPrint(".\n.\t" + URL)
+                        AddMsgAndPrint(".\tNASIS Reports Website connection failure", 2)
+                        return None
+
+            """ --------------------------------------  Read the NASIS report ------------------------------------"""
+            bValidRecord = False
+
+            # START 94 STOP
+            for theValue in theReport:
+                theValue = theValue.decode('utf-8').strip()
+
+                if bValidRecord:
+                    if theValue == "STOP":
+                        break
+
+                    try:
+                        return int(theValue)
+                    except:
+                        continue
+
+                elif theValue.startswith('<div id="ReportData">START'):
+                    bValidRecord = True
+
+            return None
+
+        except:
+            errorMsg()
+            return None
+
     def runWebMetricReport(coordinates):
         try:
             #AddMsgAndPrint(".\nGetting a NASIS pedon count using the above bounding coordinates")
@@ -131,31 +196,27 @@ def getNASISbreakdownCounts():
 
             """ --------------------------------------  Try connecting to NASIS to read the report ------------------------"""
             try:
-                theReport = urllib.request.urlopen(URL).readlines()
+                theReport = getNASISreport(URL)
             except:
                 try:
                     AddMsgAndPrint(".\t2nd attempt at requesting data")
-                    theReport = urllib.request.urlopen(URL).readlines()
+                    theReport = getNASISreport(URL)
 
                 except:
                     try:
                         AddMsgAndPrint(".\t3rd attempt at requesting data")
-                        theReport = urllib.request.urlopen(URL).readlines()
-
-                    except URLError as e:
-                        AddMsgAndPrint('URL Error' + str(e),2)
-                        return False
+                        theReport = getNASISreport(URL)
 
-                    except HTTPError as e:
+                    except requests.exceptions.HTTPError as e:
                         AddMsgAndPrint('HTTP Error' + str(e),2)
                         return False
 
-                    except socket.timeout as e:
+                    except requests.exceptions.Timeout as e:
                         AddMsgAndPrint(".\n.\t" + URL)
                         AddMsgAndPrint(".\tServer Timeout Error", 2)
                         return False
 
-                    except socket.error as e:
+                    except requests.exceptions.ConnectionError as e:
                         AddMsgAndPrint(".\n.\t" + URL)
                         AddMsgAndPrint(".\tNASIS Reports Website connection failure", 2)
                         return False
@@ -237,108 +298,84 @@ def getNASISbreakdownCounts():
 
         except:
             errorMsg()
-            return [0,0,0]
+            return False
 
     try:
         Starttest = tic()
 
-        latNorth = 49
-        latSouth = 24
-        longWest = -125
-        longEast = -65
-        degreeSize = 5
-
-        # list of coordinates for the 5x5 degree blocks covering the US
-        USdegreeblocks = []
-
-        # Create list of coordinates for 5x5 degree blocks for US
-        for lat in range(latSouth,latNorth,degreeSize):
-            for long in range(longWest,longEast,degreeSize):
-                USdegreeblocks.append([lat,lat+degreeSize,long,long+degreeSize])
-
-        # List of coordinates for 4 boxes around the US for the NW hemisphere
-        #NW_hemisphere = [[0,90,-179.5,longWest],[0,latSouth,longWest,-0.1],[latSouth,90,longEast,-0.1],[latNorth,90,longWest,longEast]]
-        NW_hemisphere = [[0,90,-180,longWest],[0,latSouth,longWest,0],[latSouth,90,longEast,0],[latNorth,90,longWest,longEast]]
-
-        # Lat1, Lat2, Long1, Long2 -- S,N,W,E -- NE, SW, ,SE hemishpere
-        # This represents the master list of coordinates to send to NASIS report
-        #worldQuadrant = [[0.0,90.0,0.5,179.5],[-90.0,0.0,-179.5,-0.5],[-90.0,0.0,0.5,179.5]]
-        worldQuadrant = [[0,90,0,180],[-90,0,-180,0],[-90,0,0,180]]
-
-        # Add NW Hemisphere box coordinates to worldQuadrant list
-        for coordLst in NW_hemisphere:
-            worldQuadrant.append(coordLst)
-
-        # Add US degree block coordinates to worldQuadrant list
-        for coordLst in USdegreeblocks:
-            worldQuadrant.append(coordLst)
-
-##        i=0
-##        for coord in worldQuadrant:
-##            i+=1
-##            Left = coord[2]
-##            Right = coord[3]
-##            Top = coord[1]
-##            Bottom = coord[0]
-##            outFC = f"N:\\flex\\NCSS_Pedons\\NASIS_Pedons\\Web_Feature_Service\\degreeBlocks\\quad_{Left}_{Right}_{Top}_{Bottom}.shp"
-##            origin_coord = f"{Left} {Bottom}"
-##            y_axis_coord = f"{Left} {Bottom + 10}"
-##            cell_width = abs(Left - Right)
-##            cell_height = abs(Top - Bottom)
-##            rows = 0
-##            columns = 0
-##            corner_coord = f"{Right} {Top}"
-##            template = f"{Left} {Bottom} {Right} {Top}"
-##            arcpy.CreateFishnet_management(outFC,origin_coord,y_axis_coord,cell_width,cell_height,rows,columns,corner_coord,'NO_LABELS',template,"POLYGON")
-
-        undisclosedLabRecs = 0
-        disclosedLabRecs = 0
-        undisclosedNASISrecs = 0
-        disclosedNASISrecs = 0
-        TOTAL = 0
-
-        peIIDlist = list()
-
-        # Gather global metrics w/out using US degree blocks.
-        for coordLst in worldQuadrant:
-            coordStr = f"&Lat1={coordLst[0]}&Lat2={coordLst[1]}&Long1={coordLst[2]}&Long2={coordLst[3]}"
-            print(f"Running report on {coordStr}")
-            pedonCounts = runWebMetricReport(coordStr)
-
-            for id in pedonCounts:
-                peIIDlist.append(id)
-
-##            undisclosedLabRecs+=pedonCounts[0]
-##            disclosedLabRecs+=pedonCounts[1]
-##            undisclosedNASISrecs+=pedonCounts[2]
-##            disclosedNASISrecs+=pedonCounts[3]
-##
-##            TOTAL+=pedonCounts[4]
-##            if pedonCounts[5]:
-##                exit()
+        # Lat1, Lat2, Long1, Long2 -- S,N,W,E -- NE, NW, SW, SE quadrants of the world
+        worldQuadrant = [[0,90,0,180],[0,90,-180,0],[-90,0,-180,0],[-90,0,0,180]]
 
-##        # Create an Executor to manage all tasks.  Using the with statement creates a context
-##        # manager, which ensures any stray threads or processes get cleaned up properly when done.
-##        with ThreadPoolExecutor(max_workers=multiprocessing.cpu_count()) as executor:
-##
-##            # use a set comprehension to start all tasks.  This creates a future object
-##            future_to_url = {executor.submit(openURL, url): url for url in URLlist}
-##
-##            # yield future objects as they are done.
-##            for future in as_completed(future_to_url):
-##                #futureResults.append(future.result())
-##                organizeFutureInstanceIntoPedonDict(future.result())
-##                arcpy.SetProgressorPosition()
+        peIIDset = set()
+        numOfIDs = 0                # pedonIDs returned by every tile including border duplicates
+        numOfCountReports = 0
+        metricTiles = list()        # [coordinates, coordinate string, pedonIDs] of every tile requested from the metric report
+        bFailed = False
+
+        def coordinateString(coordLst):
+            return f"&Lat1={coordLst[0]}&Lat2={coordLst[1]}&Long1={coordLst[2]}&Long2={coordLst[3]}"
+
+        with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+
+            # {future:('count' or 'metric',coordinates)}
+            futures = {executor.submit(runPedonCountReport,coordinateString(coordLst)):('count',coordLst) for coordLst in worldQuadrant}
+
+            while futures:
+                done,notDone = wait(list(futures), return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    reportType,coordLst = futures.pop(future)
+                    coordStr = coordinateString(coordLst)
+
+                    if reportType == 'count':
+                        numOfCountReports += 1
+                        numOfPedons = future.result()
+
+                        if numOfPedons is None:
+                            AddMsgAndPrint(f".\tFailed to get a pedon count for {coordStr}",2)
+                            bFailed = True
+
+                        elif numOfPedons == 0:
+                            continue
+
+                        # Too many pedons for 1 metric report; split the tile into 4
+                        elif numOfPedons > maxTilePedons and (coordLst[1] - coordLst[0]) / 2 >= minTileSize:
+                            midLat = (coordLst[0] + coordLst[1]) / 2
+                            midLong = (coordLst[2] + coordLst[3]) / 2
+
+                            for tile in ([coordLst[0],midLat,coordLst[2],midLong],[coordLst[0],midLat,midLong,coordLst[3]],
+                                         [midLat,coordLst[1],coordLst[2],midLong],[midLat,coordLst[1],midLong,coordLst[3]]):
+                                futures[executor.submit(runPedonCountReport,coordinateString(tile))] = ('count',tile)
+
+                        else:
+                            futures[executor.submit(runWebMetricReport,coordStr)] = ('metric',coordLst)
+
+                    else:
+                        pedonCounts = future.result()
+
+                        if pedonCounts is False:
+                            AddMsgAndPrint(f".\tFailed to get pedon metrics for {coordStr}",2)
+                            bFailed = True
+                            continue
+
+                        print(f"Ran report on {coordStr}: {len(pedonCounts)} pedons")
+                        metricTiles.append([coordLst,coordStr,pedonCounts])
+                        numOfIDs += len(pedonCounts)
+                        peIIDset.update(pedonCounts)
+        AddMsgAndPrint(f".\n{splitThousands(numOfCountReports)} pedon count reports and {splitThousands(len(metricTiles))} metric reports were run")
+        AddMsgAndPrint(f".\t{splitThousands(numOfIDs - len(peIIDset))} pedons on tile borders were returned more than once")
 
         print(toc(Starttest))
-        #return [undisclosedLabRecs,disclosedLabRecs,undisclosedNASISrecs,disclosedNASISrecs,TOTAL]
-        return peIIDlist
+
+        if bFailed:
+            return False
+
+        return list(peIIDset)
 
     except:
         errorMsg()
         return False
 
-
 ## ================================================================================================================
 def getDictionaryOfAllPedonIDs():
     # Description
@@ -360,31 +397,27 @@ def getDictionaryOfAllPedonIDs():
 
         """ --------------------------------------  Try connecting to NASIS to read the report ------------------------"""
         try:
-            theReport = urllib.request.urlopen(URL).readlines()
+            theReport = getNASISreport(URL)
         except:
             try:
                 AddMsgAndPrint(".\t2nd attempt at requesting data")
-                theReport = urllib.request.urlopen(URL).readlines()
+                theReport = getNASISreport(URL)
 
             except:
                 try:
                     AddMsgAndPrint(".\t3rd attempt at requesting data")
-                    theReport = urllib.request.urlopen(URL).readlines()
+                    theReport = getNASISreport(URL)
 
-                except URLError as e:
-                    AddMsgAndPrint('URL Error' + str(e),2)
-                    return False
-
-                except HTTPError as e:
+                except requests.exceptions.HTTPError as e:
                     AddMsgAndPrint('HTTP Error' + str(e),2)
                     return False
 
-                except socket.timeout as e:
+                except requests.exceptions.Timeout as e:
                     AddMsgAndPrint(".\n\t" + URL)
                     AddMsgAndPrint(".\tServer Timeout Error", 2)
                     return False
 
-                except socket.error as e:
+                except requests.exceptions.ConnectionError as e:
                     AddMsgAndPrint(".\n\t" + URL)
                     AddMsgAndPrint(".\tNASIS Reports Website connection failure", 2)
                     return False
@@ -573,30 +606,26 @@ def getNASISpedonCountbyBox(coordinates):
 
         """ --------------------------------------  Try connecting to NASIS to read the report ------------------------"""
         try:
-            theReport = urllib.request.urlopen(URL).readlines()
+            theReport = getNASISreport(URL)
         except:
             try:
                 AddMsgAndPrint(".\t2nd attempt at requesting data")
-                theReport = urllib.request.urlopen(URL).read().decode('utf-8')
+                theReport = getNASISreport(URL)
             except:
                 try:
                     AddMsgAndPrint(".\t3rd attempt at requesting data")
-                    theReport = urllib.request.urlopen(URL).read().decode('utf-8')
-
-                except URLError as e:
-                    AddMsgAndPrint('URL Error' + str(e),2)
-                    return False
+                    theReport = getNASISreport(URL)
 
-                except HTTPError as e:
+                except requests.exceptions.HTTPError as e:
                     AddMsgAndPrint('HTTP Error' + str(e),2)
                     return False
 
-                except socket.timeout as e:
+                except requests.exceptions.Timeout as e:
                     AddMsgAndPrint(".\n\t" + URL)
                     AddMsgAndPrint(".\tServer Timeout Error", 2)
                     return False
 
-                except socket.error as e:
+                except requests.exceptions.ConnectionError as e:
                     AddMsgAndPrint(".\n\t" + URL)
                     AddMsgAndPrint(".\tNASIS Reports Website connection failure (Socket Error)", 2)
                     return False
@@ -663,31 +692,27 @@ def getNASISpedonIDsByBox(coordinates):
 
         """ --------------------------------------  Try connecting to NASIS to read the report ------------------------"""
         try:
-            theReport = urllib.request.urlopen(URL).readlines()
+            theReport = getNASISreport(URL)
         except:
             try:
                 AddMsgAndPrint(".\t2nd attempt at requesting data")
-                theReport = urllib.request.urlopen(URL).readlines()
+                theReport = getNASISreport(URL)
 
             except:
                 try:
                     AddMsgAndPrint(".\t3rd attempt at requesting data")
-                    theReport = urllib.request.urlopen(URL).readlines()
-
-                except URLError as e:
-                    AddMsgAndPrint('URL Error' + str(e),2)
-                    return False
+                    theReport = getNASISreport(URL)
 
-                except HTTPError as e:
+                except requests.exceptions.HTTPError as e:
                     AddMsgAndPrint('HTTP Error' + str(e),2)
                     return False
 
-                except socket.timeout as e:
+                except requests.exceptions.Timeout as e:
                     AddMsgAndPrint(".\n\t" + URL)
                     AddMsgAndPrint(".\tServer Timeout Error", 2)
                     return False
 
-                except socket.error as e:
+                except requests.exceptions.ConnectionError as e:
                     AddMsgAndPrint(".\n\t" + URL)
                     AddMsgAndPrint(".\tNASIS Reports Website connection failure", 2)
                     return False
@@ -1494,6 +1519,52 @@ def getObjectSize(obj, handlers={}, verbose=False):
         errorMsg()
         pass
 
+## ===================================================================================
+def createNASISsession(poolSize=16):
+    # Description
+    # This function will create a single HTTP session that is shared by every NASIS report
+    # request in this script.  Before, every request went through urllib.request.urlopen which
+    # opened (and TLS negotiated) a brand new connection to the NASIS Reports website.  The
+    # session keeps a bounded pool of keep-alive connections that are reused by all threads.
+    # The urllib3 connection pool behind the session is thread-safe; the session is only ever
+    # used for GET requests so no cookies or headers are modified once it is created.
+
+    # Parameters
+    # poolSize - maximum number of keep-alive connections kept open to the NASIS Reports website.
+    #            Threads requesting a connection when all of them are in use will wait (pool_block)
+    #            instead of opening additional connections.
+
+    # Returns
+    # a requests.Session object
+
+    try:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=poolSize, pool_block=True)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+def getNASISreport(URL):
+    # Description
+    # This function will request a NASIS report using the shared NASIS session and return
+    # the lines of the report.  It is a drop-in replacement for urllib.request.urlopen(URL).readlines()
+
+    # Parameters
+    # URL - the NASIS report URL including all of its parameters
+
+    # Returns
+    # A list of lines (bytes) from the report.  requests exceptions are raised and are
+    # expected to be handled by the calling function.
+
+    response = nasisSession.get(URL, timeout=nasisTimeout)
+    response.raise_for_status()
+    return response.content.splitlines()
+
 ## ===================================================================================
 def openURL(url):
     # Description
@@ -1535,28 +1606,24 @@ def openURL(url):
         if not i == len(URLlist):
             i+=1  # request number
 
-        response = urllib.request.urlopen(url)
+        response = nasisSession.get(url, timeout=nasisTimeout)
         arcpy.SetProgressorLabel("")
 
-        if response.code == 200:
-            return response.readlines()
+        if response.status_code == 200:
+            return response.content.splitlines()
         else:
             AddMsgAndPrint(".\nFailed to open URL: " + str(url),2)
             return None
 
-    except URLError as e:
-        AddMsgAndPrint('URL Error' + str(e),2)
-        return None
-
-    except HTTPError as e:
+    except requests.exceptions.HTTPError as e:
         AddMsgAndPrint('HTTP Error' + str(e),2)
         return None
 
-    except socket.timeout as e:
+    except requests.exceptions.Timeout as e:
         AddMsgAndPrint("Server Timeout Error", 2)
         return None
 
-    except socket.error as e:
+    except requests.exceptions.ConnectionError as e:
         AddMsgAndPrint("NASIS Reports Website connection failure", 2)
         return None
 
@@ -1656,7 +1723,7 @@ from collections import deque
 from urllib.error import HTTPError, URLError
 from urllib.request import Request
 
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
 
 if __name__ == '__main__':
 
@@ -1681,6 +1748,14 @@ if __name__ == '__main__':
         arcpy.env.parallelProcessingFactor = "100%"
         arcpy.env.overwriteOutput = True
 
+        # Connection settings for the NASIS Reports website.  All report requests share
+        # a single keep-alive session instead of opening a new connection per request.
+        nasisPoolSize = 16           # max number of pooled connections to the NASIS Reports website
+        nasisConnectTimeout = 15     # seconds to wait for a connection to be established
+        nasisReadTimeout = 300       # seconds to wait for the server to send data
+        nasisTimeout = (nasisConnectTimeout,nasisReadTimeout)
+        nasisSession = createNASISsession(nasisPoolSize)
+
         textFilePath = outputFolder + os.sep + "NASIS_Pedons_ALL_Weekly_ScheduledTask_LogFile.txt"
         startTime = tic()
 
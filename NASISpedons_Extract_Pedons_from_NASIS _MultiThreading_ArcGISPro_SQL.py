@@ -1,1985 +1,4705 @@
-#-------------------------------------------------------------------------------
-# Name:  NASISpedons_Extract_Pedons_from_NASIS_Multithreading_ArcGISPro_SQL.py
-#
-# Author: Adolfo.Diaz
-# e-mail: adolfo.diaz@wi.usda.gov
-# phone: 608.662.4422 ext. 216
-#
-# Author: Jason.Nemecek
-# e-mail: jason.nemecek@wi.usda.gov
-# phone: 608.662.4422 ext. 190
-#
-# Created:     7/04/2016
-# Last Modified: 7/12/2021
-# Copyright:   (c) Adolfo.Diaz 2016
-
-# https://alexwlchan.net/2019/10/adventures-with-concurrent-futures/
-
-# ==========================================================================================
-# Updated  4/29/2021 - Adolfo Diaz
-# Major rewrite to introduce parallel tasking using concurrent.futures python
-# module.  Using this module I was able t
-
-# ==========================================================================================
-# Updated  5/26/2021 - Adolfo Diaz
-# - Changed the format in which failed pedon ids are written to the error log
-#   file.  Before the pedon IDs were logged as a continous list seperated by commas.
-#   Now, the pedon IDs are logged with a carriage return
-# - Added capability to have the Pedons automatically added to the ArcGIS Pro Session
-#   if the pedon fc has valid pedons.
-
-# ==========================================================================================
-# Updated  6/16/2021 - Adolfo Diaz
-# - Added functionality to output an SQLite Database Format
-
-# ==========================================================================================
-# Updated  7/12/2021 - Adolfo Diaz
-# - Added field within pedon layer to store pedon description hyperlink report
-
-# ==========================================================================================
-# Updated  2/8/2022 - Adolfo Diaz
-# - Addressed a bug associated with unprojected feature in the getBoundingCoordinates function
-
-# ==========================================================================================
-# Updated  3/14/2022 - Adolfo Diaz
-# - updated createReferenceObjects function to set the number of fields to 9 for the siteaoverlap
-#   table from 6.  This is b/c the metadatatable only has 6 fields and 3 additional fields are
-#   added (areasym, areaname and areatype)
-
-# ==========================================================================================
-# Updated  6/17/2022 - Adolfo Diaz
-# - Added a new function to remove potential PII from the following table/fields:
-#  .	Table Name               Field Name
-#  =============================================
-#  .	Site Observation Text    Text Entry
-#  .	Site Text                Text Entry
-#  .	Pedon Text               Text Entry
-
-#-------------------------------------------------------------------------------
-
-
-## ===================================================================================
-def AddMsgAndPrint(msg, severity=0):
-    # prints message to screen if run as a python script
-    # Adds tool message to the geoprocessor
-    #
-    #Split the message on \n first, so that if it's multiple lines, a GPMessage will be added for each line
-    try:
-        print(msg)
-
-        try:
-            f = open(textFilePath,'a+')
-            f.write(msg + " \n")
-            f.close
-            del f
-        except:
-            pass
-
-        #for string in msg.split('\n'):
-            #Add a geoprocessing message (in case this is run as a tool)
-        if severity == 0:
-            arcpy.AddMessage(msg)
-
-        elif severity == 1:
-            arcpy.AddWarning(msg)
-
-        elif severity == 2:
-            arcpy.AddError("\n" + msg)
-
-    except:
-        pass
-
-## ===================================================================================
-def errorMsg():
-    try:
-
-        exc_type, exc_value, exc_traceback = sys.exc_info()
-        theMsg = "\t" + traceback.format_exception(exc_type, exc_value, exc_traceback)[1] + "\n\t" + traceback.format_exception(exc_type, exc_value, exc_traceback)[-1]
-
-        if theMsg.find("exit") > -1:
-            AddMsgAndPrint(".\n\n")
-            pass
-        else:
-            AddMsgAndPrint(theMsg,2)
-
-    except:
-        AddMsgAndPrint("Unhandled error in unHandledException method", 2)
-        pass
-
-## ================================================================================================================
-def tic():
-    """ Returns the current time """
-
-    return time.time()
-
-## ================================================================================================================
-def toc(_start_time):
-    """ Returns the total time by subtracting the start time - finish time"""
-
-    try:
-
-        t_sec = round(time.time() - _start_time)
-        (t_min, t_sec) = divmod(t_sec,60)
-        (t_hour,t_min) = divmod(t_min,60)
-
-        if t_hour:
-            return ('{} hour(s): {} minute(s): {} second(s)'.format(int(t_hour),int(t_min),int(t_sec)))
-        elif t_min:
-            return ('{} minute(s): {} second(s)'.format(int(t_min),int(t_sec)))
-        else:
-            return ('{} second(s)'.format(int(t_sec)))
-
-    except:
-        errorMsg()
-
-## ================================================================================================================
-def splitThousands(someNumber):
-    """ will determine where to put a thousands seperator if one is needed.
-        Input is an integer.  Integer with or without thousands seperator is returned."""
-
-    try:
-        return re.sub(r'(\d{3})(?=\d)', r'\1,', str(someNumber)[::-1])[::-1]
-
-    except:
-        errorMsg()
-        return someNumber
-
-## ================================================================================================================
-def getNASISbreakdownCounts():
-    """ This function will send the bounding coordinates to the 'Web Export Pedon Box' NASIS report
-        and return a list of pedons within the bounding coordinates.  Pedons include regular
-        NASIS pedons and LAB pedons.  Each record in the report will contain the following values:
-
-            Row_Number,upedonid,peiid,pedlabsampnum,Longstddecimaldegrees,latstddecimaldegrees,Undisclosed Pedon
-            24|S1994MN161001|102861|94P0697|-93.5380936|44.0612717|'Y'
-
-        A dictionary will be returned containing something similar:
-        {'102857': ('S1954MN161113A', '40A1694', '-93.6499481', '43.8647194','Y'),
-        '102858': ('S1954MN161113B', '40A1695', '-93.6455002', '43.8899956','N')}
-        theURL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_EXPORT_PEDON_BOX_COUNT&Lat1=44.070820&Lat2=44.596950&Long1=-91.166274&Long2=-90.311911'
-
-        returns a pedonDictionary"""
-
-        #-------------------------- KSSL Pedon and Undisclosed Metrics ----------------------------------
-        #------------------------------------------------------------------------------------------------
-        # This section is only to determine how many Lab Pedons and how many undiscolsed pedons there are
-        # nationwide.  It is recommended that the WEB_EXPORT_PEDON_BOX_COUNT NASIS report in the KSSL folder
-        # be duplicated and modified such that ONLY 2 fields are returned (pedlabsampnum and location) which
-        # represent the pedon lab sample number and a boolean indicating if the pedon is undisclosed.
-        #
-        # Iterate through the getWebExportPedon function 4 times to request all pedons from NASIS and get a
-        # Lab pedon and undisclosed count stricly for metrics.
-
-    def runWebMetricReport(coordinates):
-        try:
-            #AddMsgAndPrint(".\nGetting a NASIS pedon count using the above bounding coordinates")
-            URL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_NASIS_Pedons_WFS_Metrics_AD' + coordinates
-
-            """ --------------------------------------  Try connecting to NASIS to read the report ------------------------"""
-            try:
-                theReport = urllib.request.urlopen(URL).readlines()
-            except:
-                try:
-                    AddMsgAndPrint(".\t2nd attempt at requesting data")
-                    theReport = urllib.request.urlopen(URL).readlines()
-
-                except:
-                    try:
-                        AddMsgAndPrint(".\t3rd attempt at requesting data")
-                        theReport = urllib.request.urlopen(URL).readlines()
-
-                    except URLError as e:
-                        AddMsgAndPrint('URL Error' + str(e),2)
-                        return False
-
-                    except HTTPError as e:
-                        AddMsgAndPrint('HTTP Error' + str(e),2)
-                        return False
-
-                    except socket.timeout as e:
-                        AddMsgAndPrint(".\n.\t" + URL)
-                        AddMsgAndPrint(".\tServer Timeout Error", 2)
-                        return False
-
-                    except socket.error as e:
-                        AddMsgAndPrint(".\n.\t" + URL)
-                        AddMsgAndPrint(".\tNASIS Reports Website connection failure", 2)
-                        return False
-
-            """ --------------------------------------  Read the NASIS report ------------------------------------"""
-            undisclosedLab = 0
-            disclosedLab = 0
-            undisclosedNASIS = 0
-            disclosedNASIS = 0
-            test = 0
-            bValidRecord = False # boolean that marks the starting point of the mapunits listed in the project
-
-            peiidList = list()
-
-            # iterate through the report until a valid record is found
-            for theValue in theReport:
-
-                # convert from bytes to string and remove white spaces
-                theValue = theValue.decode('utf-8').strip()
-
-                # Iterating through the lines in the report
-                if bValidRecord:
-                    if theValue == "STOP":  # written as part of the report; end of lines
-                        break
-
-                    # Found a valid project record i.e. 91P0481|N (only 2 values)
-                    else:
-                        theRec = theValue.split("|")
-
-                        if len(theRec) != 3:
-                            AddMsgAndPrint(".\tNASIS Report: WEB_NASIS_Pedons_WFS_Metrics_AD is not returning the correct amount of values per record",2)
-                            return False
-
-                        peiidList.append(theRec[0])
-                        continue
-
-                        # Go through the different combinations of metrics
-                        # Record is an undisclosed lab pedon
-                        if theRec[0] != 'Null' and theRec[1] == 'Y':
-                            undisclosedLab+= 1
-
-                        # Record is a disclosed lab pedon
-                        elif theRec[0] != 'Null' and theRec[1] == 'N':
-                            disclosedLab+=1
-
-                        # Record is an undisclosed NASIS pedon
-                        elif theRec[0] == 'Null' and theRec[1] == 'Y':
-                            undisclosedNASIS+= 1
-
-                        # Record is an disclosed NASIS pedon
-                        elif theRec[0] == 'Null' and theRec[1] == 'N':
-                            disclosedNASIS+=1
-
-                        else:
-                            AddMsgAndPrint(".\tUnaccounted for combination: " + str(theValue),1)
-                        test += 1
-
-                else:
-                    if theValue.startswith('<div id="ReportData">START'):
-                        bValidRecord = True
-
-##            bCountFailed = False
-##            if undisclosedLab + disclosedLab + undisclosedNASIS + disclosedNASIS != test:
-##                print(f"{coordinates} did not Match:")
-##                print("\t" + str(undisclosedLab))
-##                print("\t" + str(disclosedLab))
-##                print("\t" + str(undisclosedNASIS))
-##                print("\t" + str(disclosedNASIS))
-##                print("\t" + str(test))
-##                bCountFailed = True
-##
-##            if undisclosedLab == 0 and disclosedLab == 0 and undisclosedNASIS == 0 and disclosedNASIS == 0:
-##                print(f"    {coordinates} Returned empty:")
-##
-##            print(f"    {undisclosedLab},{disclosedLab},{undisclosedNASIS},{disclosedNASIS},{test},{bCountFailed}")
-##
-##            return [undisclosedLab,disclosedLab,undisclosedNASIS,disclosedNASIS,test,bCountFailed]
-            return peiidList
-
-        except:
-            errorMsg()
-            return [0,0,0]
-
-    try:
-        Starttest = tic()
-
-        latNorth = 49
-        latSouth = 24
-        longWest = -125
-        longEast = -65
-        degreeSize = 5
-
-        # list of coordinates for the 5x5 degree blocks covering the US
-        USdegreeblocks = []
-
-        # Create list of coordinates for 5x5 degree blocks for US
-        for lat in range(latSouth,latNorth,degreeSize):
-            for long in range(longWest,longEast,degreeSize):
-                USdegreeblocks.append([lat,lat+degreeSize,long,long+degreeSize])
-
-        # List of coordinates for 4 boxes around the US for the NW hemisphere
-        #NW_hemisphere = [[0,90,-179.5,longWest],[0,latSouth,longWest,-0.1],[latSouth,90,longEast,-0.1],[latNorth,90,longWest,longEast]]
-        NW_hemisphere = [[0,90,-180,longWest],[0,latSouth,longWest,0],[latSouth,90,longEast,0],[latNorth,90,longWest,longEast]]
-
-        # Lat1, Lat2, Long1, Long2 -- S,N,W,E -- NE, SW, ,SE hemishpere
-        # This represents the master list of coordinates to send to NASIS report
-        #worldQuadrant = [[0.0,90.0,0.5,179.5],[-90.0,0.0,-179.5,-0.5],[-90.0,0.0,0.5,179.5]]
-        worldQuadrant = [[0,90,0,180],[-90,0,-180,0],[-90,0,0,180]]
-
-        # Add NW Hemisphere box coordinates to worldQuadrant list
-        for coordLst in NW_hemisphere:
-            worldQuadrant.append(coordLst)
-
-        # Add US degree block coordinates to worldQuadrant list
-        for coordLst in USdegreeblocks:
-            worldQuadrant.append(coordLst)
-
-##        i=0
-##        for coord in worldQuadrant:
-##            i+=1
-##            Left = coord[2]
-##            Right = coord[3]
-##            Top = coord[1]
-##            Bottom = coord[0]
-##            outFC = f"N:\\flex\\NCSS_Pedons\\NASIS_Pedons\\Web_Feature_Service\\degreeBlocks\\quad_{Left}_{Right}_{Top}_{Bottom}.shp"
-##            origin_coord = f"{Left} {Bottom}"
-##            y_axis_coord = f"{Left} {Bottom + 10}"
-##            cell_width = abs(Left - Right)
-##            cell_height = abs(Top - Bottom)
-##            rows = 0
-##            columns = 0
-##            corner_coord = f"{Right} {Top}"
-##            template = f"{Left} {Bottom} {Right} {Top}"
-##            arcpy.CreateFishnet_management(outFC,origin_coord,y_axis_coord,cell_width,cell_height,rows,columns,corner_coord,'NO_LABELS',template,"POLYGON")
-
-        undisclosedLabRecs = 0
-        disclosedLabRecs = 0
-        undisclosedNASISrecs = 0
-        disclosedNASISrecs = 0
-        TOTAL = 0
-
-        peIIDlist = list()
-
-        # Gather global metrics w/out using US degree blocks.
-        for coordLst in worldQuadrant:
-            coordStr = f"&Lat1={coordLst[0]}&Lat2={coordLst[1]}&Long1={coordLst[2]}&Long2={coordLst[3]}"
-            print(f"Running report on {coordStr}")
-            pedonCounts = runWebMetricReport(coordStr)
-
-            for id in pedonCounts:
-                peIIDlist.append(id)
-
-##            undisclosedLabRecs+=pedonCounts[0]
-##            disclosedLabRecs+=pedonCounts[1]
-##            undisclosedNASISrecs+=pedonCounts[2]
-##            disclosedNASISrecs+=pedonCounts[3]
-##
-##            TOTAL+=pedonCounts[4]
-##            if pedonCounts[5]:
-##                exit()
-
-##        # Create an Executor to manage all tasks.  Using the with statement creates a context
-##        # manager, which ensures any stray threads or processes get cleaned up properly when done.
-##        with ThreadPoolExecutor(max_workers=multiprocessing.cpu_count()) as executor:
-##
-##            # use a set comprehension to start all tasks.  This creates a future object
-##            future_to_url = {executor.submit(openURL, url): url for url in URLlist}
-##
-##            # yield future objects as they are done.
-##            for future in as_completed(future_to_url):
-##                #futureResults.append(future.result())
-##                organizeFutureInstanceIntoPedonDict(future.result())
-##                arcpy.SetProgressorPosition()
-
-        print(toc(Starttest))
-        #return [undisclosedLabRecs,disclosedLabRecs,undisclosedNASISrecs,disclosedNASISrecs,TOTAL]
-        return peIIDlist
-
-    except:
-        errorMsg()
-        return False
-
-
-## ================================================================================================================
-def getDictionaryOfAllPedonIDs():
-    # Description
-    # This function will send a URL request to the 'Web Pedon PEIID List All of NASIS' NASIS
-    # report to obtain a list of ALL pedons in NASIS.  Pedons include regular
-    # NASIS pedons and LAB pedons.  Each record in the report will contain the following values:
-    # START 1204126, 1204127, 1204128 STOP"""
-
-    try:
-        AddMsgAndPrint(".\nRequesting a list of ALL pedonIDs from NASIS")
-        arcpy.SetProgressorLabel("Requesting a list of ALL pedonIDs from NASIS")
-
-        #URL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_EXPORT_PEDON_BOX_COUNT' + coordinates
-        URL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_PEDON_PEIID_LIST_ALL_OF_NASIS'
-
-        # Open a network object using the URL with the search string already concatenated
-        startTime = tic()
-        #AddMsgAndPrint(".\tNetwork Request Time: " + toc(startTime))
-
-        """ --------------------------------------  Try connecting to NASIS to read the report ------------------------"""
-        try:
-            theReport = urllib.request.urlopen(URL).readlines()
-        except:
-            try:
-                AddMsgAndPrint(".\t2nd attempt at requesting data")
-                theReport = urllib.request.urlopen(URL).readlines()
-
-            except:
-                try:
-                    AddMsgAndPrint(".\t3rd attempt at requesting data")
-                    theReport = urllib.request.urlopen(URL).readlines()
-
-                except URLError as e:
-                    AddMsgAndPrint('URL Error' + str(e),2)
-                    return False
-
-                except HTTPError as e:
-                    AddMsgAndPrint('HTTP Error' + str(e),2)
-                    return False
-
-                except socket.timeout as e:
-                    AddMsgAndPrint(".\n\t" + URL)
-                    AddMsgAndPrint(".\tServer Timeout Error", 2)
-                    return False
-
-                except socket.error as e:
-                    AddMsgAndPrint(".\n\t" + URL)
-                    AddMsgAndPrint(".\tNASIS Reports Website connection failure", 2)
-                    return False
-
-        """ --------------------------------------  Read the NASIS report ------------------------------------"""
-        bValidRecord = False # boolean that marks the starting point of the mapunits listed in the project
-
-        arcpy.SetProgressor("step", "Reading NASIS Report: 'WEB_PEDON_PEIID_LIST_ALL_OF_NASIS'", 0, len(theReport), 1)
-
-        # iterate through the report until a valid record is found
-        for theValue in theReport:
-
-            # convert from bytes to string and remove white spaces
-            theValue = theValue.decode('utf-8').strip()
-
-            # Iterating through the lines in the report
-            if bValidRecord:
-                if theValue == "STOP":  # written as part of the report; end of lines
-                    break
-
-                # Found a valid record
-                if not theValue == None:
-
-                    # All of the peodonIDs will be contained in 1 line
-                    pedonDict = {val.strip():None for val in theValue.split(",")}
-
-                else:
-                    continue
-
-            else:
-                if theValue.startswith('<div id="ReportData">START'):
-                    bValidRecord = True
-
-            arcpy.SetProgressorPosition()
-
-        #Resets the progressor back to its initial state
-        arcpy.ResetProgressor()
-
-        if len(pedonDict) == 0:
-            AddMsgAndPrint(".\tThere were no pedons returned from this report",2)
-            return False
-
-        else:
-            return pedonDict
-
-    except:
-        errorMsg()
-        return False
-
-
-## ================================================================================================================
-def getBoundingCoordinates(feature):
-    """ This function will return WGS coordinates in Lat-Long format that will be passed over to
-        the 'WEB_EXPORT_PEDON_BOX_COUNT' report.  The coordinates are generated by creating
-        a minimum bounding box around the input features.  The box is then converted to vertices
-        and the SW Ycoord, NE Ycoord, SW Xcoord and NE Ycoord are return in that order.
-        Geo-Processing Environments are set to WGS84 in order to return coords in Lat/Long."""
-
-    try:
-
-        """ Determine if features are a subset of selected polygons OR the entire dataset
-            is being used.  This was necessary b/c the output Coordinate System
-            environmental variable was not being honored if a selected set is being used.
-            Export selected set to a temporary feature class otherwise continue"""
-
-        arcpy.SetProgressorLabel("Calculating bounding coordinates of input features")
-
-        featurePath = arcpy.Describe(feature).catalogPath
-
-        totalPolys = int(arcpy.GetCount_management(featurePath).getOutput(0))
-        selectedPolys = int(arcpy.GetCount_management(feature).getOutput(0))
-        bExport = False
-
-        if selectedPolys < totalPolys:
-            envelopeFeature = arcpy.CreateScratchName("envelopeFeature",data_type="FeatureClass", workspace="in_memory")
-            arcpy.CopyFeatures_management(feature,envelopeFeature)
-            AddMsgAndPrint(".\nCalculating bounding coordinates for " + splitThousands(selectedPolys) + " feature(s)")
-            bExport = True
-
-        else:
-            envelopeFeature = feature
-            AddMsgAndPrint(".\nCalculating bounding coordinates of input features")
-
-        """ Set Projection and Geographic Transformation environments in order
-            to post process everything in WGS84.  This will force all coordinates
-            to be in Lat/Long"""
-
-        inputSR = arcpy.Describe(feature).spatialReference                # Get Spatial Reference of input features
-
-        if inputSR.name == 'Unknown':
-            AddMsgAndPrint(".\n\tInput layer needs a spatial reference defined to determine bounding envelope",2)
-            return False, False, False, False
-
-        # Get Datum name of input features
-        inputDatum = inputSR.GCS.datumName
-
-        if inputDatum == "D_North_American_1983":
-            arcpy.env.geographicTransformations = "WGS_1984_(ITRF00)_To_NAD_1983"
-        elif inputDatum == "D_North_American_1927":
-            arcpy.env.geographicTransformations = "WGS_1984_(ITRF00)_To_NAD_1927"
-        elif inputDatum == "D_NAD_1983_2011":
-            arcpy.env.geographicTransformations = "WGS_1984_(ITRF00)_To_NAD_1983_2011"
-        elif inputDatum == "D_WGS_1984":
-            arcpy.env.geographicTransformations = ""
-        else:
-            AddMsgAndPrint(".\n\tGeo Transformation of Datum could not be set",2)
-            AddMsgAndPrint(".\tTry Projecting input layer to WGS 1984 Coordinate System",2)
-            return False, False, False, False
-
-        # Factory code for WGS84 Coordinate System
-        arcpy.env.outputCoordinateSystem = arcpy.SpatialReference(4326)
-
-        """ ------------ Create Minimum Bounding Envelope of features ------------"""
-        envelope = arcpy.CreateScratchName("envelope",data_type="FeatureClass",workspace="in_memory")
-        envelopePts = arcpy.CreateScratchName("envelopePts",data_type="FeatureClass",workspace="in_memory")
-
-        # create minimum bounding geometry enclosing all features
-        arcpy.MinimumBoundingGeometry_management(envelopeFeature,envelope,"ENVELOPE","ALL","#","MBG_FIELDS")
-
-        if int(arcpy.GetCount_management(envelope).getOutput(0)) < 1:
-            AddMsgAndPrint(".\n\tFailed to create minimum bounding area. \n\tArea of interest is potentially too small",2)
-            return False
-
-        arcpy.FeatureVerticesToPoints_management(envelope, envelopePts, "ALL")
-
-        """ ------------ Get X and Y coordinates from envelope ------------"""
-        coordList = []
-        with arcpy.da.SearchCursor(envelopePts,['SHAPE@XY']) as cursor:
-            for row in cursor:
-                if abs(row[0][0]) > 0 and abs(row[0][1]) > 0:
-
-                    # Don't add duplicate coords; Last coord will also be the starting coord
-                    if not row[0] in coordList:
-                        coordList.append(row[0])
-
-        # Reset output Coord Sys Environment
-        arcpy.env.outputCoordinateSystem = ""
-
-        # Delete temp spatial files
-        for tempFile in [envelope,envelopePts]:
-            if arcpy.Exists(tempFile):
-                arcpy.Delete_management(tempFile)
-
-        if bExport:
-            arcpy.Delete_management(envelopeFeature)
-
-        if len(coordList) == 4:
-            AddMsgAndPrint(".\tBounding Box Coordinates:")
-            AddMsgAndPrint(".\t\tSouth Latitude: " + str(coordList[0][1]))
-            AddMsgAndPrint(".\t\tNorth Latitude: " + str(coordList[2][1]))
-            AddMsgAndPrint(".\t\tEast Longitude: " + str(coordList[0][0]))
-            AddMsgAndPrint(".\t\tWest Longitude: " + str(coordList[2][0]))
-            return coordList[0][1],coordList[2][1],coordList[0][0],coordList[2][0]
-
-        else:
-            AddMsgAndPrint(".\.tCould not get Latitude-Longitude coordinates from bounding area",2)
-            return False
-
-    except:
-
-        for tempFile in [envelope,envelopePts]:
-            if arcpy.Exists(tempFile):
-                arcpy.Delete_management(tempFile)
-
-        errorMsg()
-        return False
-
-## ================================================================================================================
-def getNASISpedonCountbyBox(coordinates):
-    """ This function will send the bounding coordinates to the 'Web Pedon Number SUM' NASIS report
-        and return the number of pedons within the bounding coordinates.  Pedons include regular
-        NASIS pedons and LAB pedons. Example of URL sent to the NASIS report would be:
-
-        https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_ANALYSIS_PC_PEDON_NUMBER_SUM&Lat1=43.6425577303&Lat2=43.9828939095&Long1=-89.5997555233&Long2=-89.167551308
-
-        # START 94 STOP
-
-        # peiid: siteID,Labnum,X,Y
-        # {'122647': ('84IA0130011', '85P0558', '-92.3241653', '42.3116684'), '883407': ('2014IA013003', None, '-92.1096600', '42.5332000')}
-        """
-
-    try:
-        AddMsgAndPrint(".\nDetermining if there are any pedons within the bounding coordinates")
-        arcpy.SetProgressorLabel("Determining if there are any pedons within the bounding coordinates")
-
-        # Open a network object using the URL with the search string already concatenated
-        URL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_ANALYSIS_PC_PEDON_NUMBER_SUM' + coordinates
-
-        """ --------------------------------------  Try connecting to NASIS to read the report ------------------------"""
-        try:
-            theReport = urllib.request.urlopen(URL).readlines()
-        except:
-            try:
-                AddMsgAndPrint(".\t2nd attempt at requesting data")
-                theReport = urllib.request.urlopen(URL).read().decode('utf-8')
-            except:
-                try:
-                    AddMsgAndPrint(".\t3rd attempt at requesting data")
-                    theReport = urllib.request.urlopen(URL).read().decode('utf-8')
-
-                except URLError as e:
-                    AddMsgAndPrint('URL Error' + str(e),2)
-                    return False
-
-                except HTTPError as e:
-                    AddMsgAndPrint('HTTP Error' + str(e),2)
-                    return False
-
-                except socket.timeout as e:
-                    AddMsgAndPrint(".\n\t" + URL)
-                    AddMsgAndPrint(".\tServer Timeout Error", 2)
-                    return False
-
-                except socket.error as e:
-                    AddMsgAndPrint(".\n\t" + URL)
-                    AddMsgAndPrint(".\tNASIS Reports Website connection failure (Socket Error)", 2)
-                    return False
-
-                except:
-                    errorMsg()
-                    return Falsethe
-
-        """ --------------------------------------  Read the NASIS report ---------------------------------"""
-        bValidRecord = False # boolean that marks the starting point of the mapunits listed in the project
-
-        # iterate through the report until a valid record is found
-        for theValue in theReport:
-
-            # convert from bytes to string and remove white spaces
-            theValue = theValue.decode('utf-8').strip()
-
-            # Iterating through the lines in the report
-            if bValidRecord:
-                if theValue == "STOP":  # written as part of the report; end of lines
-                    break
-
-                else:
-                    try:
-                        return int(theValue)
-                    except:
-                        continue
-
-            else:
-                if theValue.startswith('<div id="ReportData">START'):
-                    bValidRecord = True
-
-    except:
-        errorMsg()
-        return False
-
-## ================================================================================================================
-def getNASISpedonIDsByBox(coordinates):
-    """ This function will send the bounding coordinates to the 'Web Export Pedon Box' NASIS report
-        and return a list of pedons within the bounding coordinates.  Pedons include regular
-        NASIS pedons and LAB pedons.  Each record in the report will contain the following values:
-
-            Row_Number,upedonid,peiid,pedlabsampnum,Longstddecimaldegrees,latstddecimaldegrees,Undisclosed Pedon
-            24|S1994MN161001|102861|94P0697|-93.5380936|44.0612717|'Y'
-
-        A dictionary will be returned containing something similar:
-        {'102857': ('S1954MN161113A', '40A1694', '-93.6499481', '43.8647194','Y'),
-        '102858': ('S1954MN161113B', '40A1695', '-93.6455002', '43.8899956','N')}
-        theURL = r'    #getPedonIDURL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_EXPORT_PEDON_BOX_COUNT&Lat1=44.070820&Lat2=44.596950&Long1=-91.166274&Long2=-90.311911'
-
-        returns a pedonDictionary"""
-
-    try:
-        AddMsgAndPrint(".\nRequesting a list of pedonIDs from NASIS using the above bounding coordinates")
-        arcpy.SetProgressorLabel("Requesting a list of pedons from NASIS")
-
-        URL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_EXPORT_PEDON_BOX_COUNT' + coordinates
-
-        # Open a network object using the URL with the search string already concatenated
-        startTime = tic()
-        #AddMsgAndPrint(".\tNetwork Request Time: " + toc(startTime))
-
-        pedonDictionary = dict()
-
-        """ --------------------------------------  Try connecting to NASIS to read the report ------------------------"""
-        try:
-            theReport = urllib.request.urlopen(URL).readlines()
-        except:
-            try:
-                AddMsgAndPrint(".\t2nd attempt at requesting data")
-                theReport = urllib.request.urlopen(URL).readlines()
-
-            except:
-                try:
-                    AddMsgAndPrint(".\t3rd attempt at requesting data")
-                    theReport = urllib.request.urlopen(URL).readlines()
-
-                except URLError as e:
-                    AddMsgAndPrint('URL Error' + str(e),2)
-                    return False
-
-                except HTTPError as e:
-                    AddMsgAndPrint('HTTP Error' + str(e),2)
-                    return False
-
-                except socket.timeout as e:
-                    AddMsgAndPrint(".\n\t" + URL)
-                    AddMsgAndPrint(".\tServer Timeout Error", 2)
-                    return False
-
-                except socket.error as e:
-                    AddMsgAndPrint(".\n\t" + URL)
-                    AddMsgAndPrint(".\tNASIS Reports Website connection failure", 2)
-                    return False
-
-        """ --------------------------------------  Read the NASIS report ------------------------------------"""
-        totalPedonCnt = 0
-        labPedonCnt = 0
-        undisclosed = 0
-        bValidRecord = False # boolean that marks the starting point of the mapunits listed in the project
-
-        arcpy.SetProgressor("step", "Reading NASIS Report: 'WEB_EXPORT_PEDON_BOX_COUNT'", 0, len(theReport), 1)
-
-        # iterate through the report until a valid record is found
-        for theValue in theReport:
-
-            # convert from bytes to string and remove white spaces
-            theValue = theValue.decode('utf-8').strip()
-
-            # Iterating through the lines in the report
-            if bValidRecord:
-                if theValue == "STOP":  # written as part of the report; end of lines
-                    break
-
-                # Found a valid project record i.e. -- SDJR - MLRA 103 - Kingston silty clay loam, 1 to 3 percent slopes|400036
-                else:
-                    theRec = theValue.split("|")
-
-                    if len(theRec) != 7:
-                        AddMsgAndPrint(".\tNASIS Report: Web Export Pedon Box is not returning the correct amount of values per record",2)
-                        return False
-
-                    # Undisclosed Record; Reject this record
-                    if theRec[6] == "Y":
-                        undisclosed+=1
-                        totalPedonCnt += 1
-                        continue
-
-                    rowNumber = theRec[0]
-                    userPedonID = theRec[1]
-                    pedonID = theRec[2]
-                    longDD = theRec[4]
-                    latDD = theRec[5]
-
-                    # Lab sample or not
-                    if theRec[3] == 'Null' or theRec[3] == '':
-                        labSampleNum = None
-                    else:
-                        labSampleNum = theRec[3]
-                        labPedonCnt += 1
-
-                    if not pedonID in pedonDictionary:
-                        pedonDictionary[pedonID] = (userPedonID,labSampleNum,longDD,latDD)
-                        totalPedonCnt += 1
-
-            else:
-                if theValue.startswith('<div id="ReportData">START'):
-                    bValidRecord = True
-
-            arcpy.SetProgressorPosition()
-
-        #Resets the progressor back to its initial state
-        arcpy.ResetProgressor()
-
-        if len(pedonDictionary) == 0:
-            AddMsgAndPrint(".\tThere were no pedons found in this area; Try using a larger extent",1)
-            return False
-
-        else:
-            #AddMsgAndPrint(".\tThere are a total of " + splitThousands(totalPedonCnt) + " pedons found in this area:")
-            AddMsgAndPrint(".\tThere are " + splitThousands(totalPedonCnt) + " within this layer:")
-            AddMsgAndPrint(".\t\tLAB Pedons: " + splitThousands(labPedonCnt))
-            AddMsgAndPrint(".\t\tUndisclosed: " + splitThousands(undisclosed))
-            AddMsgAndPrint(".\t\tNASIS Pedons: " + splitThousands((totalPedonCnt - labPedonCnt) - undisclosed))
-
-            return pedonDictionary
-
-    except:
-        errorMsg()
-        return False
-
-## ================================================================================================================
-def filterPedonsByFeature(feature):
-    # Description:
-    # This function will temporarily plot out the pedons in order to determine which pedons fall completely
-    # within the user's AOI.  Once determined, the extra pedons will be removed from the pedonDict so that
-    # extra pedons are not downloaded.
-
-    # Parameters
-    # feature -  input area of interest that will be used to intersect agains temporarily plotted NASIS points.
-    #            This will only be used as a reference.
-    # The pedonDict will be altered but not necessary to be passed in.
-
-    # Returns
-    # This function returns an integer that reflects the number of pedons that are completely within the feature
-    # AOI.  False will be returned if an error occurs within this function OR if there are NO pedons within the
-    # feature AOI.
-    # Although the function will update the pedonDict to reflect only the peodonIDs that are within the feature AOI.
-    # it is not returned since it is directly updated from main.
-
-    try:
-        AddMsgAndPrint(".\nSelecting pedons that intersect with " + arcpy.Describe(feature).Name + " Layer")
-        arcpy.SetProgressorLabel("Selecting pedons that intersect with " + arcpy.Describe(feature).Name + " Layer")
-
-        # Set everything to WGS84
-        arcpy.env.outputCoordinateSystem = arcpy.SpatialReference(4326)
-
-        # Make a copy of the user-input features - this is just in case there is a selected set
-        aoiFeature = arcpy.CreateScratchName("aoiFeature",data_type="FeatureClass", workspace="in_memory")
-        arcpy.CopyFeatures_management(feature,aoiFeature)
-
-        # Create a temp point feature class to digitize ALL of the pedons within the bounding box first
-        tempPoints = arcpy.CreateScratchName("tempPoints",data_type="FeatureClass", workspace="in_memory")
-
-        # Factory code for WGS84 Coordinate System
-        spatial_reference = arcpy.SpatialReference(4326)
-        arcpy.CreateFeatureclass_management("in_memory", os.path.basename(tempPoints), "POINT", "#", "DISABLED", "DISABLED", spatial_reference)
-
-        peiidFld = "peiid"
-        arcpy.AddField_management(tempPoints,peiidFld,"LONG")
-
-        # Initiate the insert cursor object using the peiid and XY values
-        cursor = arcpy.da.InsertCursor(tempPoints,[peiidFld,'SHAPE@XY'])
-
-        for pedon in pedonDict:
-            xValue = float(pedonDict[pedon][2])
-            yValue = float(pedonDict[pedon][3])
-            newRow = [pedon,(xValue,yValue)]
-            cursor.insertRow(newRow)
-        del cursor
-
-        arcpy.SetProgressorLabel("Selecting pedons that intersect with " + arcpy.Describe(feature).Name + " Layer")  # Some odd reason 'tempPointsPRJ' stays frozen in the progress bar.
-
-        # Select all of the pedons within the user's AOI
-        tempPointsLYR = arcpy.CreateScratchName("tempPointsLYR",data_type="FeatureClass", workspace="in_memory")
-        arcpy.MakeFeatureLayer_management(tempPoints,tempPointsLYR)
-
-        #AddMsgAndPrint(".\tThere are " + str(int(arcpy.GetCount_management("tempPoints_LYR").getOutput(0))) + " pedons in the layer",2)
-        arcpy.SelectLayerByLocation_management(tempPointsLYR,"INTERSECT",aoiFeature, "","NEW_SELECTION")
-        pedonsWithinAOI = int(arcpy.GetCount_management(tempPointsLYR).getOutput(0))
-
-        # There are pedons within the user's AOI
-        if pedonsWithinAOI > 0:
-            AddMsgAndPrint(".\tThere are " + splitThousands(pedonsWithinAOI) + " pedons within this layer")
-
-            # Make a copy of the user-input features - this is just in case there is a selected set
-            selectedPedons = arcpy.CreateScratchName("selectedPedons",data_type="FeatureClass", workspace="in_memory")
-            arcpy.CopyFeatures_management(tempPointsLYR,selectedPedons)
-
-            # Create a new list of pedonIDs from the selected set; pedonIDs are converted to strings in order
-            # to compare against the pedonDict()
-            selectedPedonsList = [str(row[0]) for row in arcpy.da.SearchCursor(selectedPedons, (peiidFld))]
-
-            # Make a copy of pedonDict b/c it cannot change during iteration (next step)
-            pedonDictCopy = pedonDict.copy()
-
-            # delete any pedon from the original pedonDict that is not in the selected set.
-            labPedonCnt = 0
-            for pedon in pedonDictCopy:
-                if pedon not in selectedPedonsList:
-                    del pedonDict[pedon]
-                else:
-                    if not pedonDict[pedon][1] is None:
-                        labPedonCnt+=1
-
-            AddMsgAndPrint(".\t\tLAB Pedons: " + splitThousands(labPedonCnt))
-            AddMsgAndPrint(".\t\tNASIS Pedons: " + splitThousands(pedonsWithinAOI - labPedonCnt))
-
-            for layer in (aoiFeature,tempPoints,tempPointsLYR,selectedPedons):
-                if arcpy.Exists(layer):
-                    arcpy.Delete_management(layer)
-
-            del pedonDictCopy,selectedPedons,selectedPedonsList
-
-            # Return integer reflecting number of pedons within feature AOI
-            return pedonsWithinAOI
-
-        else:
-            AddMsgAndPrint(".\tThere are NO pedons that are completely within your AOI. EXITING! \n",2)
-            return False
-
-    except:
-        errorMsg()
-        return False
-
-## ================================================================================================================
-def createPedonDB():
-    """This Function will create a new File Geodatabase using a pre-established XML workspace
-       schema.  All Tables will be empty and should correspond to that of the access database.
-       Relationships will also be pre-established.
-       Return false if XML workspace document is missing OR an existing FGDB with the user-defined
-       name already exists and cannot be deleted OR an unhandled error is encountered.
-       Return the path to the new Pedon File Geodatabase if everything executes correctly."""
-
-    try:
-        if sqliteFormat:
-            AddMsgAndPrint(".\nCreating New Pedon SQLite Database")
-            arcpy.SetProgressorLabel("Creating New Pedon SQLite Database")
-        else:
-            AddMsgAndPrint(".\nCreating New Pedon File Geodatabase")
-            arcpy.SetProgressorLabel("Creating New Pedon File Geodatabase")
-
-        # pedon xml template that contains empty pedon Tables and relationships
-        # schema and will be copied over to the output location
-        pedonXML = os.path.dirname(sys.argv[0]) + os.sep + "NASISpedons_XMLWorkspace.xml"
-
-        if sqliteFormat:
-            localPedonDB = os.path.dirname(sys.argv[0]) + os.sep + "NASISPedonsSQLiteTemplate.sqlite"
-            ext = ".sqlite"
-        else:
-            localPedonDB = os.path.dirname(sys.argv[0]) + os.sep + "NASISPedonsFGDBTemplate.gdb"
-            ext = ".gdb"
-
-        # Return false if pedon fGDB template is not found
-        if not arcpy.Exists(localPedonDB):
-            AddMsgAndPrint(".\t" + os.path.basename(localPedonDB) + " template was not found!",2)
-            return False
-
-        newPedonDB = os.path.join(outputFolder,DBname + ext)
-
-        if arcpy.Exists(newPedonDB):
-            try:
-                arcpy.Delete_management(newPedonDB)
-                AddMsgAndPrint(".\t" + os.path.basename(newPedonDB) + " already exists. Deleting and re-creating FGDB\n",1)
-            except:
-                AddMsgAndPrint(".\t" + os.path.basename(newPedonDB) + " already exists. Failed to delete\n",2)
-                return False
-
-        # copy template over to new location
-        AddMsgAndPrint(".\tCreating " + DBname + ext + " using NCSS Pedon Schema 7.4.1")
-        arcpy.Copy_management(localPedonDB,newPedonDB)
-
-        """ ------------------------------ Code to use XML Workspace -------------------------------------------"""
-##        # Return false if xml file is not found
-##        if not arcpy.Exists(pedonXML):
-##            AddMsgAndPrint(".\t" + os.path.basename(pedonXML) + " Workspace document was not found!",2)
-##            return False
-##
-##        # Create empty temp File Geodatabae
-##        arcpy.CreateFileGDB_management(outputFolder,os.path.splitext(os.path.basename(newPedonFGDB))[0])
-##
-##        # set the pedon schema on the newly created temp Pedon FGDB
-##        AddMsgAndPrint(".\tImporting NCSS Pedon Schema 7.3 into " + DBname + ".gdb")
-##        arcpy.ImportXMLWorkspaceDocument_management(newPedonFGDB, pedonXML, "DATA", "DEFAULTS")
-
-        #arcpy.UncompressFileGeodatabaseData_management(newPedonFGDB)
-        AddMsgAndPrint(".\tSuccessfully created: " + os.path.basename(newPedonDB))
-
-        return newPedonDB
-
-    except:
-        AddMsgAndPrint("Unhandled exception (createDB)", 2)
-        errorMsg()
-        return False
-
-## ===============================================================================================================
-def createReferenceObjects(pedonDBloc):
-    # Description
-    # This function will create the following 2 unique dictionaries that will be used throughout the script:
-    # - pedonGDBtablesList: contains every table in the newly created pedonDB above as a key.
-    #                       Individual records of tables will be added as list of values to the table keys.
-    #                       This dictionary will be populated using the results from the
-    #                       the WEB_AnalysisPC_MAIN_URL_EXPORT NASIS report
-    #                       i.e. {'area': [],'areatype': [],'basalareatreescounted': []}
-    # - tableInfoDict:      Dictionary containing physical name from MDSTATTABS table as the key.
-    #                       Each key has an associated list consisting of alias name, number of fields in the
-    #                       physical table and the position index of the same table within the pedonGDBList.
-    #
-    #                       i.e. {croptreedetails:['Crop Tree Details',48,34]}
-    #                       The number of fields is used to double check that the values from
-    #                       the web report are correct.  This was added b/c there were text fields that were
-    #                       getting disconnected in the report and being read as 2 lines -- Jason couldn't
-    #                       address this issue in NASIS.
-    #                       The position index is needed b/c once the pedonGDBList begins to be populated a
-    #                       table cannot be looked up.
-
-    # Paramaters
-    # pedonDBloc - Catalog path of the pedon File Geodatabase that was create to store pedon data.
-    #                This FGDB must contain the Metadata Table which will be used to retrieve alias names
-    #                and physical table names
-
-    # Returns
-    # This function returns 2 dictionaries (Description above).  If anything goes wrong the function will
-    # return False,False and the script will eventually exit.
-
-    try:
-        arcpy.SetProgressorLabel("Gathering Metadata Table and Field Information")
-        AddMsgAndPrint(".\nGathering Metadata Table and Field Information")
-
-        # Open Metadata table containing information for other pedon tables
-        theMDTable = pedonDBloc + os.sep + prefix + "MetadataTable"
-
-        # Establishes a cursor for searching through field rows. A search cursor can be used to retrieve rows.
-        # This method will return an enumeration object that will, in turn, hand out row objects
-        if not arcpy.Exists(theMDTable):
-            AddMsgAndPrint(".\n\t" + theMDTable + " doesn't Exist",2)
-            return False,False
-
-        # Establish a list of tables to get field aliases for
-        arcpy.env.workspace = pedonDBloc
-        tableList = arcpy.ListTables("*")
-        tableList.append(prefix + "pedon")
-
-        #nameOfFields = ["TablePhysicalName","TableLabel"]
-        nameOfFields = ["tabphynm","tablab"]
-
-        # Initiate 2 Dictionaries
-        tableInfoDict = dict()
-        emptyPedonGDBtablesDict = dict()
-
-        with arcpy.da.SearchCursor(theMDTable,nameOfFields) as cursor:
-
-            for row in cursor:
-
-                physicalName = prefix + row[0]  # Physical name of table
-                aliasName = row[1]              # Alias name of table
-                tblPath = f"{pedonDBloc}\\{physicalName}"
-
-                if physicalName.find(prefix + 'Metadata') > -1: continue
-
-                if physicalName in tableInfoDict: continue
-
-                # The metadata table has more tables than what is in the DB template.  Only
-                # Gather field information for those tables in the DB.
-                if physicalName in tableList:
-
-                    uniqueFields = [f.name for f in arcpy.ListFields(tblPath) if not f.name.lower() in ('objectid','oid','geometry','fid','shape')]
-                    numOfValidFlds = len(uniqueFields)
-
-                    # Add 2 more fields to the pedon table for X,Y
-                    if physicalName == prefix + 'pedon':
-                        numOfValidFlds += 2
-
-                    # Siteaoverlap table has 9 fields instead of 6 b/c areaiidref is actually
-                    # a NASIS client placeholder for areatypename, areasymbol, areaname, areaiidref
-                    if physicalName == prefix + 'siteaoverlap':
-                        numOfValidFlds = 9
-
-                    # i.e. {phtexture:'Pedon Horizon Texture',phtexture}; will create a one-to-many dictionary
-                    # As long as the physical name doesn't exist in dict() add physical name
-                    # as Key and alias as Value.
-                    if not physicalName in tableInfoDict:
-                        tableInfoDict[physicalName] = [aliasName,numOfValidFlds]
-                        emptyPedonGDBtablesDict[physicalName] = []
-
-                    del uniqueFields;numOfValidFlds
-
-        arcpy.SetProgressorLabel('')
-        return emptyPedonGDBtablesDict,tableInfoDict
-
-    except:
-        AddMsgAndPrint("Unhandled exception (createReferenceObject)", 2)
-        errorMsg()
-        return False, False
-
-## ===============================================================================================================
-def parsePedonsIntoLists():
-    """ This function will parse pedons into manageable chunks that will be sent to the 2nd URL report.
-        There is an inherent URL character limit of 2,083.  The report URL is 123 characters long which leaves 1,960 characters
-        available. I arbitrarily chose to have a max URL of 1,860 characters long to avoid problems.  Most pedonIDs are about
-        6 characters.  This would mean an average max request of 265 pedons at a time.
-
-        This function returns a list of pedon lists"""
-        #1860 = 265
-
-    try:
-        arcpy.SetProgressorLabel("Determining the number of URL requests to send the server")
-
-        # Total Count
-        i = 1
-        listOfPedonStrings = list()  # List containing pedonIDstring lists; individual lists are comprised of about 265 pedons
-        pedonIDstr = ""              # concatenated string of pedonIDs
-
-        for pedonID in pedonDict:
-
-            # End of pedon dictionary has been reached
-            if i == len(pedonDict):
-                pedonIDstr = pedonIDstr + str(pedonID)
-                listOfPedonStrings.append(pedonIDstr)
-
-            # End of pedon list NOT reached
-            else:
-                # Max URL length reached - retrieve pedon data and start over
-                if len(pedonIDstr) > 1866:
-                    pedonIDstr = pedonIDstr + str(pedonID)
-                    listOfPedonStrings.append(pedonIDstr)
-
-                    ## reset the pedon ID string to empty
-                    pedonIDstr = ""
-                    i+=1
-
-                # concatenate pedonID to string and continue
-                else:
-                    pedonIDstr = pedonIDstr + str(pedonID) + ",";i+=1
-
-        numOfPedonStrings = len(listOfPedonStrings)  # Number of unique requests that will be sent
-        arcpy.SetProgressorLabel('')
-
-        if not numOfPedonStrings:
-            AddMsgAndPrint(".\n\t Something Happened here.....WTF!",2)
-            exit()
-
-        else:
-            return listOfPedonStrings,numOfPedonStrings
-
-    except:
-        AddMsgAndPrint("Unhandled exception (createFGDB)", 2)
-        errorMsg()
-        exit()
-
-## ================================================================================================================
-def organizeFutureInstanceIntoPedonDict(futureObject):
-    # Description:
-    # This function will take in a "future" object representing the execution of the
-    # ThreadPoolExecutor callable.  In this case, the future object represents
-    # the content of pedon Horizon information for a list of pedon IDs.  The content
-    # will be organized it into a dictionary (pedonDBDict) whose schema follows
-    # NASIS 7.4.1 pedon schema.
-
-    # Parameters
-    # future object - Encapsulates the asynchronous execution of a callable.
-    # Future instances are created by Executor.submit()
-
-    # Returns
-    # True if the data was organized correctly
-    # False if the object was empty or there was an error.
-
-    # To view a sample output report go to:
-    # https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_AnalysisPC_MAIN_URL_EXPORT&pedonid_list=14542
-
-    try:
-        theReport = futureObject
-
-        # There was an obvious error in opening the URL in the openURL function
-        if theReport == None:
-            return None
-
-        invalidTable = 0    # represents tables that don't correspond with the GDB
-        invalidRecord = 0   # represents records that were not added
-        validRecord = 0
-
-        bHeader = False         # indicator that record represents fields
-        currentTable = ""       # The table found in the report
-        numOfFields = ""        # The number of fields a specific table should contain
-        partialValue = ""       # variable containing part of a value that is not complete
-        originalValue = ""      # variable containing the original incomplete value
-        bPartialValue = False   # flag indicating if value is incomplete; append next record
-
-        """ ------------------- Begin Adding data from URL into a dictionary of lists ---------------"""
-        for theValue in theReport:
-
-            # convert from bytes to string and remove white spaces
-            theValue = theValue.decode('utf-8').strip()
-
-            # represents the start of valid table; Typically Line #19
-            if theValue.find('@begin') > -1:
-                theTable = prefix + theValue[theValue.find('@') + 7:]  ## Isolate the table
-                numOfFields = tableFldDict[theTable][1]
-
-                # Check if the table name exists in the list of dictionaries
-                # if so, set the currentTable variable and bHeader
-                if theTable in pedonDBtablesDict:
-                    currentTable = theTable
-                    bHeader = True  ## Next line will be the header
-
-                else:
-                    AddMsgAndPrint(".\t" + theTable + " Does not exist in the FGDB schema!  Figure this out Jason Nemecek!",2)
-                    invalidTable += 1
-
-            # end of the previous table has been reached; reset currentTable
-            elif theValue.find('@end') > -1:
-                currentTable = ""
-                bHeader = False
-
-            # represents header line; skip this line
-            elif bHeader:
-                bHeader = False
-
-            # this is a valid record that should be collected
-            elif not bHeader and currentTable:
-                numOfValues = len(theValue.split('|'))
-
-                # Add the record to its designated list within the dictionary
-                # Do not remove the double quotes b/c doing so converts the object
-                # to a list which increases its object size.  Remove quotes before
-                # inserting into table
-
-                # this should represent the 2nd half of a valid value
-                if bPartialValue:
-                    partialValue += theValue  # append this record to the previous record
-
-                    # This value completed the previous value
-                    if len(partialValue.split('|')) == numOfFields:
-                        pedonDBtablesDict[currentTable].append(partialValue)
-                        validRecord += 1
-                        bPartialValue = False
-                        partialValue,originalValue = "",""
-
-                    # appending this value still falls short of number of possible fields
-                    # add another record; this would be the 3rd record appended and may
-                    # exceed number of values.
-                    elif len(partialValue.split('|')) < numOfFields:
-                        arcpy.SetProgressorPosition()
-                        continue
-
-                    # appending this value exceeded the number of possible fields
-                    else:
-                        AddMsgAndPrint(".\n\tIncorrectly formatted Record Found in " + currentTable + " table:",2)
-                        AddMsgAndPrint(".\t\tRecord should have " + str(numOfFields) + " values but " + str(len(partialValue.split('|'))) + " were found",2)
-                        #AddMsgAndPrint(".\t\t\tOriginal Record: " + originalValue,2)
-                        #AddMsgAndPrint(".\t\t\tAppended Record: " + partialValue,2)
-                        AddMsgAndPrint(".\t\tRecord: " + partialValue,2)
-                        AddMsgAndPrint(".\t\tCheck for incorrect usage of '|' in invidual attributes in NASIS",2)
-                        invalidRecord += 1
-                        bPartialValue = False
-                        partialValue,originalValue = ""
-
-                # number of values do not equal the number of fields in the corresponding tables
-                elif numOfValues != numOfFields:
-
-                    # number of values exceed the number of fields; Big Error
-                    if numOfValues > numOfFields:
-                        AddMsgAndPrint(".\n\tIncorrectly formatted NASIS record found in " + currentTable + " table:",2)
-                        AddMsgAndPrint(".\t\tRecord should have " + str(numOfFields) + " values but " + str(numOfValues) + " were found",2)
-                        AddMsgAndPrint(".\t\tRecord: " + theValue,2)
-                        AddMsgAndPrint(".\t\tCheck for incorrect usage of '|' in invidual attributes in NASIS",2)
-                        invalidRecord += 1
-
-                    # number of values falls short of the number of correct fields
-                    else:
-                        partialValue,originalValue = theValue,theValue
-                        bPartialValue = True
-
-                # Record perfectly lines up with table schema
-                else:
-                    pedonDBtablesDict[currentTable].append(theValue)
-                    validRecord += 1
-                    bPartialValue = False
-                    partialValue = ""
-
-            elif theValue.find("ERROR") > -1:
-                AddMsgAndPrint(".\n\t\t" + theValue[theValue.find("ERROR"):],2)
-                return False
-
-            else:
-                continue
-                #invalidRecord += 1
-
-        if not validRecord:
-            AddMsgAndPrint(".\t\tThere were no valid records captured from NASIS request",2)
-            return False
-
-        # Report any invalid tables found in report; This should take care of itself as Jason perfects the report.
-        if invalidTable and invalidRecord:
-            AddMsgAndPrint(".\t\tThere were " + splitThousands(invalidTable) + " invalid table(s) included in the report with " + splitThousands(invalidRecord) + " invalid record(s)",1)
-
-        # Report any invalid records found in report; There are 24 html lines reserved for headers and footers
-        if invalidRecord > 0:
-            AddMsgAndPrint(".\t\tThere were " + splitThousands(invalidRecord) + " invalid record(s) not captured",1)
-
-        return True
-
-    except:
-        errorMsg()
-        return False
-
-## ================================================================================================================
-def importPedonData(tableInfoDict,verbose=False):
-    """ This function will purge the contents from the pedonDBtablesDict dictionary which contains all of the pedon
-        data into the pedon FGDB.  Depending on the number of pedons in the user's AOI, this function will be
-        used multiple times.  The pedonDBtablesDict dictionary could possilbly allocate all of the computer's
-        memory so a fail-safe was built in to make sure a memory exception error wasn't encountered.  This
-        function is invoked when approximately 40,000 pedons have been retrieved from the server and stored in \
-        memory."""
-
-    try:
-        if verbose: AddMsgAndPrint(".\nImporting Pedon Data into Database")
-        arcpy.SetProgressorLabel("Importing Pedon Data into Database")
-
-        # use the tableInfoDict so that tables are imported in alphabetical order
-        tblKeys = tableInfoDict.keys()
-        maxCharTable = max([len(table) for table in tblKeys]) + 1
-        maxCharAlias = max([len(value[1][0]) for value in tableInfoDict.items()])
-
-        headerName = f".\t{'Table Physical Name' : <30}{'Table Alias Name' : <55}{'# of Records' : <20}"
-        if verbose: AddMsgAndPrint(headerName)
-        if verbose: AddMsgAndPrint(".\t" + len(headerName) * "=")
-
-        tblKeys = dict(sorted(tableFldDict.items(), key=lambda item: item[0]))
-
-        """ ---------------------------------------------------"""
-        arcpy.SetProgressor("step","Importing Pedon Data into FGDB table: ",0,len(tblKeys),1)
-        for table in tblKeys:
-
-            possibleNumOfRecords = len(pedonDBtablesDict[table])
-
-            arcpy.SetProgressorLabel(f"Importing Pedon Data into {table} table: {splitThousands(possibleNumOfRecords)} Records")
-            arcpy.SetProgressorPosition()
-
-            # Skip any Metadata files
-            if table.find(prefix + 'Metadata') > -1: continue
-
-            # Capture the alias name of the table
-            aliasName = tableInfoDict[table][0]
-
-            # Strictly for standardizing reporting
-            firstTab = (maxCharTable - len(table)) * " "
-
-            # check if list contains records to be added
-            if possibleNumOfRecords:
-
-                numOfRowsAdded = 0
-                GDBtable = pedonDB + os.sep + table # FGDB Pyhsical table path
-
-                """ -------------------------------- Collect field information -----------------------"""
-                ''' For the current table, get the field length if the field is a string.  I do this b/c
-                the actual value may exceed the field length and error out as has happened in SSURGO.  If
-                the value does exceed the field length then the value will be truncated to the max length
-                of the field '''
-
-                # Put all the field names in a list
-                fieldList = arcpy.Describe(GDBtable).fields
-                nameOfFields = []
-                fldLengths = []
-
-                for field in fieldList:
-
-                    # Skip Object ID field Shape field (only for site)
-                    if not field.type.lower() in ("oid","geometry"):
-                        nameOfFields.append(field.name)
-
-                        if field.type.lower() == "string":
-                            fldLengths.append(field.length)
-                        else:
-                            fldLengths.append(0)
-
-                # Add a new field at the end called 'labsampleIndicator' to indicate whether
-                # record is a LAB pedon. Addd XY token to list
-                if table == prefix + 'pedon':
-
-                    # Pedon feature class will have X,Y geometry added; Add XY token to list
-                    nameOfFields.append('SHAPE@XY')
-                    fldLengths.append(0)  # X coord
-                    fldLengths.append(0)  # Y coord
-
-                """ -------------------------------- Insert Rows ------------------------------------------
-                    Iterate through every value from a specific table in the pedonDBtablesDict dictary
-                    and add it to the appropriate FGDB table  Truncate the value if it exceeds the
-                    max number of characters.  Set the value to 'None' if it is an empty string."""
-
-                # Initiate the insert cursor object using all of the fields
-                cursor = arcpy.da.InsertCursor(GDBtable,nameOfFields)
-                recNum = 0
-
-                # '"S1962WI025001","43","15","9","North","89","7","56","West",,"Dane County, Wisconsin. 100 yards south of road."'
-                for rec in pedonDBtablesDict[table]:
-
-                    newRow = list()  # list containing the values that will populate a new row
-                    fldNo = 0        # list position to reference the field lengths in order to compare
-
-                    for value in rec.replace('"','').split('|'):
-
-                        value = value.strip()
-                        fldLen = fldLengths[fldNo]
-
-                        if value == '' or value == 'NULL':   ## Empty String
-                            value = None
-
-                        elif fldLen > 0:  ## record is a string, truncate it
-                            value = value[0:fldLen]
-
-                        else:             ## record is a number, keep it
-                            value = value
-
-                        newRow.append(value)
-                        fldNo += 1
-
-                        del value, fldLen
-
-                    # Add XY coordinates to the pedon point feature class.
-                    if table == prefix + 'pedon':
-                        try:
-                            xValue = float(newRow[-1])  # Long
-                            yValue = float(newRow[-2])  # Lat
-                        except:
-                            xValue = 0.00
-                            yValue = 90.0
-
-                        # remove the X,Y coords from the newRow list b/c X,Y
-                        # fields don't exist in the pedon Table
-                        newRow = newRow[:-2]
-
-                        newRow.append((xValue,yValue))
-                        del xValue,yValue
-
-                    try:
-                        cursor.insertRow(newRow)
-                        numOfRowsAdded += 1;recNum += 1
-
-                    except arcpy.ExecuteError:
-                        AddMsgAndPrint(".\n\tError in :" + table + " table: Field No: " + str(fldNo) + " : " + str(rec),2)
-                        AddMsgAndPrint(".\n\t" + arcpy.GetMessages(2),2)
-                        break
-                    except:
-                        AddMsgAndPrint(".\n\tError in: " + table + " table")
-                        AddMsgAndPrint(".\tNumber of Fields in GDB: " + str(len(nameOfFields)))
-                        AddMsgAndPrint(".\tNumber of fields in report: " + str(len([rec.split('|')][0])))
-                        errorMsg()
-                        break
-
-                    del newRow,fldNo
-
-                # Report the # of records added to the table
-##                if bAliasName:
-                if verbose:AddMsgAndPrint(f".\t{table : <30}{aliasName: <55}{'Records Added: ' + splitThousands(numOfRowsAdded) : <20}")
-
-                del numOfRowsAdded,GDBtable,fieldList,nameOfFields,fldLengths,cursor
-
-            # Table had no records; still print it out
-            else:
-                if verbose:
-                    AddMsgAndPrint(f".\t{table : <30}{aliasName: <55}{'Records Added: 0' : <20}")
-
-
-        #Resets the progressor back to its initial state
-        arcpy.ResetProgressor()
-
-        return True
-
-    except arcpy.ExecuteError:
-        AddMsgAndPrint(arcpy.GetMessages(2),2)
-        return False
-
-    except:
-        errorMsg()
-        return False
-
-## ================================================================================================================
-def getObjectSize(obj, handlers={}, verbose=False):
-    """ Returns the approximate memory footprint an object and all of its contents.
-
-    Automatically finds the contents of the following builtin containers and
-    their subclasses:  tuple, list, deque, dict, set and frozenset.
-    To search other containers, add handlers to iterate over their contents:
-
-        handlers = {SomeContainerClass: iter,
-                    OtherContainerClass: OtherContainerClass.get_elements}
-    """
-
-    try:
-        # lamda function to iterate through a dictionary
-        dict_handler = lambda d: chain.from_iterable(d.items())
-
-    #     Use the following lines if you want to determine the size for ANY object
-    ##    all_handlers = {tuple: iter,
-    ##                    list: iter,
-    ##                    deque: iter,
-    ##                    dict: dict_handler,
-    ##                    set: iter,
-    ##                    frozenset: iter,
-    ##                   }
-
-        # Limit the focus to just dictionaries since that is the only thing I will pass
-        all_handlers = {dict: dict_handler}
-
-        all_handlers.update(handlers)     # user handlers take precedence
-        seen = set()                      # unique list of Object's memory ID
-        default_size = getsizeof(0)       # estimate sizeof object without __sizeof__; a dict will always be 140 bytes
-
-        def sizeof(obj):
-
-            if id(obj) in seen:       # do not double count the same object's memory ID
-                return 0
-
-            seen.add(id(obj))
-            s = getsizeof(obj, default_size)
-
-            if verbose:
-                print(s, type(obj), repr(obj))
-
-            # iterate through all itemized objects (tuple,list) 'all_handlers' including their content
-            for typ, handler in all_handlers.items():
-
-                # check if the object is associated with the type at hand.  i.e. if the current
-                # type is dict then check if the object 'o' is a dict. ({'a': 1, 'c': 3, 'b': 2, 'e': 'a string of chars', 'd': [4, 5, 6, 7]})
-                # if True, go thru and add the bytes for each eleement
-                if isinstance(obj, typ):
-                    s += sum(map(sizeof, handler(obj)))   # Iterates through this function
-                    break
-
-            return s
-
-        byteSize = sizeof(obj)
-
-        if byteSize < 1024:
-            return splitThousands(byteSize) + " bytes"
-        elif byteSize > 1023 and byteSize < 1048576:
-            return splitThousands(round((byteSize / 1024.0),1)) + " KB"
-        elif byteSize > 1048575 and byteSize < 1073741824:
-            return splitThousands(round((byteSize / (1024*1024.0)),1)) + " MB"
-        elif byteSize > 1073741823:
-            return splitThousands(round(byteSize / (1024*1024*1024.0),1)) + " GB"
-
-    except:
-        errorMsg()
-        pass
-
-## ===================================================================================
-def openURL(url):
-    # Description
-    # This function will open a URL, read the lines and send back the response.
-    # It is used within the ThreadPoolExecutor to send multiple NASIS server
-    # requests.  The primary URL passed to this function from this script will be:
-    # https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_AnalysisPC_MAIN_URL_EXPORT&pedonid_list=14542
-    # This function also replaces the 'getPedonHorizon' function that not only opened
-    # the URL but also organized the contents into a dictionary that followed the NASIS schema.
-    # The function of organizing the URL content is now handled by the 'organizeFutureInstance' function
-
-    # Parameters
-    # url - the url that connection will be establised to and whose contents will be returned.
-    # 1 global variable will be updated within this function.
-
-    # Returns
-    # This function returns the contents of a URL.  However, within this script, the openURL
-    # function is being called within the ThreadPoolExecutor asynchronous callables which returns
-    # a "future" object representing the execution of the callable.
-
-    try:
-
-        # isolate the pedonIDs from the URL - strictly for formatting
-        thisPedonString = url.split('=')[2]
-        numOfPedonsInThisString = len(thisPedonString.split(','))
-
-        # Update Global variables
-        global i
-
-        """ Strictly for formatting print message """
-        if numOfPedonStrings > 1:
-            AddMsgAndPrint(".\tRequest " + splitThousands(i) + " of " + splitThousands(numOfPedonStrings) + " for " + str(numOfPedonsInThisString) + " pedons")
-            arcpy.SetProgressorLabel("Request " + splitThousands(i) + " of " + splitThousands(numOfPedonStrings) + " for " + str(numOfPedonsInThisString) + " pedons")
-        else:
-            AddMsgAndPrint("Retrieving pedon data from NASIS for " + str(numOfPedonsInThisString) + " pedons.")
-            arcpy.SetProgressorLabel("Retrieving pedon data from NASIS for " + str(numOfPedonsInThisString) + " pedons.")
-
-        # update request number
-        if not i == len(URLlist):
-            i+=1  # request number
-
-        response = urllib.request.urlopen(url)
-        arcpy.SetProgressorLabel("")
-
-        if response.code == 200:
-            return response.readlines()
-        else:
-            AddMsgAndPrint(".\nFailed to open URL: " + str(url),2)
-            return None
-
-    except URLError as e:
-        AddMsgAndPrint('URL Error' + str(e),2)
-        return None
-
-    except HTTPError as e:
-        AddMsgAndPrint('HTTP Error' + str(e),2)
-        return None
-
-    except socket.timeout as e:
-        AddMsgAndPrint("Server Timeout Error", 2)
-        return None
-
-    except socket.error as e:
-        AddMsgAndPrint("NASIS Reports Website connection failure", 2)
-        return None
-
-    except errorMsg():
-        return None
-
-## ===================================================================================
-def addPedonReportHyperlink(pedonFC):
-    # Description:
-    # This function will add a field called 'pedondescriptionreport' to the pedon layer to
-    # to store a hyperlink to the pedon description report for every user pedon ID.
-
-    # Parameters
-    # path to the 'pedon' layer within the output database
-
-    # Returns
-    # True if the data was organized correctly
-    # False if the object was empty or there was an error.
-
-    # 2 similar reports to choose from
-    #pedonDescLink = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=Pedon%20Description%20html%20(userpedid)&pedon_id='
-    #pedonDescLink = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=Pedon_Site_Description_usepedonid&pedon_id='
-
-    try:
-        arcpy.SetProgressorLabel("Adding Pedon Description Hyperlink to Pedon layer")
-
-        # New field that will be added to PedonFC
-        fieldName = "pedondescriptionreport"
-        arcpy.AddField_management(pedonFC, fieldName,'TEXT',field_length=215, field_alias="Pedon Description Report", field_is_nullable="NULLABLE")
-
-        expression = "createPedonDescLink(!upedonid!)"
-
-        codeblock = """
-def createPedonDescLink(pedonID):
-
-    pedonDescLink = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=Pedon_Site_Description_usepedonid&pedon_id=' + pedonID
-    #hyperLinkName = pedonID + r' Pedon Description Report'
-    hyperLinkName = r'Pedon Description Report'
-    arcGISProHyperLink = r'<a href="' + pedonDescLink + r'" target="_top">' + hyperLinkName + r'</a>'
-
-    return arcGISProHyperLink"""
-
-        # Execute CalculateField
-        arcpy.CalculateField_management(pedonFC, fieldName, expression, "PYTHON3",codeblock)
-        return True
-
-    except:
-        errorMsg()
-        return False
-
-## ===================================================================================
-def removePIIfields(pedonDB,fldsToDelete,tableFldDict):
-
-    try:
-
-        AddMsgAndPrint(f"\nDeleting attributes that may contain PII information from the following fields:" )
-        AddMsgAndPrint(f".\t{'Table Name' : <25}{'Field Name' : <25}")
-        AddMsgAndPrint(f".\t{'=' * 40}")
-
-        # Open Metadata table containing information for other pedon tables
-        theMDTable = f"{pedonDB}\{prefix}MetadataTable"
-        maxCharTable = max([len(table) for table in fldsToDelete]) + 1
-
-        for table in fldsToDelete:
-            tablePath = f"{pedonDB}\{table}"
-            tblAlias = tableFldDict[table][0]
-            fieldName = fldsToDelete[table]
-
-            if arcpy.Exists(tablePath):
-                try:
-                    arcpy.CalculateField_management(tablePath,fieldName,'""',"PYTHON3")
-                except:
-                    AddMsgAndPrint(f".\tFailed to remove attributes from {fieldName} field",1)
-
-                aliasExpression = f"{arcpy.AddFieldDelimiters(tablePath, 'tabphynm')} = \'{table}\' AND {arcpy.AddFieldDelimiters(tablePath, 'attphynm')} =  \'{fieldName}\'"
-                fldAlias = [row[0] for row in arcpy.da.SearchCursor(theMDTable, ("collab"), where_clause=aliasExpression)][0]
-                AddMsgAndPrint(f".\t{tblAlias : <25}{fldAlias: <25}")
-
-    except:
-        errorMsg()
-        return False
-
-#===================================================================================================================================
-""" ----------------------------------------My Notes -------------------------------------------------"""
-
-""" --------------- Column Headers
-Column order
-1.	Row_Number2,
-2.	upedonid,
-3.	peiid,
-4.	pedlabsampnum,
-5.	longstddecimaldegrees ,
-6.	latstddecimaldegrees
-                    ----------------------"""
-
-""" 1st Report """
-# If user choses to download all Pedons then the 1st report is to get a list of ALL NASIS pedonIDs:
-# https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_PEDON_PEIID_LIST_ALL_OF_NASIS'
-
-# If the user choses to download pedons by AOI then the 1st report is to get a count of pedons within a bounding box
-# https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_ANALYSIS_PC_PEDON_NUMBER_SUM&lat1=43&lat2=45&long1=-90&long2=-88
-
-""" 2nd Report """
-# Used to get a list of peiids based on bounding box coordinates; This peiid list will passed over to the 3rd report
-# https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_EXPORT_PEDON_BOX_COUNT&lat1=43&lat2=45&long1=-90&long2=-88
-
-""" 3rd Report """
-# This report will return all NASIS pedon related information that will be parsed into a FGDB.
-
-# Original Report URL
-# https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=TEST_sub_pedon_pc_6.1_phorizon&pedonid_list=
-
-# Updated Report URL
-# https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_AnalysisPC_MAIN_URL_EXPORT&pedonid_list=
-
-# Sample URL with pedonIDs:
-# https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_AnalysisPC_MAIN_URL_EXPORT&pedonid_list=36186,59976,60464,60465,101219,102867,106105,106106
-#===================================================================================================================================
-
-
-# =========================================== Main Body ==========================================
-# Import modules
-import sys, string, os, traceback, re, arcpy, socket, time, urllib, multiprocessing, requests
-from arcpy import env
-from sys import getsizeof, stderr
-from itertools import chain
-from collections import deque
-
-from urllib.error import HTTPError, URLError
-from urllib.request import Request
-
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
-
-if __name__ == '__main__':
-
-    try:
-
-        try:
-            # This set of parameters corresponds to the 'Extract Pedons from NASIS by AOI' tool
-            inputFeatures = arcpy.GetParameter(0)
-            DBname = arcpy.GetParameter(1)
-            outputFolder = arcpy.GetParameterAsText(2)
-            sqliteFormat = arcpy.GetParameter(3)
-            allPedons = arcpy.GetParameter(4)
-
-        except:
-            # This set of parameters corresponds to the 'Extract All Pedons from NASIS' tool
-            DBname = arcpy.GetParameter(0)
-            outputFolder = arcpy.GetParameterAsText(1)
-            sqliteFormat = arcpy.GetParameter(2)
-            allPedons = arcpy.GetParameter(3)
-
-##        inputFeatures = r'E:\Temp\scratch\scratch.gdb\PedonTest'
-##        DBname = 'PedonTest'
-##        outputFolder = r'E:\Temp\scratch'
-##        sqliteFormat = False
-##        allPedons = False
-
-        if sqliteFormat == True:
-            prefix = "main."
-        else:
-            prefix = ""
-
-        arcpy.env.parallelProcessingFactor = "100%"
-        arcpy.env.overwriteOutput = True
-
-        textFilePath = outputFolder + os.sep + DBname + "_logFile.txt"
-        startTime = tic()
-
-        # User has chosen to donwload all pedons
-        if allPedons:
-            pedonDict = getDictionaryOfAllPedonIDs()
-            totalPedons = len(pedonDict)
-            #pedonDict = dict(d.items()[len(d)/2:])
-
-            AddMsgAndPrint(".\nProcessing " + str(splitThousands(totalPedons)) + " pedons")
-
-            if not pedonDict:
-                AddMsgAndPrint(".\nFailed to obtain a list of ALL NASIS Pedon IDs",2)
-                exit()
-
-        # User has chosen to extract pedons by AOI
-        else:
-
-            # Get Bounding box coordinates of AOI
-            # Lat1 = 43.8480050;Lat2 = 44.1962;Long1 = -93.7678808;Long2 = -93.40649;
-            Lat1,Lat2,Long1,Long2 = getBoundingCoordinates(inputFeatures)
-
-            if not Lat1:
-                AddMsgAndPrint(".\nFailed to acquire Lat/Long coordinates to pass over; Try a new input feature",2)
-                exit()
-
-            coordStr = "&Lat1=" + str(Lat1) + "&Lat2=" + str(Lat2) + "&Long1=" + str(Long1) + "&Long2=" + str(Long2)
-
-            # Get a number of PedonIDs that are within the bounding box from NASIS
-            # Exit if pedon count is 0
-            # Uses the 'WEB_ANALYSIS_PC_PEDON_NUMBER_SUM' NASIS report
-            areaPedonCount = getNASISpedonCountbyBox(coordStr)
-
-            if areaPedonCount:
-                AddMsgAndPrint(".\tThere are " + splitThousands(areaPedonCount) + " pedons within the bounding coordinates")
-            else:
-                AddMsgAndPrint(".\nThere are no records found within the area of interest.  Try using a larger area",2)
-                exit()
-
-            # Get a list of PedonIDs that are within the bounding box from NASIS
-            # Uses the 'WEB_EXPORT_PEDON_BOX_COUNT' NASIS report
-            # populate the pedonDict with the pedons that fall within the bounding coordinates of the AOI
-            # {peiid: (siteID,Labnum,X,Y)} -- {'122647': ('84IA0130011', '85P0558', '-92.3241653', '42.3116684')
-            pedonDict = getNASISpedonIDsByBox(coordStr)
-
-            if not pedonDict:
-                AddMsgAndPrint(".\n\tFailed to get a list of pedonIDs from NASIS \n",2)
-                exit()
-
-            # Filter pedons by those that fall completely within the AOI; This will update the pedonDict
-            totalPedons = filterPedonsByFeature(inputFeatures)
-
-            if not totalPedons:
-                AddMsgAndPrint(".\n\tFailed to filter list of Pedons by Area of Interest. EXITING! \n",2)
-                exit()
-
-            """ ------------------------------------------------------Create New File Geodatabaes and get Table Aliases for printing -------------------------------------------------------------------
-                Create a new FGDB using a pre-established XML workspace schema.  All tables will be empty
-                and relationships established.  A dictionary of empty lists will be created as a placeholder
-                for the values from the XML report.  The name and quantity of lists will be the same as the FGDB"""
-
-        # Create a FGDB or sqlite database
-        pedonDB = createPedonDB()
-        arcpy.env.workspace = pedonDB
-
-        if not pedonDB:
-            AddMsgAndPrint(".\nFailed to Initiate Empty Pedon Database.  Error in createPedonDB() function. Exiting!",2)
-            exit()
-
-        # Create 2 Dictionaries that will be used throughout this script
-        pedonDBtablesDict,tableFldDict = createReferenceObjects(pedonDB)
-
-        if not tableFldDict:
-            AddMsgAndPrint(".\nCould not retrieve alias names from " + prefix + "\'MetadataTable\'",1)
-            exit()
-
-        """ ------------------------------------------ Get Site, Pedon, and Pedon Horizon information from NASIS -------------------------------------------------------------------------
-        ----------------------------------------------- Uses the 'WEB_AnalysisPC_MAIN_URL_EXPORT' NASIS report ---------------------------------------------------------------------------
-        In order to request pedon information, the pedonIDs need to be split up into manageable
-        lists of about 265 pedons due to URL limitations.  Submit these individual lists of pedon
-        to the server """
-
-        # Parse pedonIDs into lists containing about 265 pedons
-        listOfPedonStrings,numOfPedonStrings = parsePedonsIntoLists()
-
-        if numOfPedonStrings > 1:
-            AddMsgAndPrint("\nDue to URL limitations there will be " + splitThousands(len(listOfPedonStrings))+ " seperate requests to NASIS:",1)
-        else:
-            AddMsgAndPrint(".\n")
-
-        i = 1   # represents the request number; only used for ArcMap formatting
-
-        multiThreadStartTime = tic()
-        URLlist = list()              # List of unique URLs of pedonIDs
-        futureResults = []            # List of html results from opening URLs
-
-        # Iterate through a list of pedons strings to create a list of URLs by concatenating the URL
-        # base with the pedon strings.
-        for pedonString in listOfPedonStrings:
-            URL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_AnalysisPC_MAIN_URL_EXPORT&pedonid_list=' + pedonString
-            URLlist.append(URL)
-
-        arcpy.SetProgressor("step", "Sending Pedon Requests", 0, len(URLlist), 1)
-
-        # Create an Executor to manage all tasks.  Using the with statement creates a context
-        # manager, which ensures any stray threads or processes get cleaned up properly when done.
-        with ThreadPoolExecutor(max_workers=multiprocessing.cpu_count()) as executor:
-
-            # use a set comprehension to start all tasks.  This creates a future object
-            future_to_url = {executor.submit(openURL, url): url for url in URLlist}
-
-            # yield future objects as they are done.
-            for future in as_completed(future_to_url):
-                #futureResults.append(future.result())
-                organizeFutureInstanceIntoPedonDict(future.result())
-                arcpy.SetProgressorPosition()
-
-        arcpy.ResetProgressor()
-
-##        with ProcessPoolExecutor() as executor:
-##            for result in futureResults:
-##                organizeFutureInstanceIntoPedonDict(result)
-
-
-# The next 10 lines were used to test the ProcessPoolExecutor with arcpy.da.editor
-# The test was successful but it was way too slow.
-##        edit = arcpy.da.Editor(pedonDB)
-##        pedonDBtables = pedonDBtablesDict.keys()  # A list of pedonDB tables extracted from tblAliases dict
-##        pedonDBtables.sort()                       # Sort the list so that tables are alphabetical order
-##
-##        maxCharTable = max([len(table) for table in pedonDBtables]) + 1
-##        maxCharAlias = max([len(value[1]) for value in tblAliases.items()])
-##
-##        with ProcessPoolExecutor() as executor:
-##            for table in pedonDBtables:
-##                importPedonDataByTable(table)
-
-        # Import Pedon Information into Pedon FGDB
-        if len(pedonDBtablesDict[prefix + 'pedon']):
-            if not importPedonData(tableFldDict,verbose=(True if i==numOfPedonStrings else False)):
-                exit()
-
-        # Pedon FGDB path
-        pedonDBfc = os.path.join(pedonDB,prefix + 'pedon')
-
-        # Add Hyperlink to Pedon Description Report
-        if addPedonReportHyperlink(pedonDBfc):
-            AddMsgAndPrint(".\nSuccessfully added Pedon Description Report Hyperlink to Pedon Table")
-        else:
-            AddMsgAndPrint(".\nPedon Description Report Hyperlink Could not be added",2)
-
-        # Remove fields that could potentially have PII
-        fldsToRemove = {'siteobstext':'textentry','sitetext':'textentry','petext':'textentry'}
-        removePIIfields(pedonDB,fldsToRemove,tableFldDict)
-
-        """ ------------------------------------ Report Summary of results -----------------------------------"""
-        pedonCount = int(arcpy.GetCount_management(pedonDBfc).getOutput(0))
-
-        # Text file that will be created with pedonIDs that did not get collected
-        errorFile = outputFolder + os.sep + os.path.basename(pedonDB).split('.')[0] + "_error.txt"
-
-        if os.path.exists(errorFile):
-            os.remove(errorFile)
-
-        if totalPedons == pedonCount:
-            AddMsgAndPrint(".\nSuccessfully downloaded " + splitThousands(totalPedons) + " pedons from NASIS")
-
-        else:
-            difference = totalPedons - pedonCount
-            AddMsgAndPrint(".\nDownloaded " + splitThousands(pedonCount) + " from NASIS",2)
-            AddMsgAndPrint(".\tFailed to download " + splitThousands(difference) + " pedons from NASIS:",2)
-
-            FGDBpedons = [str(row[0]) for row in arcpy.da.SearchCursor(pedonDBfc,'peiid')]
-            missingPedons = list(set(pedonDict.keys()) - set(FGDBpedons))
-
-            # Log pedons that did not download successfully into a text file
-            f = open(errorFile,'a+')
-            i=1
-            for miaPedon in missingPedons:
-                if i != len(missingPedons):
-                    f.write(miaPedon + "\n")
-                else:
-                    f.write(miaPedon)
-                i+=1
-            f.close()
-
-            if difference < 20:
-                AddMsgAndPrint(".")
-                AddMsgAndPrint(".\t\t" + str(missingPedons))
-
-            AddMsgAndPrint(".\n\tThe Missing Pedons have been written to " + errorFile + " files",2)
-
-        """ ---------------------------Add Pedon Feature Class to ArcGIS Pro Session if available ------------------"""
-        try:
-            if arcpy.GetCount_management(pedonDBfc).inputCount > 0:
-                aprx = arcpy.mp.ArcGISProject("CURRENT")
-                aprxMap = aprx.listMaps()[0]
-                aprxMap.addDataFromPath(pedonDBfc)
-                AddMsgAndPrint(".\nAdded the pedon feature class to your ArcGIS Pro Session\n\n")
-        except:
-            pass
-
-##        FinishTime = toc(startTime)
-##        AddMsgAndPrint("Total Time = " + str(FinishTime))
-##        AddMsgAndPrint(".\n")
-##        AddMsgAndPrint("Dictionary Size: " + str(getObjectSize(pedonDBtablesDict)))
-
-    except:
-        FinishTime = toc(startTime)
-        AddMsgAndPrint("Total Time = " + str(FinishTime))
-        #AddMsgAndPrint("Size of pedonDBtablesDict  = " + str(objSize) )
-        errorMsg()
+#-------------------------------------------------------------------------------
+# Name:  NASISpedons_Extract_Pedons_from_NASIS_Multithreading_ArcGISPro_SQL.py
+#
+# Author: Adolfo.Diaz
+# e-mail: adolfo.diaz@wi.usda.gov
+# phone: 608.662.4422 ext. 216
+#
+# Author: Jason.Nemecek
+# e-mail: jason.nemecek@wi.usda.gov
+# phone: 608.662.4422 ext. 190
+#
+# Created:     7/04/2016
+# Last Modified: 7/12/2021
+# Copyright:   (c) Adolfo.Diaz 2016
+
+# https://alexwlchan.net/2019/10/adventures-with-concurrent-futures/
+
+# ==========================================================================================
+# Updated  4/29/2021 - Adolfo Diaz
+# Major rewrite to introduce parallel tasking using concurrent.futures python
+# module.  Using this module I was able t
+
+# ==========================================================================================
+# Updated  5/26/2021 - Adolfo Diaz
+# - Changed the format in which failed pedon ids are written to the error log
+#   file.  Before the pedon IDs were logged as a continous list seperated by commas.
+#   Now, the pedon IDs are logged with a carriage return
+# - Added capability to have the Pedons automatically added to the ArcGIS Pro Session
+#   if the pedon fc has valid pedons.
+
+# ==========================================================================================
+# Updated  6/16/2021 - Adolfo Diaz
+# - Added functionality to output an SQLite Database Format
+
+# ==========================================================================================
+# Updated  7/12/2021 - Adolfo Diaz
+# - Added field within pedon layer to store pedon description hyperlink report
+
+# ==========================================================================================
+# Updated  2/8/2022 - Adolfo Diaz
+# - Addressed a bug associated with unprojected feature in the getBoundingCoordinates function
+
+# ==========================================================================================
+# Updated  3/14/2022 - Adolfo Diaz
+# - updated createReferenceObjects function to set the number of fields to 9 for the siteaoverlap
+#   table from 6.  This is b/c the metadatatable only has 6 fields and 3 additional fields are
+#   added (areasym, areaname and areatype)
+
+# ==========================================================================================
+# Updated  6/17/2022 - Adolfo Diaz
+# - Added a new function to remove potential PII from the following table/fields:
+#  .	Table Name               Field Name
+#  =============================================
+#  .	Site Observation Text    Text Entry
+#  .	Site Text                Text Entry
+#  .	Pedon Text               Text Entry
+
+# ==========================================================================================
+# Updated  10/18/2026
+# - All NASIS report requests now go through a single keep-alive requests session
+#   (createNASISsession) instead of urllib.request.urlopen.  Connections to the NASIS Reports
+#   website are pooled and reused across threads.  Pool size and connect/read timeouts are
+#   set at the top of the main body.
+
+# ==========================================================================================
+# Updated  10/18/2026
+# - Replaced ThreadPoolExecutor(max_workers=multiprocessing.cpu_count()) with an asyncio fetch
+#   engine (fetchPedonReports).  The number of pedon requests in flight is set explicitly by
+#   maxRequestsInFlight instead of the number of CPUs.
+
+# ==========================================================================================
+# Updated  10/18/2026
+# - Added an AIMD controller (AIMDController) to the fetch engine.  The number of requests in
+#   flight grows while NASIS p95 latency and error rate are healthy and is halved on timeouts,
+#   5xx/429 responses and connection failures (openURL failureType); 4xx responses and local
+#   errors do not change it.  The current window is shown in the progress label.
+
+# ==========================================================================================
+# Updated  10/18/2026
+# - Failed pedon requests are retried within the same run using exponential backoff with
+#   jitter, up to maxRetriesPerRequest per request and retryBudget for the whole run.  Only
+#   pedons that still fail after retrying end up in the _error.txt file.
+
+# ==========================================================================================
+# Updated  10/18/2026
+# - A pedon request whose report returns an ERROR is split in half and re-requested until the
+#   offending pedons are isolated.  The remaining pedons are kept and the offending pedons are
+#   written to a _poisonPedons.txt file.  Reports without records (deleted pedons) and reports
+#   that could not be organized are not split (NASISreportFailure).  Splitting stops when both
+#   halves fail with the same ERROR line, when most recent requests fail with an ERROR or when
+#   splitBudget requests have been added in the run; those pedons are unrecoverable.
+
+# ==========================================================================================
+# Updated  10/18/2026
+# - Added a streaming mode (bStreamReports) where openURL organizes each pedon report line by
+#   line while it is received instead of returning response.readlines().  Records are collected
+#   per request and merged by the fetch engine.
+
+# ==========================================================================================
+# Updated  10/18/2026
+# - NASIS reports are requested with gzip/deflate compression and decompressed while they are
+#   streamed.  The compressed and uncompressed size of every pedon request is recorded and
+#   summarized at the end of the download (summarizeReportTransfer).
+
+# ==========================================================================================
+# Updated  10/18/2026
+# - Added an optional on-disk cache of raw pedon reports (NASISreportCache; bUseReportCache).
+#   Reports are stored gzip compressed under the report name and a hash of the sorted pedonIDs,
+#   are used for reportCacheTTL days and the least recently used reports are removed once the
+#   cache is larger than reportCacheMaxSize.  A cached report that cannot be organized is
+#   removed from the cache and requested from NASIS again.
+
+# ==========================================================================================
+# Updated  10/18/2026
+# - Added an optional append-only archive of the raw NASIS pedon reports (bArchiveReports).
+#   Reports are gzip compressed into segment files with an index of pedonIDs per report.
+# - Setting replayArchiveFolder rebuilds the pedon database from the latest archived run
+#   without sending any requests to NASIS.  Only runs whose requests finished are replayed
+#   (archive_runs.txt); the pedonIDs requested in the run are kept so pedons that were not
+#   archived are reported as missing.  An archive without a complete run is replayed with a warning.
+
+# ==========================================================================================
+# Updated  10/18/2026
+# - Pedon requests are packed by estimated report size instead of URL length alone.  Lab pedons
+#   cost more than field pedons; bytes per pedon of each are fit from the reports of every run
+#   and kept in NASIS_Pedon_Report_Stats.txt.  Largest requests are sent first.
+
+# ==========================================================================================
+# Updated  10/18/2026
+# - Added NASIS_Pedon_Fetch_Stats.sqlite in the output folder.  Every run records the latency,
+#   bytes and records per table of every pedon request and the number of rows of every pedon.
+#   The batch planner estimates pedons from their rows in previous runs and the progress label
+#   shows the time left.  Pedons with 3 times the rows of a previous run are reported.
+#   The rows of previous runs are kept in arrays sorted by peiid and the rows of this run in
+#   arrays of PedonRowCounts.  The rows of every request are counted in a thread of their own;
+#   the rows of streamed reports are counted as well.
+#   Replaces NASIS_Pedon_Report_Stats.txt.
+
+# ==========================================================================================
+# Updated  10/18/2026
+# - Added a circuit breaker for NASIS outages.  NASIS is probed with a tiny
+#   WEB_ANALYSIS_PC_PEDON_NUMBER_SUM box before the run starts.  After 10 failed pedon requests
+#   in a row requests are paused and NASIS is probed every minute; requests resume when it
+#   responds.  The run is abandoned (no database is built) after a 30 minute outage.  Timeouts,
+#   connection errors, 5xx responses and ERROR reports or error pages count as failed requests;
+#   4xx responses and local errors do not.
+
+# ==========================================================================================
+# Updated  10/18/2026
+# - All pedons: the list of ALL pedonIDs is received in its own thread (streamAllPedonIDs) while
+#   the pedon database is created.  Pedon requests are planned and sent to the fetch engine as
+#   the pedonIDs arrive instead of after the whole list has been read (bPipelineDiscovery).
+
+# ==========================================================================================
+# Updated  10/18/2026
+# - pedonDict is now a PedonIndex instead of a dictionary of pedonID strings.  peiids are kept
+#   in a 64-bit integer array with a membership bitset; coordinates, interned user pedon IDs and
+#   a lab pedon bitset are only kept for pedons selected by AOI.  Iteration is sorted by peiid.
+
+# ==========================================================================================
+# Updated  10/18/2026
+# - Added getReportPayload.  The report data between '<div id="ReportData">' and STOP is
+#   located with a byte search of the raw report and only the data is decoded; the html
+#   envelope is no longer decoded line by line.  Used by every report reader.
+
+# ==========================================================================================
+# Updated  10/18/2026
+# - Pedon records are kept in PedonTableBuffers (typed column buffers) instead of lists of
+#   pipe-delimited strings.  The records of a table are split at once and converted column
+#   by column to the type of their field (getValueConverter); importPedonData no longer
+#   splits, strips and converts every value.
+
+# ==========================================================================================
+# Updated  10/18/2026
+# - Records broken over multiple lines by line breaks in a text field are reassembled by
+#   PartialRecord.  The delimiters of every line are counted once and the lines are joined
+#   once with their original line breaks.  An incomplete record at the end of a table is
+#   reported as invalid instead of being glued to the next table's record.
+
+# ==========================================================================================
+# Updated  10/18/2026
+# - Pedon reports can be organized by parser processes (parseProcesses).  fetchPedonReports
+#   puts the raw reports in a bounded parse queue that is drained by a ProcessPoolExecutor
+#   (initReportParser, parsePedonReport).  Only the converted column buffers of a report are
+#   sent back and merged.  A request keeps its slot until its report is queued.  Off by default
+#   (parseProcesses = 0); if the parser processes fail the reports are organized in this process.
+
+# ==========================================================================================
+# Updated  10/18/2026
+# - The header line of every table block is read instead of skipped.  getReportColumnMap
+#   matches the report columns to the fields of the table by name so reordered columns go
+#   to their field, added columns are ignored and missing fields are NULL.  A table block
+#   that is not in the pedon database no longer fails the whole report.  Headers whose names
+#   are not field names are read in order; a block without its key fields fails the report.
+#   The values without a field name (pedon X,Y, extra siteaoverlap values) are only taken from
+#   the unrecognized columns when exactly that many are left; otherwise the block fails the report.
+
+# ==========================================================================================
+# Updated  10/18/2026
+# - Added pedonTableProfile (getPedonTableSelection) to extract only some of the pedon tables:
+#   a profile ('morphology','lab') or a list of tables.  createPedonDB deletes the other tables
+#   and their relationships from the new database and getReportPayload cuts their blocks out
+#   of the reports at byte level before they are decoded.
+
+# ==========================================================================================
+# Updated  10/18/2026
+# - SQLite databases are loaded with sqlite3 (bulkLoadSQLite) instead of arcpy InsertCursors:
+#   executemany per table in a single transaction with a bulk load PRAGMA profile that is set
+#   back to safe settings afterwards.  Dates are stored as Julian days.  The pedon points are
+#   created with st_point of the ST_Geometry library (stGeometryLibrary, NASIS_STGEOMETRY_LIBRARY
+#   or the ArcGIS installation); if it cannot be loaded the pedon table uses an InsertCursor.
+#   The loader is in NASISpedons_SQLite_Loader.py which does not use arcpy.  bBulkLoadSQLite
+#   is off until the loader is verified with the ST_Geometry library.
+
+# ==========================================================================================
+# Updated  10/18/2026
+# - The table indexes of a SQLite database are removed before the pedon data is imported and
+#   rebuilt once all of the records are in (bDeferIndexes).  The index DDL is captured from
+#   sqlite_master and rebuilt in a single transaction using SQLite sorter threads.  The indexes
+#   are rebuilt even if the import fails.  FGDB indexes are left in place.
+
+#-------------------------------------------------------------------------------
+
+
+## ===================================================================================
+def AddMsgAndPrint(msg, severity=0):
+    # prints message to screen if run as a python script
+    # Adds tool message to the geoprocessor
+    #
+    #Split the message on \n first, so that if it's multiple lines, a GPMessage will be added for each line
+    try:
+        print(msg)
+
+        try:
+            f = open(textFilePath,'a+')
+            f.write(msg + " \n")
+            f.close
+            del f
+        except:
+            pass
+
+        #for string in msg.split('\n'):
+            #Add a geoprocessing message (in case this is run as a tool)
+        if severity == 0:
+            arcpy.AddMessage(msg)
+
+        elif severity == 1:
+            arcpy.AddWarning(msg)
+
+        elif severity == 2:
+            arcpy.AddError("\n" + msg)
+
+    except:
+        pass
+
+## ===================================================================================
+def errorMsg():
+    try:
+
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        theMsg = "\t" + traceback.format_exception(exc_type, exc_value, exc_traceback)[1] + "\n\t" + traceback.format_exception(exc_type, exc_value, exc_traceback)[-1]
+
+        if theMsg.find("exit") > -1:
+            AddMsgAndPrint(".\n\n")
+            pass
+        else:
+            AddMsgAndPrint(theMsg,2)
+
+    except:
+        AddMsgAndPrint("Unhandled error in unHandledException method", 2)
+        pass
+
+## ================================================================================================================
+def tic():
+    """ Returns the current time """
+
+    return time.time()
+
+## ================================================================================================================
+def toc(_start_time):
+    """ Returns the total time by subtracting the start time - finish time"""
+
+    try:
+
+        t_sec = round(time.time() - _start_time)
+        (t_min, t_sec) = divmod(t_sec,60)
+        (t_hour,t_min) = divmod(t_min,60)
+
+        if t_hour:
+            return ('{} hour(s): {} minute(s): {} second(s)'.format(int(t_hour),int(t_min),int(t_sec)))
+        elif t_min:
+            return ('{} minute(s): {} second(s)'.format(int(t_min),int(t_sec)))
+        else:
+            return ('{} second(s)'.format(int(t_sec)))
+
+    except:
+        errorMsg()
+
+## ================================================================================================================
+def splitThousands(someNumber):
+    """ will determine where to put a thousands seperator if one is needed.
+        Input is an integer.  Integer with or without thousands seperator is returned."""
+
+    try:
+        return re.sub(r'(\d{3})(?=\d)', r'\1,', str(someNumber)[::-1])[::-1]
+
+    except:
+        errorMsg()
+        return someNumber
+
+## ================================================================================================================
+def getNASISbreakdownCounts():
+    """ This function will send the bounding coordinates to the 'Web Export Pedon Box' NASIS report
+        and return a list of pedons within the bounding coordinates.  Pedons include regular
+        NASIS pedons and LAB pedons.  Each record in the report will contain the following values:
+
+            Row_Number,upedonid,peiid,pedlabsampnum,Longstddecimaldegrees,latstddecimaldegrees,Undisclosed Pedon
+            24|S1994MN161001|102861|94P0697|-93.5380936|44.0612717|'Y'
+
+        A dictionary will be returned containing something similar:
+        {'102857': ('S1954MN161113A', '40A1694', '-93.6499481', '43.8647194','Y'),
+        '102858': ('S1954MN161113B', '40A1695', '-93.6455002', '43.8899956','N')}
+        theURL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_EXPORT_PEDON_BOX_COUNT&Lat1=44.070820&Lat2=44.596950&Long1=-91.166274&Long2=-90.311911'
+
+        returns a pedonDictionary"""
+
+        #-------------------------- KSSL Pedon and Undisclosed Metrics ----------------------------------
+        #------------------------------------------------------------------------------------------------
+        # This section is only to determine how many Lab Pedons and how many undiscolsed pedons there are
+        # nationwide.  It is recommended that the WEB_EXPORT_PEDON_BOX_COUNT NASIS report in the KSSL folder
+        # be duplicated and modified such that ONLY 2 fields are returned (pedlabsampnum and location) which
+        # represent the pedon lab sample number and a boolean indicating if the pedon is undisclosed.
+        #
+        # Iterate through the getWebExportPedon function 4 times to request all pedons from NASIS and get a
+        # Lab pedon and undisclosed count stricly for metrics.
+
+    def runWebMetricReport(coordinates):
+        try:
+            #AddMsgAndPrint(".\nGetting a NASIS pedon count using the above bounding coordinates")
+            URL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_NASIS_Pedons_WFS_Metrics_AD' + coordinates
+
+            """ --------------------------------------  Try connecting to NASIS to read the report ------------------------"""
+            try:
+                theReport = getNASISreportPayload(URL)
+            except:
+                try:
+                    AddMsgAndPrint(".\t2nd attempt at requesting data")
+                    theReport = getNASISreportPayload(URL)
+
+                except:
+                    try:
+                        AddMsgAndPrint(".\t3rd attempt at requesting data")
+                        theReport = getNASISreportPayload(URL)
+
+                    except requests.exceptions.HTTPError as e:
+                        AddMsgAndPrint('HTTP Error' + str(e),2)
+                        return False
+
+                    except requests.exceptions.Timeout as e:
+                        AddMsgAndPrint(".\n.\t" + URL)
+                        AddMsgAndPrint(".\tServer Timeout Error", 2)
+                        return False
+
+                    except requests.exceptions.ConnectionError as e:
+                        AddMsgAndPrint(".\n.\t" + URL)
+                        AddMsgAndPrint(".\tNASIS Reports Website connection failure", 2)
+                        return False
+
+            """ --------------------------------------  Read the NASIS report ------------------------------------"""
+            undisclosedLab = 0
+            disclosedLab = 0
+            undisclosedNASIS = 0
+            disclosedNASIS = 0
+            test = 0
+
+            peiidList = list()
+
+            # iterate through the records of the report
+            for theValue in theReport:
+
+                # Found a valid project record i.e. 91P0481|N (only 2 values)
+                theRec = theValue.split("|")
+
+                if len(theRec) != 3:
+                    AddMsgAndPrint(".\tNASIS Report: WEB_NASIS_Pedons_WFS_Metrics_AD is not returning the correct amount of values per record",2)
+                    return False
+
+                peiidList.append(theRec[0])
+                continue
+
+                # Go through the different combinations of metrics
+                # Record is an undisclosed lab pedon
+                if theRec[0] != 'Null' and theRec[1] == 'Y':
+                    undisclosedLab+= 1
+
+                # Record is a disclosed lab pedon
+                elif theRec[0] != 'Null' and theRec[1] == 'N':
+                    disclosedLab+=1
+
+                # Record is an undisclosed NASIS pedon
+                elif theRec[0] == 'Null' and theRec[1] == 'Y':
+                    undisclosedNASIS+= 1
+
+                # Record is an disclosed NASIS pedon
+                elif theRec[0] == 'Null' and theRec[1] == 'N':
+                    disclosedNASIS+=1
+
+                else:
+                    AddMsgAndPrint(".\tUnaccounted for combination: " + str(theValue),1)
+                test += 1
+
+##            bCountFailed = False
+##            if undisclosedLab + disclosedLab + undisclosedNASIS + disclosedNASIS != test:
+##                print(f"{coordinates} did not Match:")
+##                print("\t" + str(undisclosedLab))
+##                print("\t" + str(disclosedLab))
+##                print("\t" + str(undisclosedNASIS))
+##                print("\t" + str(disclosedNASIS))
+##                print("\t" + str(test))
+##                bCountFailed = True
+##
+##            if undisclosedLab == 0 and disclosedLab == 0 and undisclosedNASIS == 0 and disclosedNASIS == 0:
+##                print(f"    {coordinates} Returned empty:")
+##
+##            print(f"    {undisclosedLab},{disclosedLab},{undisclosedNASIS},{disclosedNASIS},{test},{bCountFailed}")
+##
+##            return [undisclosedLab,disclosedLab,undisclosedNASIS,disclosedNASIS,test,bCountFailed]
+            return peiidList
+
+        except:
+            errorMsg()
+            return [0,0,0]
+
+    try:
+        Starttest = tic()
+
+        latNorth = 49
+        latSouth = 24
+        longWest = -125
+        longEast = -65
+        degreeSize = 5
+
+        # list of coordinates for the 5x5 degree blocks covering the US
+        USdegreeblocks = []
+
+        # Create list of coordinates for 5x5 degree blocks for US
+        for lat in range(latSouth,latNorth,degreeSize):
+            for long in range(longWest,longEast,degreeSize):
+                USdegreeblocks.append([lat,lat+degreeSize,long,long+degreeSize])
+
+        # List of coordinates for 4 boxes around the US for the NW hemisphere
+        #NW_hemisphere = [[0,90,-179.5,longWest],[0,latSouth,longWest,-0.1],[latSouth,90,longEast,-0.1],[latNorth,90,longWest,longEast]]
+        NW_hemisphere = [[0,90,-180,longWest],[0,latSouth,longWest,0],[latSouth,90,longEast,0],[latNorth,90,longWest,longEast]]
+
+        # Lat1, Lat2, Long1, Long2 -- S,N,W,E -- NE, SW, ,SE hemishpere
+        # This represents the master list of coordinates to send to NASIS report
+        #worldQuadrant = [[0.0,90.0,0.5,179.5],[-90.0,0.0,-179.5,-0.5],[-90.0,0.0,0.5,179.5]]
+        worldQuadrant = [[0,90,0,180],[-90,0,-180,0],[-90,0,0,180]]
+
+        # Add NW Hemisphere box coordinates to worldQuadrant list
+        for coordLst in NW_hemisphere:
+            worldQuadrant.append(coordLst)
+
+        # Add US degree block coordinates to worldQuadrant list
+        for coordLst in USdegreeblocks:
+            worldQuadrant.append(coordLst)
+
+##        i=0
+##        for coord in worldQuadrant:
+##            i+=1
+##            Left = coord[2]
+##            Right = coord[3]
+##            Top = coord[1]
+##            Bottom = coord[0]
+##            outFC = f"N:\\flex\\NCSS_Pedons\\NASIS_Pedons\\Web_Feature_Service\\degreeBlocks\\quad_{Left}_{Right}_{Top}_{Bottom}.shp"
+##            origin_coord = f"{Left} {Bottom}"
+##            y_axis_coord = f"{Left} {Bottom + 10}"
+##            cell_width = abs(Left - Right)
+##            cell_height = abs(Top - Bottom)
+##            rows = 0
+##            columns = 0
+##            corner_coord = f"{Right} {Top}"
+##            template = f"{Left} {Bottom} {Right} {Top}"
+##            arcpy.CreateFishnet_management(outFC,origin_coord,y_axis_coord,cell_width,cell_height,rows,columns,corner_coord,'NO_LABELS',template,"POLYGON")
+
+        undisclosedLabRecs = 0
+        disclosedLabRecs = 0
+        undisclosedNASISrecs = 0
+        disclosedNASISrecs = 0
+        TOTAL = 0
+
+        peIIDlist = list()
+
+        # Gather global metrics w/out using US degree blocks.
+        for coordLst in worldQuadrant:
+            coordStr = f"&Lat1={coordLst[0]}&Lat2={coordLst[1]}&Long1={coordLst[2]}&Long2={coordLst[3]}"
+            print(f"Running report on {coordStr}")
+            pedonCounts = runWebMetricReport(coordStr)
+
+            for id in pedonCounts:
+                peIIDlist.append(id)
+
+##            undisclosedLabRecs+=pedonCounts[0]
+##            disclosedLabRecs+=pedonCounts[1]
+##            undisclosedNASISrecs+=pedonCounts[2]
+##            disclosedNASISrecs+=pedonCounts[3]
+##
+##            TOTAL+=pedonCounts[4]
+##            if pedonCounts[5]:
+##                exit()
+
+##        # Create an Executor to manage all tasks.  Using the with statement creates a context
+##        # manager, which ensures any stray threads or processes get cleaned up properly when done.
+##        with ThreadPoolExecutor(max_workers=multiprocessing.cpu_count()) as executor:
+##
+##            # use a set comprehension to start all tasks.  This creates a future object
+##            future_to_url = {executor.submit(openURL, url): url for url in URLlist}
+##
+##            # yield future objects as they are done.
+##            for future in as_completed(future_to_url):
+##                #futureResults.append(future.result())
+##                organizeFutureInstanceIntoPedonDict(future.result())
+##                arcpy.SetProgressorPosition()
+
+        print(toc(Starttest))
+        #return [undisclosedLabRecs,disclosedLabRecs,undisclosedNASISrecs,disclosedNASISrecs,TOTAL]
+        return peIIDlist
+
+    except:
+        errorMsg()
+        return False
+
+
+## ================================================================================================================
+class PedonIndex:
+    """ Compact index of pedonIDs (peiids) used instead of a dictionary of pedonID strings.
+        The peiids are kept in an array of 64-bit integers and membership is a bitset indexed by
+        peiid so 'pedonID in pedonIndex' is constant time and costs 1 bit per possible peiid.
+        Pedons selected by AOI also carry their user pedon ID (interned), lab sample number and
+        coordinates (arrays of 64-bit floats); a lab pedon bitset is kept by position.  The
+        list of ALL pedons in NASIS does not carry any of these so only the peiids are kept.
+
+        The index behaves like the pedonDict it replaces; pedonIDs are strings, iteration is
+        sorted by peiid and pedonIndex[pedonID] / pedonIndex.get(pedonID) returns
+        (userPedonID, labSampleNum, longDD, latDD) or None for pedons without details."""
+
+    maxBitsetPeiid = 1 << 28     # larger peiids (not expected) are kept in a set instead of the bitset
+
+    def __init__(self,pedonIDs=None):
+
+        self.peiids = array.array('q')
+        self.memberBits = bytearray()
+        self.overflow = set()
+        self.bSorted = True
+
+        # Details of pedons selected by AOI; only created once a pedon with details is added
+        self.bDetails = False
+        self.userPedonIDs = None
+        self.labSampleNums = None    # {position:lab sample number}; most pedons are not lab pedons
+        self.labBits = None
+        self.longs = None
+        self.lats = None
+
+        if pedonIDs:
+            self.update(pedonIDs)
+
+    def _peiid(self,pedonID):
+        try:
+            return int(pedonID)
+        except (TypeError,ValueError):
+            return None
+
+    def _isMember(self,peiid):
+        if peiid is None or peiid < 0:
+            return False
+        if peiid >= self.maxBitsetPeiid:
+            return peiid in self.overflow
+
+        byte = peiid >> 3
+        return byte < len(self.memberBits) and bool(self.memberBits[byte] & (1 << (peiid & 7)))
+
+    def _setMember(self,peiid,bMember=True):
+        if peiid >= self.maxBitsetPeiid:
+            if bMember:
+                self.overflow.add(peiid)
+            else:
+                self.overflow.discard(peiid)
+            return
+
+        byte = peiid >> 3
+        if byte >= len(self.memberBits):
+            self.memberBits.extend(bytes(max(byte + 1 - len(self.memberBits),len(self.memberBits) // 2)))
+
+        if bMember:
+            self.memberBits[byte] |= 1 << (peiid & 7)
+        else:
+            self.memberBits[byte] &= ~(1 << (peiid & 7)) & 0xFF
+
+    def _createDetails(self):
+        # Pedons added before the first pedon with details have none
+        numOfPedons = len(self.peiids)
+        self.bDetails = True
+        self.userPedonIDs = [None] * numOfPedons
+        self.labSampleNums = dict()
+        self.labBits = bytearray((numOfPedons >> 3) + 1)
+        self.longs = array.array('d',[float('nan')]) * numOfPedons
+        self.lats = array.array('d',[float('nan')]) * numOfPedons
+
+    def _sort(self):
+        # Sorts the peiids (and the details by the same order) before sorted iteration or lookup
+        if self.bSorted:
+            return
+
+        if self.bDetails:
+            order = sorted(range(len(self.peiids)),key=self.peiids.__getitem__)
+            labPositions = {position:i for i,position in enumerate(order) if position in self.labSampleNums}
+
+            self.peiids = array.array('q',[self.peiids[i] for i in order])
+            self.userPedonIDs = [self.userPedonIDs[i] for i in order]
+            self.longs = array.array('d',[self.longs[i] for i in order])
+            self.lats = array.array('d',[self.lats[i] for i in order])
+            self.labSampleNums = {labPositions[position]:labSampleNum for position,labSampleNum in self.labSampleNums.items()}
+            self.labBits = bytearray(len(self.labBits))
+            for position in self.labSampleNums:
+                self.labBits[position >> 3] |= 1 << (position & 7)
+
+        else:
+            self.peiids = array.array('q',sorted(self.peiids))
+
+        self.bSorted = True
+
+    def _position(self,peiid):
+        self._sort()
+        position = bisect.bisect_left(self.peiids,peiid)
+        return position if position < len(self.peiids) and self.peiids[position] == peiid else None
+
+    def add(self,pedonID,userPedonID=None,labSampleNum=None,longDD=None,latDD=None):
+        # Adds a pedon; returns False if the pedonID is not a peiid or is already in the index
+        peiid = self._peiid(pedonID)
+        if peiid is None or peiid < 0 or self._isMember(peiid):
+            return False
+
+        if self.peiids and peiid < self.peiids[-1]:
+            self.bSorted = False
+
+        if not self.bDetails and not (userPedonID is None and longDD is None):
+            self._createDetails()
+
+        position = len(self.peiids)
+        self.peiids.append(peiid)
+        self._setMember(peiid)
+
+        if self.bDetails:
+            self.userPedonIDs.append(sys.intern(userPedonID) if userPedonID else None)
+            self.longs.append(float(longDD) if longDD not in (None,'') else float('nan'))
+            self.lats.append(float(latDD) if latDD not in (None,'') else float('nan'))
+
+            if (position >> 3) >= len(self.labBits):
+                self.labBits.extend(bytes(len(self.labBits) + 1))
+            if labSampleNum:
+                self.labSampleNums[position] = labSampleNum
+                self.labBits[position >> 3] |= 1 << (position & 7)
+
+        return True
+
+    def update(self,pedonIDs):
+        # Adds a sequence of pedonIDs without details
+        for pedonID in pedonIDs:
+            self.add(pedonID)
+
+    def keepOnly(self,pedonIDs):
+        # Removes every pedon that is not in pedonIDs; returns the number of pedons removed
+        keepPeiids = {self._peiid(pedonID) for pedonID in pedonIDs}
+        keep = [i for i,peiid in enumerate(self.peiids) if peiid in keepPeiids]
+        numOfRemoved = len(self.peiids) - len(keep)
+
+        if not numOfRemoved:
+            return 0
+
+        for peiid in self.peiids:
+            if peiid not in keepPeiids:
+                self._setMember(peiid,False)
+
+        if self.bDetails:
+            newPositions = {position:i for i,position in enumerate(keep)}
+            self.userPedonIDs = [self.userPedonIDs[i] for i in keep]
+            self.longs = array.array('d',[self.longs[i] for i in keep])
+            self.lats = array.array('d',[self.lats[i] for i in keep])
+            self.labSampleNums = {newPositions[position]:labSampleNum for position,labSampleNum in self.labSampleNums.items() if position in newPositions}
+            self.labBits = bytearray((len(keep) >> 3) + 1)
+            for position in self.labSampleNums:
+                self.labBits[position >> 3] |= 1 << (position & 7)
+
+        self.peiids = array.array('q',[self.peiids[i] for i in keep])
+        return numOfRemoved
+
+    def isLabPedon(self,pedonID):
+        if not self.bDetails:
+            return False
+
+        position = self._position(self._peiid(pedonID))
+        return position is not None and bool(self.labBits[position >> 3] & (1 << (position & 7)))
+
+    def numOfLabPedons(self):
+        return len(self.labSampleNums) if self.bDetails else 0
+
+    def get(self,pedonID,default=None):
+        peiid = self._peiid(pedonID)
+        if not self.bDetails or not self._isMember(peiid):
+            return default
+
+        position = self._position(peiid)
+        return (self.userPedonIDs[position],self.labSampleNums.get(position),self.longs[position],self.lats[position])
+
+    def __getitem__(self,pedonID):
+        if not pedonID in self:
+            raise KeyError(pedonID)
+        return self.get(pedonID)
+
+    def __contains__(self,pedonID):
+        return self._isMember(self._peiid(pedonID))
+
+    def __len__(self):
+        return len(self.peiids)
+
+    def __iter__(self):
+        self._sort()
+        return (str(peiid) for peiid in self.peiids)
+
+    def keys(self):
+        return iter(self)
+
+    def copy(self):
+        pedonIndex = PedonIndex()
+        pedonIndex.peiids = array.array('q',self.peiids)
+        pedonIndex.memberBits = bytearray(self.memberBits)
+        pedonIndex.overflow = set(self.overflow)
+        pedonIndex.bSorted = self.bSorted
+
+        if self.bDetails:
+            pedonIndex.bDetails = True
+            pedonIndex.userPedonIDs = list(self.userPedonIDs)
+            pedonIndex.labSampleNums = dict(self.labSampleNums)
+            pedonIndex.labBits = bytearray(self.labBits)
+            pedonIndex.longs = array.array('d',self.longs)
+            pedonIndex.lats = array.array('d',self.lats)
+
+        return pedonIndex
+
+## ================================================================================================================
+def getDictionaryOfAllPedonIDs():
+    # Description
+    # This function will send a URL request to the 'Web Pedon PEIID List All of NASIS' NASIS
+    # report to obtain a list of ALL pedons in NASIS.  Pedons include regular
+    # NASIS pedons and LAB pedons.  Each record in the report will contain the following values:
+    # START 1204126, 1204127, 1204128 STOP"""
+    # Returns a PedonIndex of the pedonIDs or False
+
+    try:
+        AddMsgAndPrint(".\nRequesting a list of ALL pedonIDs from NASIS")
+        arcpy.SetProgressorLabel("Requesting a list of ALL pedonIDs from NASIS")
+
+        #URL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_EXPORT_PEDON_BOX_COUNT' + coordinates
+        URL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_PEDON_PEIID_LIST_ALL_OF_NASIS'
+
+        # Open a network object using the URL with the search string already concatenated
+        startTime = tic()
+        #AddMsgAndPrint(".\tNetwork Request Time: " + toc(startTime))
+
+        """ --------------------------------------  Try connecting to NASIS to read the report ------------------------"""
+        try:
+            theReport = getNASISreportPayload(URL)
+        except:
+            try:
+                AddMsgAndPrint(".\t2nd attempt at requesting data")
+                theReport = getNASISreportPayload(URL)
+
+            except:
+                try:
+                    AddMsgAndPrint(".\t3rd attempt at requesting data")
+                    theReport = getNASISreportPayload(URL)
+
+                except requests.exceptions.HTTPError as e:
+                    AddMsgAndPrint('HTTP Error' + str(e),2)
+                    return False
+
+                except requests.exceptions.Timeout as e:
+                    AddMsgAndPrint(".\n\t" + URL)
+                    AddMsgAndPrint(".\tServer Timeout Error", 2)
+                    return False
+
+                except requests.exceptions.ConnectionError as e:
+                    AddMsgAndPrint(".\n\t" + URL)
+                    AddMsgAndPrint(".\tNASIS Reports Website connection failure", 2)
+                    return False
+
+        """ --------------------------------------  Read the NASIS report ------------------------------------"""
+        pedonDict = PedonIndex()
+
+        arcpy.SetProgressor("step", "Reading NASIS Report: 'WEB_PEDON_PEIID_LIST_ALL_OF_NASIS'", 0, len(theReport), 1)
+
+        # iterate through the records of the report
+        for theValue in theReport:
+
+            # All of the peodonIDs will be contained in 1 line
+            pedonDict.update(theValue.split(","))
+
+            arcpy.SetProgressorPosition()
+
+        #Resets the progressor back to its initial state
+        arcpy.ResetProgressor()
+
+        if len(pedonDict) == 0:
+            AddMsgAndPrint(".\tThere were no pedons returned from this report",2)
+            return False
+
+        else:
+            return pedonDict
+
+    except:
+        errorMsg()
+        return False
+
+
+## ================================================================================================================
+def streamAllPedonIDs(urlQueue,costModel,pedonsPerBatch=265):
+    # Description
+    # Pipelined version of getDictionaryOfAllPedonIDs.  The 'WEB_PEDON_PEIID_LIST_ALL_OF_NASIS' report
+    # is read as a stream and every pedonID is added to the global pedonDict (PedonIndex) as soon as it is received.
+    # Once a request's worth of pedons has been received (same limits as planPedonBatches) the URL of
+    # the request is added to the global URLlist and put in the urlQueue so the fetch engine can send
+    # it while the rest of the list is still arriving.  This function is run in its own thread so the
+    # pedon database can be created at the same time.  Requests are sent in the order the pedons are
+    # received; they are not sorted largest first.
+    # None is put in the urlQueue once the list is complete or has failed.
+
+    # Parameters
+    # urlQueue - queue.Queue that the pedon request URLs are put in
+    # costModel - PedonCostModel used to estimate the size of the requests
+    # pedonsPerBatch - estimated size of a request in field pedons
+
+    # Returns
+    # Nothing.  The global bPedonIDsComplete is set to True if the entire list was received.
+
+    global bPedonIDsComplete, numOfPedonStrings
+
+    baseURL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_AnalysisPC_MAIN_URL_EXPORT&pedonid_list='
+    targetBytes = pedonsPerBatch * costModel.fieldBytesPerPedon
+    batch = {'bytes':0,'pedonIDstr':""}
+
+    def sendBatch():
+        global numOfPedonStrings
+        URLlist.append(baseURL + batch['pedonIDstr'])
+        numOfPedonStrings = len(URLlist)
+        urlQueue.put(URLlist[-1])
+        batch['bytes'],batch['pedonIDstr'] = 0,""
+
+    def addPedon(value):
+        pedonID = value.decode('utf-8').strip()
+        if not pedonDict.add(pedonID):
+            return
+
+        pedonBytes = costModel.estimate(pedonID)
+
+        if batch['pedonIDstr'] and (batch['bytes'] + pedonBytes > targetBytes or len(batch['pedonIDstr']) > 1866):
+            sendBatch()
+
+        batch['pedonIDstr'] = batch['pedonIDstr'] + "," + pedonID if batch['pedonIDstr'] else pedonID
+        batch['bytes'] += pedonBytes
+
+    try:
+        AddMsgAndPrint(".\nRequesting a list of ALL pedonIDs from NASIS; pedon requests are sent as pedonIDs are received")
+        URL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_PEDON_PEIID_LIST_ALL_OF_NASIS'
+
+        for attempt in range(3):
+            try:
+                response = nasisSession.get(URL, timeout=nasisTimeout, stream=True)
+                response.raise_for_status()
+
+                buffer = b""
+                bValidRecord = False    # the line after START holds all of the pedonIDs separated by commas
+
+                with response:
+                    for chunk in response.iter_content(chunk_size=65536):
+                        buffer += chunk
+
+                        if not bValidRecord:
+                            start = buffer.find(b'<div id="ReportData">START')
+                            lineEnd = buffer.find(b'\n',start) if start > -1 else -1
+
+                            if lineEnd < 0:
+                                continue
+
+                            buffer = buffer[lineEnd + 1:]
+                            bValidRecord = True
+
+                        # every value but the last one in the buffer is a complete pedonID
+                        values = buffer.split(b',')
+                        buffer = values.pop()
+
+                        for value in values:
+                            addPedon(value)
+
+                        if buffer.find(b'STOP') > -1:
+                            addPedon(buffer[:buffer.find(b'STOP')])
+                            bPedonIDsComplete = True
+                            break
+
+                break
+
+            # Only try again if nothing has been received
+            except requests.exceptions.RequestException as e:
+                if pedonDict or attempt == 2:
+                    AddMsgAndPrint(".\tNASIS Reports Website connection failure while receiving pedonIDs: " + str(e),2)
+                    break
+
+                AddMsgAndPrint(f".\t{'2nd' if attempt == 0 else '3rd'} attempt at requesting data")
+
+        if batch['pedonIDstr']:
+            sendBatch()
+
+        if not bPedonIDsComplete:
+            AddMsgAndPrint(".\tThe list of ALL pedonIDs was not received completely",2)
+
+    except:
+        errorMsg()
+
+    finally:
+        urlQueue.put(None)
+
+## ================================================================================================================
+def getBoundingCoordinates(feature):
+    """ This function will return WGS coordinates in Lat-Long format that will be passed over to
+        the 'WEB_EXPORT_PEDON_BOX_COUNT' report.  The coordinates are generated by creating
+        a minimum bounding box around the input features.  The box is then converted to vertices
+        and the SW Ycoord, NE Ycoord, SW Xcoord and NE Ycoord are return in that order.
+        Geo-Processing Environments are set to WGS84 in order to return coords in Lat/Long."""
+
+    try:
+
+        """ Determine if features are a subset of selected polygons OR the entire dataset
+            is being used.  This was necessary b/c the output Coordinate System
+            environmental variable was not being honored if a selected set is being used.
+            Export selected set to a temporary feature class otherwise continue"""
+
+        arcpy.SetProgressorLabel("Calculating bounding coordinates of input features")
+
+        featurePath = arcpy.Describe(feature).catalogPath
+
+        totalPolys = int(arcpy.GetCount_management(featurePath).getOutput(0))
+        selectedPolys = int(arcpy.GetCount_management(feature).getOutput(0))
+        bExport = False
+
+        if selectedPolys < totalPolys:
+            envelopeFeature = arcpy.CreateScratchName("envelopeFeature",data_type="FeatureClass", workspace="in_memory")
+            arcpy.CopyFeatures_management(feature,envelopeFeature)
+            AddMsgAndPrint(".\nCalculating bounding coordinates for " + splitThousands(selectedPolys) + " feature(s)")
+            bExport = True
+
+        else:
+            envelopeFeature = feature
+            AddMsgAndPrint(".\nCalculating bounding coordinates of input features")
+
+        """ Set Projection and Geographic Transformation environments in order
+            to post process everything in WGS84.  This will force all coordinates
+            to be in Lat/Long"""
+
+        inputSR = arcpy.Describe(feature).spatialReference                # Get Spatial Reference of input features
+
+        if inputSR.name == 'Unknown':
+            AddMsgAndPrint(".\n\tInput layer needs a spatial reference defined to determine bounding envelope",2)
+            return False, False, False, False
+
+        # Get Datum name of input features
+        inputDatum = inputSR.GCS.datumName
+
+        if inputDatum == "D_North_American_1983":
+            arcpy.env.geographicTransformations = "WGS_1984_(ITRF00)_To_NAD_1983"
+        elif inputDatum == "D_North_American_1927":
+            arcpy.env.geographicTransformations = "WGS_1984_(ITRF00)_To_NAD_1927"
+        elif inputDatum == "D_NAD_1983_2011":
+            arcpy.env.geographicTransformations = "WGS_1984_(ITRF00)_To_NAD_1983_2011"
+        elif inputDatum == "D_WGS_1984":
+            arcpy.env.geographicTransformations = ""
+        else:
+            AddMsgAndPrint(".\n\tGeo Transformation of Datum could not be set",2)
+            AddMsgAndPrint(".\tTry Projecting input layer to WGS 1984 Coordinate System",2)
+            return False, False, False, False
+
+        # Factory code for WGS84 Coordinate System
+        arcpy.env.outputCoordinateSystem = arcpy.SpatialReference(4326)
+
+        """ ------------ Create Minimum Bounding Envelope of features ------------"""
+        envelope = arcpy.CreateScratchName("envelope",data_type="FeatureClass",workspace="in_memory")
+        envelopePts = arcpy.CreateScratchName("envelopePts",data_type="FeatureClass",workspace="in_memory")
+
+        # create minimum bounding geometry enclosing all features
+        arcpy.MinimumBoundingGeometry_management(envelopeFeature,envelope,"ENVELOPE","ALL","#","MBG_FIELDS")
+
+        if int(arcpy.GetCount_management(envelope).getOutput(0)) < 1:
+            AddMsgAndPrint(".\n\tFailed to create minimum bounding area. \n\tArea of interest is potentially too small",2)
+            return False
+
+        arcpy.FeatureVerticesToPoints_management(envelope, envelopePts, "ALL")
+
+        """ ------------ Get X and Y coordinates from envelope ------------"""
+        coordList = []
+        with arcpy.da.SearchCursor(envelopePts,['SHAPE@XY']) as cursor:
+            for row in cursor:
+                if abs(row[0][0]) > 0 and abs(row[0][1]) > 0:
+
+                    # Don't add duplicate coords; Last coord will also be the starting coord
+                    if not row[0] in coordList:
+                        coordList.append(row[0])
+
+        # Reset output Coord Sys Environment
+        arcpy.env.outputCoordinateSystem = ""
+
+        # Delete temp spatial files
+        for tempFile in [envelope,envelopePts]:
+            if arcpy.Exists(tempFile):
+                arcpy.Delete_management(tempFile)
+
+        if bExport:
+            arcpy.Delete_management(envelopeFeature)
+
+        if len(coordList) == 4:
+            AddMsgAndPrint(".\tBounding Box Coordinates:")
+            AddMsgAndPrint(".\t\tSouth Latitude: " + str(coordList[0][1]))
+            AddMsgAndPrint(".\t\tNorth Latitude: " + str(coordList[2][1]))
+            AddMsgAndPrint(".\t\tEast Longitude: " + str(coordList[0][0]))
+            AddMsgAndPrint(".\t\tWest Longitude: " + str(coordList[2][0]))
+            return coordList[0][1],coordList[2][1],coordList[0][0],coordList[2][0]
+
+        else:
+            AddMsgAndPrint(".\.tCould not get Latitude-Longitude coordinates from bounding area",2)
+            return False
+
+    except:
+
+        for tempFile in [envelope,envelopePts]:
+            if arcpy.Exists(tempFile):
+                arcpy.Delete_management(tempFile)
+
+        errorMsg()
+        return False
+
+## ================================================================================================================
+def getNASISpedonCountbyBox(coordinates):
+    """ This function will send the bounding coordinates to the 'Web Pedon Number SUM' NASIS report
+        and return the number of pedons within the bounding coordinates.  Pedons include regular
+        NASIS pedons and LAB pedons. Example of URL sent to the NASIS report would be:
+
+        https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_ANALYSIS_PC_PEDON_NUMBER_SUM&Lat1=43.6425577303&Lat2=43.9828939095&Long1=-89.5997555233&Long2=-89.167551308
+
+        # START 94 STOP
+
+        # peiid: siteID,Labnum,X,Y
+        # {'122647': ('84IA0130011', '85P0558', '-92.3241653', '42.3116684'), '883407': ('2014IA013003', None, '-92.1096600', '42.5332000')}
+        """
+
+    try:
+        AddMsgAndPrint(".\nDetermining if there are any pedons within the bounding coordinates")
+        arcpy.SetProgressorLabel("Determining if there are any pedons within the bounding coordinates")
+
+        # Open a network object using the URL with the search string already concatenated
+        URL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_ANALYSIS_PC_PEDON_NUMBER_SUM' + coordinates
+
+        """ --------------------------------------  Try connecting to NASIS to read the report ------------------------"""
+        try:
+            theReport = getNASISreportPayload(URL)
+        except:
+            try:
+                AddMsgAndPrint(".\t2nd attempt at requesting data")
+                theReport = getNASISreportPayload(URL)
+            except:
+                try:
+                    AddMsgAndPrint(".\t3rd attempt at requesting data")
+                    theReport = getNASISreportPayload(URL)
+
+                except requests.exceptions.HTTPError as e:
+                    AddMsgAndPrint('HTTP Error' + str(e),2)
+                    return False
+
+                except requests.exceptions.Timeout as e:
+                    AddMsgAndPrint(".\n\t" + URL)
+                    AddMsgAndPrint(".\tServer Timeout Error", 2)
+                    return False
+
+                except requests.exceptions.ConnectionError as e:
+                    AddMsgAndPrint(".\n\t" + URL)
+                    AddMsgAndPrint(".\tNASIS Reports Website connection failure (Socket Error)", 2)
+                    return False
+
+                except:
+                    errorMsg()
+                    return Falsethe
+
+        """ --------------------------------------  Read the NASIS report ---------------------------------"""
+
+        # iterate through the records of the report
+        for theValue in theReport:
+
+            try:
+                return int(theValue)
+            except:
+                continue
+
+    except:
+        errorMsg()
+        return False
+
+## ================================================================================================================
+def getNASISpedonIDsByBox(coordinates):
+    """ This function will send the bounding coordinates to the 'Web Export Pedon Box' NASIS report
+        and return a list of pedons within the bounding coordinates.  Pedons include regular
+        NASIS pedons and LAB pedons.  Each record in the report will contain the following values:
+
+            Row_Number,upedonid,peiid,pedlabsampnum,Longstddecimaldegrees,latstddecimaldegrees,Undisclosed Pedon
+            24|S1994MN161001|102861|94P0697|-93.5380936|44.0612717|'Y'
+
+        A PedonIndex will be returned; pedonIndex[pedonID] returns something similar:
+        pedonIndex['102857'] = ('S1954MN161113A', '40A1694', -93.6499481, 43.8647194)
+        pedonIndex['102858'] = ('S1954MN161113B', None, -93.6455002, 43.8899956)
+        theURL = r'    #getPedonIDURL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_EXPORT_PEDON_BOX_COUNT&Lat1=44.070820&Lat2=44.596950&Long1=-91.166274&Long2=-90.311911'
+
+        returns a pedonDictionary"""
+
+    try:
+        AddMsgAndPrint(".\nRequesting a list of pedonIDs from NASIS using the above bounding coordinates")
+        arcpy.SetProgressorLabel("Requesting a list of pedons from NASIS")
+
+        URL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_EXPORT_PEDON_BOX_COUNT' + coordinates
+
+        # Open a network object using the URL with the search string already concatenated
+        startTime = tic()
+        #AddMsgAndPrint(".\tNetwork Request Time: " + toc(startTime))
+
+        pedonDictionary = PedonIndex()
+
+        """ --------------------------------------  Try connecting to NASIS to read the report ------------------------"""
+        try:
+            theReport = getNASISreportPayload(URL)
+        except:
+            try:
+                AddMsgAndPrint(".\t2nd attempt at requesting data")
+                theReport = getNASISreportPayload(URL)
+
+            except:
+                try:
+                    AddMsgAndPrint(".\t3rd attempt at requesting data")
+                    theReport = getNASISreportPayload(URL)
+
+                except requests.exceptions.HTTPError as e:
+                    AddMsgAndPrint('HTTP Error' + str(e),2)
+                    return False
+
+                except requests.exceptions.Timeout as e:
+                    AddMsgAndPrint(".\n\t" + URL)
+                    AddMsgAndPrint(".\tServer Timeout Error", 2)
+                    return False
+
+                except requests.exceptions.ConnectionError as e:
+                    AddMsgAndPrint(".\n\t" + URL)
+                    AddMsgAndPrint(".\tNASIS Reports Website connection failure", 2)
+                    return False
+
+        """ --------------------------------------  Read the NASIS report ------------------------------------"""
+        totalPedonCnt = 0
+        labPedonCnt = 0
+        undisclosed = 0
+
+        arcpy.SetProgressor("step", "Reading NASIS Report: 'WEB_EXPORT_PEDON_BOX_COUNT'", 0, len(theReport), 1)
+
+        # iterate through the records of the report
+        for theValue in theReport:
+
+            # Found a valid project record i.e. -- SDJR - MLRA 103 - Kingston silty clay loam, 1 to 3 percent slopes|400036
+            theRec = theValue.split("|")
+
+            if len(theRec) != 7:
+                AddMsgAndPrint(".\tNASIS Report: Web Export Pedon Box is not returning the correct amount of values per record",2)
+                return False
+
+            # Undisclosed Record; Reject this record
+            if theRec[6] == "Y":
+                undisclosed+=1
+                totalPedonCnt += 1
+                continue
+
+            rowNumber = theRec[0]
+            userPedonID = theRec[1]
+            pedonID = theRec[2]
+            longDD = theRec[4]
+            latDD = theRec[5]
+
+            # Lab sample or not
+            if theRec[3] == 'Null' or theRec[3] == '':
+                labSampleNum = None
+            else:
+                labSampleNum = theRec[3]
+                labPedonCnt += 1
+
+            if pedonDictionary.add(pedonID,userPedonID,labSampleNum,longDD,latDD):
+                totalPedonCnt += 1
+
+            arcpy.SetProgressorPosition()
+
+        #Resets the progressor back to its initial state
+        arcpy.ResetProgressor()
+
+        if len(pedonDictionary) == 0:
+            AddMsgAndPrint(".\tThere were no pedons found in this area; Try using a larger extent",1)
+            return False
+
+        else:
+            #AddMsgAndPrint(".\tThere are a total of " + splitThousands(totalPedonCnt) + " pedons found in this area:")
+            AddMsgAndPrint(".\tThere are " + splitThousands(totalPedonCnt) + " within this layer:")
+            AddMsgAndPrint(".\t\tLAB Pedons: " + splitThousands(labPedonCnt))
+            AddMsgAndPrint(".\t\tUndisclosed: " + splitThousands(undisclosed))
+            AddMsgAndPrint(".\t\tNASIS Pedons: " + splitThousands((totalPedonCnt - labPedonCnt) - undisclosed))
+
+            return pedonDictionary
+
+    except:
+        errorMsg()
+        return False
+
+## ================================================================================================================
+def filterPedonsByFeature(feature):
+    # Description:
+    # This function will temporarily plot out the pedons in order to determine which pedons fall completely
+    # within the user's AOI.  Once determined, the extra pedons will be removed from the pedonDict so that
+    # extra pedons are not downloaded.
+
+    # Parameters
+    # feature -  input area of interest that will be used to intersect agains temporarily plotted NASIS points.
+    #            This will only be used as a reference.
+    # The pedonDict will be altered but not necessary to be passed in.
+
+    # Returns
+    # This function returns an integer that reflects the number of pedons that are completely within the feature
+    # AOI.  False will be returned if an error occurs within this function OR if there are NO pedons within the
+    # feature AOI.
+    # Although the function will update the pedonDict to reflect only the peodonIDs that are within the feature AOI.
+    # it is not returned since it is directly updated from main.
+
+    try:
+        AddMsgAndPrint(".\nSelecting pedons that intersect with " + arcpy.Describe(feature).Name + " Layer")
+        arcpy.SetProgressorLabel("Selecting pedons that intersect with " + arcpy.Describe(feature).Name + " Layer")
+
+        # Set everything to WGS84
+        arcpy.env.outputCoordinateSystem = arcpy.SpatialReference(4326)
+
+        # Make a copy of the user-input features - this is just in case there is a selected set
+        aoiFeature = arcpy.CreateScratchName("aoiFeature",data_type="FeatureClass", workspace="in_memory")
+        arcpy.CopyFeatures_management(feature,aoiFeature)
+
+        # Create a temp point feature class to digitize ALL of the pedons within the bounding box first
+        tempPoints = arcpy.CreateScratchName("tempPoints",data_type="FeatureClass", workspace="in_memory")
+
+        # Factory code for WGS84 Coordinate System
+        spatial_reference = arcpy.SpatialReference(4326)
+        arcpy.CreateFeatureclass_management("in_memory", os.path.basename(tempPoints), "POINT", "#", "DISABLED", "DISABLED", spatial_reference)
+
+        peiidFld = "peiid"
+        arcpy.AddField_management(tempPoints,peiidFld,"LONG")
+
+        # Initiate the insert cursor object using the peiid and XY values
+        cursor = arcpy.da.InsertCursor(tempPoints,[peiidFld,'SHAPE@XY'])
+
+        for pedon in pedonDict:
+            xValue = pedonDict[pedon][2]
+            yValue = pedonDict[pedon][3]
+            newRow = [pedon,(xValue,yValue)]
+            cursor.insertRow(newRow)
+        del cursor
+
+        arcpy.SetProgressorLabel("Selecting pedons that intersect with " + arcpy.Describe(feature).Name + " Layer")  # Some odd reason 'tempPointsPRJ' stays frozen in the progress bar.
+
+        # Select all of the pedons within the user's AOI
+        tempPointsLYR = arcpy.CreateScratchName("tempPointsLYR",data_type="FeatureClass", workspace="in_memory")
+        arcpy.MakeFeatureLayer_management(tempPoints,tempPointsLYR)
+
+        #AddMsgAndPrint(".\tThere are " + str(int(arcpy.GetCount_management("tempPoints_LYR").getOutput(0))) + " pedons in the layer",2)
+        arcpy.SelectLayerByLocation_management(tempPointsLYR,"INTERSECT",aoiFeature, "","NEW_SELECTION")
+        pedonsWithinAOI = int(arcpy.GetCount_management(tempPointsLYR).getOutput(0))
+
+        # There are pedons within the user's AOI
+        if pedonsWithinAOI > 0:
+            AddMsgAndPrint(".\tThere are " + splitThousands(pedonsWithinAOI) + " pedons within this layer")
+
+            # Make a copy of the user-input features - this is just in case there is a selected set
+            selectedPedons = arcpy.CreateScratchName("selectedPedons",data_type="FeatureClass", workspace="in_memory")
+            arcpy.CopyFeatures_management(tempPointsLYR,selectedPedons)
+
+            # Create a new list of pedonIDs from the selected set; pedonIDs are converted to strings in order
+            # to compare against the pedonDict()
+            selectedPedonsList = [str(row[0]) for row in arcpy.da.SearchCursor(selectedPedons, (peiidFld))]
+
+            # delete any pedon from the pedonDict that is not in the selected set.
+            pedonDict.keepOnly(selectedPedonsList)
+            labPedonCnt = pedonDict.numOfLabPedons()
+
+            AddMsgAndPrint(".\t\tLAB Pedons: " + splitThousands(labPedonCnt))
+            AddMsgAndPrint(".\t\tNASIS Pedons: " + splitThousands(pedonsWithinAOI - labPedonCnt))
+
+            for layer in (aoiFeature,tempPoints,tempPointsLYR,selectedPedons):
+                if arcpy.Exists(layer):
+                    arcpy.Delete_management(layer)
+
+            del selectedPedons,selectedPedonsList
+
+            # Return integer reflecting number of pedons within feature AOI
+            return pedonsWithinAOI
+
+        else:
+            AddMsgAndPrint(".\tThere are NO pedons that are completely within your AOI. EXITING! \n",2)
+            return False
+
+    except:
+        errorMsg()
+        return False
+
+## ================================================================================================================
+def getPedonTableSelection(tableProfile):
+    # Description
+    # Returns the pedon tables that will be extracted.  Most AOI users only need the morphology of
+    # the pedons; extracting fewer tables makes the NASIS reports faster to parse (the other table
+    # blocks are skipped by getReportPayload) and the pedon database smaller (createPedonDB).
+    # The pedon table is always extracted.
+
+    # Parameters
+    # tableProfile - name of a table profile ('morphology','lab'), a comma separated list of
+    #                table names or a list of table names.  '' or 'all' for every table.
+
+    # Returns
+    # a set of table names (without prefix) or None if every table is extracted
+
+    pedonTableProfiles = {'morphology':['pedon','phorizon','phtexture','phcolor'],
+                          'lab':['pedon','phorizon','ncsspedonlabdata','ncsslayerlabdata','phlabresults','phsample']}
+
+    if not tableProfile or str(tableProfile).lower() == 'all':
+        return None
+
+    if isinstance(tableProfile,str):
+        tableProfile = pedonTableProfiles.get(tableProfile.lower(),tableProfile.split(','))
+
+    return set([table.strip().lower() for table in tableProfile if table.strip()]) | {'pedon'}
+
+## ================================================================================================================
+def createPedonDB():
+    """This Function will create a new File Geodatabase using a pre-established XML workspace
+       schema.  All Tables will be empty and should correspond to that of the access database.
+       Relationships will also be pre-established.
+       If only some tables were selected (tableSelection) the tables that were not selected are
+       deleted from the new database along with their relationships.
+       Return false if XML workspace document is missing OR an existing FGDB with the user-defined
+       name already exists and cannot be deleted OR an unhandled error is encountered.
+       Return the path to the new Pedon File Geodatabase if everything executes correctly."""
+
+    try:
+        if sqliteFormat:
+            AddMsgAndPrint(".\nCreating New Pedon SQLite Database")
+            arcpy.SetProgressorLabel("Creating New Pedon SQLite Database")
+        else:
+            AddMsgAndPrint(".\nCreating New Pedon File Geodatabase")
+            arcpy.SetProgressorLabel("Creating New Pedon File Geodatabase")
+
+        # pedon xml template that contains empty pedon Tables and relationships
+        # schema and will be copied over to the output location
+        pedonXML = os.path.dirname(sys.argv[0]) + os.sep + "NASISpedons_XMLWorkspace.xml"
+
+        if sqliteFormat:
+            localPedonDB = os.path.dirname(sys.argv[0]) + os.sep + "NASISPedonsSQLiteTemplate.sqlite"
+            ext = ".sqlite"
+        else:
+            localPedonDB = os.path.dirname(sys.argv[0]) + os.sep + "NASISPedonsFGDBTemplate.gdb"
+            ext = ".gdb"
+
+        # Return false if pedon fGDB template is not found
+        if not arcpy.Exists(localPedonDB):
+            AddMsgAndPrint(".\t" + os.path.basename(localPedonDB) + " template was not found!",2)
+            return False
+
+        newPedonDB = os.path.join(outputFolder,DBname + ext)
+
+        if arcpy.Exists(newPedonDB):
+            try:
+                arcpy.Delete_management(newPedonDB)
+                AddMsgAndPrint(".\t" + os.path.basename(newPedonDB) + " already exists. Deleting and re-creating FGDB\n",1)
+            except:
+                AddMsgAndPrint(".\t" + os.path.basename(newPedonDB) + " already exists. Failed to delete\n",2)
+                return False
+
+        # copy template over to new location
+        AddMsgAndPrint(".\tCreating " + DBname + ext + " using NCSS Pedon Schema 7.4.1")
+        arcpy.Copy_management(localPedonDB,newPedonDB)
+
+        # Trim the tables that were not selected; deleting a table deletes its relationship classes
+        if tableSelection:
+            arcpy.env.workspace = newPedonDB
+            deletedTables = 0
+
+            for table in arcpy.ListTables("*"):
+                tableName = table[len(prefix):] if table.startswith(prefix) else table
+
+                if tableName.lower().startswith('metadata') or tableName.lower() in tableSelection:
+                    continue
+
+                arcpy.Delete_management(os.path.join(newPedonDB,table))
+                deletedTables += 1
+
+            AddMsgAndPrint(".\tOnly the " + ", ".join(sorted(tableSelection)) + " tables were kept; " + str(deletedTables) + " tables were removed")
+
+        """ ------------------------------ Code to use XML Workspace -------------------------------------------"""
+##        # Return false if xml file is not found
+##        if not arcpy.Exists(pedonXML):
+##            AddMsgAndPrint(".\t" + os.path.basename(pedonXML) + " Workspace document was not found!",2)
+##            return False
+##
+##        # Create empty temp File Geodatabae
+##        arcpy.CreateFileGDB_management(outputFolder,os.path.splitext(os.path.basename(newPedonFGDB))[0])
+##
+##        # set the pedon schema on the newly created temp Pedon FGDB
+##        AddMsgAndPrint(".\tImporting NCSS Pedon Schema 7.3 into " + DBname + ".gdb")
+##        arcpy.ImportXMLWorkspaceDocument_management(newPedonFGDB, pedonXML, "DATA", "DEFAULTS")
+
+        #arcpy.UncompressFileGeodatabaseData_management(newPedonFGDB)
+        AddMsgAndPrint(".\tSuccessfully created: " + os.path.basename(newPedonDB))
+
+        return newPedonDB
+
+    except:
+        AddMsgAndPrint("Unhandled exception (createDB)", 2)
+        errorMsg()
+        return False
+
+## ===============================================================================================================
+def createReferenceObjects(pedonDBloc):
+    # Description
+    # This function will create the following 2 unique dictionaries that will be used throughout the script:
+    # - pedonGDBtablesList: contains every table in the newly created pedonDB above as a key.
+    #                       Individual records of tables will be added to a PedonTableBuffer of the table.
+    #                       This dictionary will be populated using the results from the
+    #                       the WEB_AnalysisPC_MAIN_URL_EXPORT NASIS report
+    #                       i.e. {'area': [],'areatype': [],'basalareatreescounted': []}
+    # - tableInfoDict:      Dictionary containing physical name from MDSTATTABS table as the key.
+    #                       Each key has an associated list consisting of alias name, number of fields in the
+    #                       physical table, the names of the fields in the physical table and the value
+    #                       converters of the fields (getValueConverter) used by the PedonTableBuffer.
+    #
+    #                       i.e. {croptreedetails:['Crop Tree Details',48,['cropiidref','seqnum',...],[convertToInteger,...]]}
+    #                       The number of fields is used to double check that the values from
+    #                       the web report are correct.  This was added b/c there were text fields that were
+    #                       getting disconnected in the report and being read as 2 lines -- Jason couldn't
+    #                       address this issue in NASIS.
+    #                       The position index is needed b/c once the pedonGDBList begins to be populated a
+    #                       table cannot be looked up.
+
+    # Paramaters
+    # pedonDBloc - Catalog path of the pedon File Geodatabase that was create to store pedon data.
+    #                This FGDB must contain the Metadata Table which will be used to retrieve alias names
+    #                and physical table names
+
+    # Returns
+    # This function returns 2 dictionaries (Description above).  If anything goes wrong the function will
+    # return False,False and the script will eventually exit.
+
+    try:
+        arcpy.SetProgressorLabel("Gathering Metadata Table and Field Information")
+        AddMsgAndPrint(".\nGathering Metadata Table and Field Information")
+
+        # Open Metadata table containing information for other pedon tables
+        theMDTable = pedonDBloc + os.sep + prefix + "MetadataTable"
+
+        # Establishes a cursor for searching through field rows. A search cursor can be used to retrieve rows.
+        # This method will return an enumeration object that will, in turn, hand out row objects
+        if not arcpy.Exists(theMDTable):
+            AddMsgAndPrint(".\n\t" + theMDTable + " doesn't Exist",2)
+            return False,False
+
+        # Establish a list of tables to get field aliases for
+        arcpy.env.workspace = pedonDBloc
+        tableList = arcpy.ListTables("*")
+        tableList.append(prefix + "pedon")
+
+        #nameOfFields = ["TablePhysicalName","TableLabel"]
+        nameOfFields = ["tabphynm","tablab"]
+
+        # Initiate the tableInfoDict; the empty pedon tables are created from it
+        tableInfoDict = dict()
+
+        with arcpy.da.SearchCursor(theMDTable,nameOfFields) as cursor:
+
+            for row in cursor:
+
+                physicalName = prefix + row[0]  # Physical name of table
+                aliasName = row[1]              # Alias name of table
+                tblPath = f"{pedonDBloc}\\{physicalName}"
+
+                if physicalName.find(prefix + 'Metadata') > -1: continue
+
+                if physicalName in tableInfoDict: continue
+
+                # The metadata table has more tables than what is in the DB template.  Only
+                # Gather field information for those tables in the DB.
+                if physicalName in tableList:
+
+                    tableFields = [f for f in arcpy.ListFields(tblPath) if not f.name.lower() in ('objectid','oid','geometry','fid','shape')]
+                    uniqueFields = [f.name for f in tableFields]
+                    numOfValidFlds = len(uniqueFields)
+
+                    # Add 2 more fields to the pedon table for X,Y
+                    if physicalName == prefix + 'pedon':
+                        numOfValidFlds += 2
+
+                    # Siteaoverlap table has 9 fields instead of 6 b/c areaiidref is actually
+                    # a NASIS client placeholder for areatypename, areasymbol, areaname, areaiidref
+                    if physicalName == prefix + 'siteaoverlap':
+                        numOfValidFlds = 9
+
+                    # i.e. {phtexture:'Pedon Horizon Texture',phtexture}; will create a one-to-many dictionary
+                    # As long as the physical name doesn't exist in dict() add physical name
+                    # as Key and alias as Value.
+                    # Convert every value to the type of its field; extra values (X,Y) are floats
+                    fieldConverters = [getValueConverter(f.type,f.length if f.type == 'String' else 0) for f in tableFields]
+                    fieldConverters += [convertToFloat] * (numOfValidFlds - len(fieldConverters))
+
+                    if not physicalName in tableInfoDict:
+                        tableInfoDict[physicalName] = [aliasName,numOfValidFlds,uniqueFields,fieldConverters[:numOfValidFlds]]
+
+                    del numOfValidFlds
+
+        emptyPedonGDBtablesDict = createPedonTableBuffers(tableInfoDict)
+
+        arcpy.SetProgressorLabel('')
+        return emptyPedonGDBtablesDict,tableInfoDict
+
+    except:
+        AddMsgAndPrint("Unhandled exception (createReferenceObject)", 2)
+        errorMsg()
+        return False, False
+
+## ===============================================================================================================
+def convertToInteger(value):
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+def convertToFloat(value):
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+def truncateString(fieldLength,value):
+    return value[:fieldLength]
+
+def convertColumn(convert,values):
+    # Converts the report values of 1 column with the converter of its field (getValueConverter).
+    # Values have been stripped of white spaces.  Empty and NULL values become None.  int and
+    # float are applied directly to the whole column and the value by value converter is only
+    # used if a value cannot be converted.
+    if convert is str:
+        if 'NULL' in values:
+            return [value if value and value != 'NULL' else None for value in values]
+        return [value or None for value in values]
+
+    try:
+        if convert is convertToInteger:
+            return [int(value) if value and value != 'NULL' else None for value in values]
+        elif convert is convertToFloat:
+            return [float(value) if value and value != 'NULL' else None for value in values]
+    except ValueError:
+        pass
+
+    return [convert(value) if value and value != 'NULL' else None for value in values]
+
+def getValueConverter(fieldType,fieldLength=0):
+    # Description
+    # Returns the function that converts a report value (str) to the type of its field.  The
+    # fieldType can be an arcpy field type (Integer, SmallInteger, Double, Single, String, Date)
+    # or a data type of the NASIS MetadataTable (Integer, Float, String, Choice, Date/Time...).
+    # String values are truncated to the length of the field.  Values that cannot be converted
+    # are kept as strings and are converted by the database when they are inserted, as before.
+    # Module level functions are used so the converters can be pickled.
+
+    # Parameters
+    # fieldType - arcpy field type or MetadataTable data type
+    # fieldLength - length of a string field; 0 if the value is not truncated
+
+    # Returns
+    # a function that takes 1 value
+
+    fieldType = fieldType.lower()
+
+    if fieldType in ('integer','smallinteger','biginteger'):
+        return convertToInteger
+
+    elif fieldType in ('double','single','float'):
+        return convertToFloat
+
+    elif fieldLength:
+        return functools.partial(truncateString,fieldLength)
+
+    else:
+        return str
+
+## ===============================================================================================================
+class PedonTableBuffer:
+    """ Records of 1 pedon table kept in typed column buffers (1 list of values per field) instead of
+        a list of pipe-delimited strings.  organizeFutureInstanceIntoPedonDict appends the records
+        as they are read; when the buffer is read the new records are split at once and converted
+        column by column to the type of their field (int, float, str truncated to the field length
+        or None for empty and NULL values) so they are inserted without being split and converted
+        value by value.
+
+        A buffer behaves like the list of records it replaces: len(), extend() with another buffer,
+        buffer[n:] and del buffer[n:] to remove the records of a failed report.  Iterating returns
+        the records as tuples of values."""
+
+    def __init__(self,converters):
+
+        self.converters = converters
+        self.columns = [list() for converter in converters]
+        self.newRecords = list()    # pipe-delimited records (str) that have not been converted
+
+        # append(record) - adds 1 pipe-delimited record with exactly 1 value per field
+        self.append = self.newRecords.append
+
+    def convert(self):
+        # Converts the new records and adds their values to the column buffers.  All of the
+        # new records are joined and split at once; since every record has exactly 1 value
+        # per field the values of a column are every nth value of the split records.
+        if not self.newRecords:
+            return
+
+        numOfFields = len(self.columns)
+        records = '|'.join(self.newRecords).replace('"','')
+        values = records.split('|')
+
+        if ' |' in records or '| ' in records or '\t' in records:
+            values = [value.strip() for value in values]
+
+        for fieldNo,(column,convert) in enumerate(zip(self.columns,self.converters)):
+            column.extend(convertColumn(convert,values[fieldNo::numOfFields]))
+
+        self.newRecords.clear()
+
+    def newBuffer(self):
+        return PedonTableBuffer(self.converters)
+
+    def extend(self,otherBuffer):
+        # Records of the other buffer that have not been converted are only added to the
+        # new records; they are converted when the buffer is read.
+        if otherBuffer.columns and otherBuffer.columns[0]:
+            self.convert()
+            for column,otherColumn in zip(self.columns,otherBuffer.columns):
+                column.extend(otherColumn)
+
+        self.newRecords.extend(otherBuffer.newRecords)
+
+    def __len__(self):
+        return (len(self.columns[0]) if self.columns else 0) + len(self.newRecords)
+
+    def __iter__(self):
+        self.convert()
+        return zip(*self.columns)
+
+    def __getitem__(self,index):
+        self.convert()
+        if isinstance(index,slice):
+            buffer = self.newBuffer()
+            buffer.columns = [column[index] for column in self.columns]
+            return buffer
+
+        return tuple([column[index] for column in self.columns])
+
+    def __delitem__(self,index):
+        self.convert()
+        for column in self.columns:
+            del column[index]
+
+## ===============================================================================================================
+class PartialRecord:
+    """ A NASIS record that is broken over multiple report lines because a text field (petext,
+        sitetext...) contains line breaks.  The delimiters of every fragment are counted once as the
+        fragment is read and the fragments are joined once, with their original line breaks, when
+        the record has the number of values of its table.  Gluing the fragments and re-splitting the
+        growing record on every line was quadratic on long narratives."""
+
+    def __init__(self,fragment):
+        self.fragments = [fragment]
+        self.numOfValues = fragment.count('|') + 1
+
+    def add(self,fragment):
+        # Adds the next line of the record; the line continues the last value of the record.
+        # Returns the number of values of the record so far.
+        self.fragments.append(fragment)
+        self.numOfValues += fragment.count('|')
+        return self.numOfValues
+
+    def record(self):
+        return '\n'.join(self.fragments)
+
+## ===============================================================================================================
+def getReportColumnMap(table,header,columnMaps={}):
+    # Description
+    # Maps the columns of a table block of a NASIS report to the fields of the table.  The header
+    # line that follows '@begin <table>' lists the columns of the block.  Columns are matched to
+    # the field names of the tableFldDict regardless of case so columns that NASIS reorders still
+    # go to their field.  Columns that are not in the table are ignored and fields that are not in
+    # the report are left NULL.  The values that have no field name (X,Y of the pedon table, the
+    # extra siteaoverlap values) are taken in order from the columns that did not match a field;
+    # a table with extra values is rejected unless exactly that many columns did not match so a
+    # new NASIS column is never loaded as a coordinate.
+    # A header with the right number of columns but whose names mostly don't match the fields
+    # (labels, renamed fields) is read in order like before.  A block whose key fields (iid,
+    # iidref) cannot be found in the header is rejected; its records could not be related.
+    # Maps are cached by table and header; the differences are only reported once.
+
+    # Parameters
+    # table - name of the table (with prefix)
+    # header - header line of the table block
+    # columnMaps - cache of column maps; not passed
+
+    # Returns
+    # 2 items: the number of values a record of the block has and a list with the report column
+    # of every value of the table (None if the value is not in the report).  The list is None
+    # if the report columns are read in order and False if the block is rejected.
+
+    if (table,header) in columnMaps:
+        return columnMaps[(table,header)]
+
+    numOfFields = tableFldDict[table][1]
+    fieldNames = [field.lower() for field in tableFldDict[table][2]][:numOfFields]
+    columns = [column.strip().strip('"').lower() for column in header.split('|')]
+
+    columnIndex = dict()
+    for columnNo,column in enumerate(columns):
+        columnIndex.setdefault(column,columnNo)
+
+    numOfMatches = len([field for field in fieldNames if field in columnIndex])
+
+    # Report columns are the fields of the table in order
+    if len(columns) == numOfFields and columns[:len(fieldNames)] == fieldNames:
+        columnMap = None
+
+    # Names that mostly don't match the fields are not column names; keep the columns in order
+    elif len(columns) == numOfFields and numOfMatches < len(fieldNames) / 2:
+        AddMsgAndPrint(".\n\tThe column names of the " + table + " table in the NASIS report are not field names; columns are read in order",1)
+        columnMap = None
+
+    else:
+        columnMap = [columnIndex.get(field) for field in fieldNames]
+        unknownColumns = [columnNo for columnNo in range(len(columns)) if not columnNo in columnMap]
+        missingFields = [field for field,columnNo in zip(fieldNames,columnMap) if columnNo is None]
+
+        # The extra values can only be told apart from new columns if nothing else is left over
+        numOfExtraValues = numOfFields - len(fieldNames)
+        bExtraValuesFound = len(unknownColumns) == numOfExtraValues
+        if numOfExtraValues and bExtraValuesFound:
+            columnMap += unknownColumns
+            unknownColumns = list()
+
+        AddMsgAndPrint(".\n\tThe columns of the " + table + " table in the NASIS report do not line up with the pedon database",1)
+        if unknownColumns:
+            AddMsgAndPrint(".\t\tColumns that will be ignored: " + ", ".join([columns[columnNo] for columnNo in unknownColumns]),1)
+        if missingFields:
+            AddMsgAndPrint(".\t\tFields that are not in the report and will be NULL: " + ", ".join(missingFields),1)
+
+        # Records without their keys would be loaded as orphans
+        missingKeys = [field for field in missingFields if field.endswith('iid') or field.endswith('iidref')]
+        if missingKeys:
+            AddMsgAndPrint(".\t\tKey fields are missing from the report: " + ", ".join(missingKeys) + "; the " + table + " table will not be loaded from it",2)
+            columnMap = False
+
+        elif numOfExtraValues and not bExtraValuesFound:
+            AddMsgAndPrint(".\t\tThe " + str(numOfExtraValues) + " values of the " + table + " table without a field name (i.e. X,Y) could not be told apart from "
+                           + str(len(unknownColumns)) + " unrecognized columns; the " + table + " table will not be loaded from it",2)
+            columnMap = False
+
+    columnMaps[(table,header)] = (len(columns),columnMap)
+    return columnMaps[(table,header)]
+
+## ===============================================================================================================
+def mapReportRecord(record,columnMap):
+    # Returns the pipe-delimited record with its values in the order of the table's fields (getReportColumnMap)
+    values = record.split('|')
+    return '|'.join([values[columnNo] if columnNo is not None else '' for columnNo in columnMap])
+
+## ===============================================================================================================
+def createPedonTableBuffers(tableInfoDict):
+    # Returns a dictionary of empty PedonTableBuffers; 1 for every table of the tableInfoDict
+    return {table:PedonTableBuffer(info[3]) for table,info in tableInfoDict.items()}
+
+## ===============================================================================================================
+def parsePedonsIntoLists(pedonIDs=None):
+    """ This function will parse pedons into manageable chunks that will be sent to the 2nd URL report.
+        There is an inherent URL character limit of 2,083.  The report URL is 123 characters long which leaves 1,960 characters
+        available. I arbitrarily chose to have a max URL of 1,860 characters long to avoid problems.  Most pedonIDs are about
+        6 characters.  This would mean an average max request of 265 pedons at a time.
+
+        pedonIDs is an optional list of pedonIDs to parse; by default all pedons in the pedonDict are parsed.
+
+        This function returns a list of pedon lists"""
+        #1860 = 265
+
+    try:
+        arcpy.SetProgressorLabel("Determining the number of URL requests to send the server")
+
+        if pedonIDs is None:
+            pedonIDs = pedonDict
+
+        # Total Count
+        i = 1
+        listOfPedonStrings = list()  # List containing pedonIDstring lists; individual lists are comprised of about 265 pedons
+        pedonIDstr = ""              # concatenated string of pedonIDs
+
+        for pedonID in pedonIDs:
+
+            # End of pedon dictionary has been reached
+            if i == len(pedonIDs):
+                pedonIDstr = pedonIDstr + str(pedonID)
+                listOfPedonStrings.append(pedonIDstr)
+
+            # End of pedon list NOT reached
+            else:
+                # Max URL length reached - retrieve pedon data and start over
+                if len(pedonIDstr) > 1866:
+                    pedonIDstr = pedonIDstr + str(pedonID)
+                    listOfPedonStrings.append(pedonIDstr)
+
+                    ## reset the pedon ID string to empty
+                    pedonIDstr = ""
+                    i+=1
+
+                # concatenate pedonID to string and continue
+                else:
+                    pedonIDstr = pedonIDstr + str(pedonID) + ",";i+=1
+
+        numOfPedonStrings = len(listOfPedonStrings)  # Number of unique requests that will be sent
+        arcpy.SetProgressorLabel('')
+
+        if not numOfPedonStrings:
+            AddMsgAndPrint(".\n\t Something Happened here.....WTF!",2)
+            exit()
+
+        else:
+            return listOfPedonStrings,numOfPedonStrings
+
+    except:
+        AddMsgAndPrint("Unhandled exception (createFGDB)", 2)
+        errorMsg()
+        exit()
+
+## ===============================================================================================================
+class PedonCostModel:
+    """ Estimated size (bytes of the uncompressed WEB_AnalysisPC_MAIN_URL_EXPORT report) of a pedon.
+        A lab pedon with its lab layers, horizons and texts costs NASIS far more than a bare field
+        pedon.  A pedon is a lab pedon if it has a lab sample number in the pedonDict (only known
+        when pedons are selected by AOI; pedons requested from the all-pedon list are treated as
+        field pedons).
+
+        The bytes per pedon of each class are fit from the size of every report received in a run
+        and are kept in the fetch statistics store (PedonFetchStatsStore) between runs.  A pedon that
+        was downloaded before is estimated from its own number of rows in the last run instead.
+        The rows of previous runs are kept in 2 arrays sorted by peiid (like the PedonIndex) so
+        the history of every pedon in NASIS costs 12 bytes per pedon.
+        Until there is a history the default estimates below are used."""
+
+    def __init__(self,statsStore=None,defaultFieldBytes=8000,defaultLabBytes=40000):
+
+        self.fieldBytesPerPedon = float(defaultFieldBytes)
+        self.labBytesPerPedon = float(defaultLabBytes)
+        self.numOfRuns = 0
+        self.rowPeiids = array.array('q')   # sorted peiids of the pedons fetched in previous runs
+        self.pedonRows = array.array('i')   # number of rows of each in the last run it was fetched in
+        self.bytesPerRow = 0
+
+        if statsStore:
+            history = statsStore.bytesPerPedon()
+
+            if history:
+                self.fieldBytesPerPedon,self.labBytesPerPedon,self.numOfRuns = history
+                self.rowPeiids,self.pedonRows = statsStore.pedonRowCounts()
+                self.bytesPerRow = statsStore.bytesPerRow()
+
+    def isLabPedon(self,pedonID):
+        return pedonDict.isLabPedon(pedonID)
+
+    def previousRows(self,pedonID):
+        # Returns the number of rows of a pedon in the last run it was fetched in or None
+        try:
+            peiid = int(pedonID)
+        except (TypeError,ValueError):
+            return None
+
+        position = bisect.bisect_left(self.rowPeiids,peiid)
+        return self.pedonRows[position] if position < len(self.rowPeiids) and self.rowPeiids[position] == peiid else None
+
+    def estimate(self,pedonID):
+        if self.bytesPerRow:
+            numOfRows = self.previousRows(pedonID)
+            if numOfRows is not None:
+                return numOfRows * self.bytesPerRow
+
+        return self.labBytesPerPedon if self.isLabPedon(pedonID) else self.fieldBytesPerPedon
+
+    def update(self,transferStats):
+        # Description
+        # Fits the bytes per field pedon and bytes per lab pedon from the reports of this run
+        # (least squares of report size = fieldBytes * field pedons + labBytes * lab pedons) and
+        # blends them with the statistics of previous runs.  The statistics are saved with the
+        # run by PedonFetchStatsStore.recordRun.
+
+        # Parameters
+        # transferStats - reportTransferStats; the uncompressed size and pedonID string of every report
+
+        try:
+            samples = list()    # (# of field pedons, # of lab pedons, uncompressed bytes)
+            for stat in transferStats:
+                pedonIDs = stat[4].split(',')
+                numOfLab = len([pedonID for pedonID in pedonIDs if self.isLabPedon(pedonID)])
+                samples.append((len(pedonIDs) - numOfLab,numOfLab,stat[2]))
+
+            if not samples:
+                return
+
+            # Normal equations of the 2 parameter least squares fit
+            sFF = sum([f * f for f,l,b in samples])
+            sLL = sum([l * l for f,l,b in samples])
+            sFL = sum([f * l for f,l,b in samples])
+            sFB = sum([f * b for f,l,b in samples])
+            sLB = sum([l * b for f,l,b in samples])
+            determinant = sFF * sLL - sFL * sFL
+
+            fieldBytes,labBytes = self.fieldBytesPerPedon,self.labBytesPerPedon
+
+            if sLL and abs(determinant) > 1e-9:
+                fieldBytes = (sFB * sLL - sLB * sFL) / determinant
+                labBytes = (sLB * sFF - sFB * sFL) / determinant
+
+            # No lab pedons in this run (or only lab pedons); fit one class only
+            elif sFF:
+                fieldBytes = sFB / sFF
+            elif sLL:
+                labBytes = sLB / sLL
+
+            # A poor fit can go negative; keep the estimates sensible
+            fieldBytes = max(fieldBytes,100.0)
+            labBytes = max(labBytes,fieldBytes)
+
+            # blend with the history of previous runs
+            if self.numOfRuns:
+                fieldBytes = (self.fieldBytesPerPedon + fieldBytes) / 2
+                labBytes = (self.labBytesPerPedon + labBytes) / 2
+
+            self.fieldBytesPerPedon,self.labBytesPerPedon = fieldBytes,labBytes
+            self.numOfRuns += 1
+
+        except:
+            errorMsg()
+
+## ===============================================================================================================
+class PedonRowCounts:
+    """ Number of rows of every pedon received in this run kept in 2 arrays (peiids and their # of rows)
+        instead of a dictionary.  The counts of every request (countRowsPerPedon) are added as they
+        come in; the arrays are not sorted.  Recorded by PedonFetchStatsStore.recordRun."""
+
+    def __init__(self):
+
+        self.peiids = array.array('q')
+        self.pedonRows = array.array('i')
+
+    def add(self,rowCounts):
+        # Adds the (peiids,# of rows) arrays of 1 request
+        peiids,pedonRows = rowCounts
+        self.peiids.extend(peiids)
+        self.pedonRows.extend(pedonRows)
+
+    def numOfRows(self):
+        return sum(self.pedonRows)
+
+    def items(self):
+        return zip(self.peiids,self.pedonRows)
+
+    def __len__(self):
+        return len(self.peiids)
+
+## ===============================================================================================================
+class PedonFetchStatsStore:
+    """ SQLite database of the statistics of every pedon fetch.  Every run records:
+            fetchRun        - 1 record per run; # of pedons, requests, bytes, rows, fetch time and the
+                              bytes per field/lab pedon of the PedonCostModel
+            fetchBatch      - 1 record per pedon request; latency, compressed/uncompressed bytes
+            fetchBatchTable - # of records of every table in every pedon request
+            pedonRows       - # of rows of every pedon (pedon table and the tables below it)
+
+        The query functions are used by the batch planner (PedonCostModel) and the progress
+        estimate of the fetch engine.  Per-pedon row counts are only kept for the last keepRuns runs."""
+
+    def __init__(self,statsDB,keepRuns=5):
+
+        self.statsDB = statsDB
+        self.keepRuns = keepRuns
+
+        try:
+            conn = sqlite3.connect(statsDB)
+            with conn:
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS fetchRun (runID INTEGER PRIMARY KEY AUTOINCREMENT, runDate TEXT, dbName TEXT,
+                        numOfPedons INTEGER, numOfRequests INTEGER, fetchSeconds REAL, compressedBytes INTEGER,
+                        uncompressedBytes INTEGER, numOfRows INTEGER, fieldBytesPerPedon REAL, labBytesPerPedon REAL, numOfFits INTEGER);
+                    CREATE TABLE IF NOT EXISTS fetchBatch (runID INTEGER, batchID INTEGER, numOfPedons INTEGER, numOfLabPedons INTEGER,
+                        seconds REAL, compressedBytes INTEGER, uncompressedBytes INTEGER, encoding TEXT, bOrganized INTEGER, pedonIDs TEXT,
+                        PRIMARY KEY (runID,batchID));
+                    CREATE TABLE IF NOT EXISTS fetchBatchTable (runID INTEGER, batchID INTEGER, tableName TEXT, numOfRecords INTEGER,
+                        PRIMARY KEY (runID,batchID,tableName));
+                    CREATE TABLE IF NOT EXISTS pedonRows (runID INTEGER, peiid INTEGER, numOfRows INTEGER,
+                        PRIMARY KEY (runID,peiid));
+                    CREATE INDEX IF NOT EXISTS pedonRows_peiid ON pedonRows (peiid,runID);""")
+            conn.close()
+
+        except:
+            errorMsg()
+
+    def query(self,sql,parameters=()):
+        conn = sqlite3.connect(self.statsDB)
+        try:
+            return conn.execute(sql,parameters).fetchall()
+        finally:
+            conn.close()
+
+    def recordRun(self,numOfPedons,fetchSeconds,transferStats,batchStats,pedonRowCounts,costModel):
+        # Description
+        # Records the statistics of a pedon fetch.
+
+        # Parameters
+        # numOfPedons - number of pedons requested
+        # fetchSeconds - seconds it took to fetch every request
+        # transferStats - reportTransferStats; (# of pedons, compressed bytes, uncompressed bytes, encoding, pedonIDs)
+        # batchStats - fetchBatchStats; (pedonIDs, seconds, organized, {table:# of records}) of every request
+        # pedonRowCounts - PedonRowCounts of this run
+        # costModel - PedonCostModel that was updated with the transferStats of this run
+
+        # Returns
+        # the runID or False if the statistics could not be recorded
+
+        try:
+            transferDict = {stat[4]:stat for stat in transferStats}
+            numOfRows = pedonRowCounts.numOfRows()
+
+            conn = sqlite3.connect(self.statsDB)
+            with conn:
+                cursor = conn.execute("INSERT INTO fetchRun (runDate,dbName,numOfPedons,numOfRequests,fetchSeconds,compressedBytes,uncompressedBytes,"
+                                      "numOfRows,fieldBytesPerPedon,labBytesPerPedon,numOfFits) VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+                                      (time.strftime("%Y-%m-%d %H:%M:%S"),str(DBname),numOfPedons,len(batchStats),fetchSeconds,
+                                       sum([stat[1] for stat in transferStats]),sum([stat[2] for stat in transferStats]),numOfRows,
+                                       costModel.fieldBytesPerPedon,costModel.labBytesPerPedon,costModel.numOfRuns))
+                runID = cursor.lastrowid
+
+                batchRecords = list()
+                tableRecords = list()
+
+                for batchID,(pedonString,seconds,bOrganized,tableCounts) in enumerate(batchStats):
+                    pedonIDs = pedonString.split(',')
+                    stat = transferDict.get(pedonString,(None,None,None,None))
+                    numOfLab = len([pedonID for pedonID in pedonIDs if costModel.isLabPedon(pedonID)])
+
+                    batchRecords.append((runID,batchID,len(pedonIDs),numOfLab,seconds,stat[1],stat[2],stat[3],int(bool(bOrganized)),pedonString))
+                    tableRecords.extend([(runID,batchID,table,numOfRecords) for table,numOfRecords in tableCounts.items() if numOfRecords])
+
+                conn.executemany("INSERT INTO fetchBatch VALUES (?,?,?,?,?,?,?,?,?,?)",batchRecords)
+                conn.executemany("INSERT INTO fetchBatchTable VALUES (?,?,?,?)",tableRecords)
+                conn.executemany("INSERT OR REPLACE INTO pedonRows VALUES (?,?,?)",((runID,peiid,rows) for peiid,rows in pedonRowCounts.items()))
+
+                # Only keep the pedon row counts of the last runs
+                conn.execute("DELETE FROM pedonRows WHERE runID <= ?",(runID - self.keepRuns,))
+
+            conn.close()
+            return runID
+
+        except:
+            errorMsg()
+            return False
+
+    def bytesPerPedon(self):
+        # Returns (bytes per field pedon, bytes per lab pedon, # of runs fit) of the last run or None
+        rows = self.query("SELECT fieldBytesPerPedon,labBytesPerPedon,numOfFits FROM fetchRun WHERE numOfFits > 0 ORDER BY runID DESC LIMIT 1")
+        return rows[0] if rows else None
+
+    def bytesPerRow(self):
+        # Returns the uncompressed report bytes per row of the last run or 0
+        rows = self.query("SELECT CAST(uncompressedBytes AS REAL) / numOfRows FROM fetchRun WHERE numOfRows > 0 ORDER BY runID DESC LIMIT 1")
+        return rows[0][0] if rows else 0
+
+    def pedonRowCounts(self):
+        # Returns 2 arrays sorted by peiid: the peiids and their # of rows from the last run each
+        # pedon was fetched in.  The rows are read straight into the arrays; no dictionary is built.
+        peiids = array.array('q')
+        pedonRows = array.array('i')
+
+        conn = sqlite3.connect(self.statsDB)
+        try:
+            for peiid,numOfRows,runID in conn.execute("SELECT peiid,numOfRows,max(runID) FROM pedonRows GROUP BY peiid ORDER BY peiid"):
+                peiids.append(peiid)
+                pedonRows.append(numOfRows)
+        finally:
+            conn.close()
+
+        return peiids,pedonRows
+
+    def secondsPerPedon(self,numOfRuns=5):
+        # Returns the average fetch seconds per pedon of the last runs or None
+        rows = self.query("SELECT sum(fetchSeconds),sum(numOfPedons) FROM (SELECT fetchSeconds,numOfPedons FROM fetchRun ORDER BY runID DESC LIMIT ?)",(numOfRuns,))
+        return rows[0][0] / rows[0][1] if rows and rows[0][1] else None
+
+    def batchLatency(self,runID,percentile=95):
+        # Returns the latency (seconds) percentile of the requests of a run or None
+        latencies = [row[0] for row in self.query("SELECT seconds FROM fetchBatch WHERE runID = ? ORDER BY seconds",(runID,))]
+        return latencies[int(percentile / 100.0 * (len(latencies) - 1))] if latencies else None
+
+    def explodedPedons(self,runID,factor=3,minRows=100):
+        # Returns [(peiid,previous # of rows,# of rows)] of pedons in a run whose number of rows is
+        # at least minRows and more than factor times the rows of the last run they were fetched in.
+        return self.query("""SELECT cur.peiid,prev.numOfRows,cur.numOfRows FROM pedonRows cur
+                             JOIN (SELECT peiid,numOfRows,max(runID) FROM pedonRows WHERE runID < ? GROUP BY peiid) prev ON prev.peiid = cur.peiid
+                             WHERE cur.runID = ? AND cur.numOfRows >= ? AND cur.numOfRows > prev.numOfRows * ?
+                             ORDER BY cur.numOfRows DESC""",(runID,runID,minRows,factor))
+
+## ===============================================================================================================
+def getPedonTableTree(tableInfoDict):
+    """ This function will determine the tables that belong to a pedon (the pedon table and the tables
+        below it: phorizon, phcolor...) and how their records lead back to the pedon.  Every table has
+        its own ID field (phiid) and a reference to the ID of its parent table (peiidref).
+
+        Returns a list of (table, position of the ID field, position of the parent reference field,
+        parent table) with parent tables before their children.  The pedon table has no parent."""
+
+    try:
+        idFields = dict()   # {'phiid':'phorizon'}
+        for table,info in tableInfoDict.items():
+            for field in info[2]:
+                if field.lower().endswith('iid'):
+                    idFields[field.lower()] = table
+
+        pedonTable = prefix + 'pedon'
+        fieldNames = [field.lower() for field in tableInfoDict[pedonTable][2]]
+        tableTree = [(pedonTable,fieldNames.index('peiid'),None,None)]
+        treeTables = {pedonTable}
+
+        # add the children of the tables already in the tree until no more are found
+        bFound = True
+        while bFound:
+            bFound = False
+
+            for table,info in tableInfoDict.items():
+                if table in treeTables:
+                    continue
+
+                fieldNames = [field.lower() for field in info[2]]
+                idField = [field for field in fieldNames if field.endswith('iid')]
+                parentRefs = [field for field in fieldNames if field.endswith('iidref') and idFields.get(field[:-3]) in treeTables and idFields.get(field[:-3]) != table]
+
+                if idField and parentRefs:
+                    tableTree.append((table,fieldNames.index(idField[0]),fieldNames.index(parentRefs[0]),idFields[parentRefs[0][:-3]]))
+                    treeTables.add(table)
+                    bFound = True
+
+        return tableTree
+
+    except:
+        errorMsg()
+        return list()
+
+## ===============================================================================================================
+def countRowsPerPedon(tablesDict,tableTree):
+    """ This function will count the rows of every pedon in a dictionary of PedonTableBuffers
+        (records of 1 pedon request) using the table tree from getPedonTableTree.  It does not change
+        the buffers so it is run in a thread while the fetch engine handles the next report.
+
+        Returns 2 arrays: the peiids and their # of rows (see PedonRowCounts)"""
+
+    try:
+        pedonRows = dict()
+        rowOwners = dict()      # {table:{ID:peiid}}
+
+        for table,idIndex,parentIndex,parentTable in tableTree:
+            owners = rowOwners[table] = dict()
+
+            if not table in tablesDict or not len(tablesDict[table]):
+                continue
+
+            # streamed reports are counted before their records have been converted
+            records = tablesDict[table]
+            records.convert()
+
+            recIDs = records.columns[idIndex]
+            parentIDs = records.columns[parentIndex] if parentTable else recIDs
+
+            for recID,parentID in zip(recIDs,parentIDs):
+
+                if parentTable is None:
+                    peiid = str(recID)
+                else:
+                    peiid = rowOwners[parentTable].get(parentID)
+                    if peiid is None:
+                        continue
+
+                owners[recID] = peiid
+                pedonRows[peiid] = pedonRows.get(peiid,0) + 1
+
+        return array.array('q',[int(peiid) for peiid in pedonRows]),array.array('i',pedonRows.values())
+
+    except:
+        errorMsg()
+        return array.array('q'),array.array('i')
+
+## ===============================================================================================================
+def planPedonBatches(costModel,pedonIDs=None,pedonsPerBatch=265):
+    """ This function will pack pedons into requests by their estimated report size instead of by URL length
+        alone (parsePedonsIntoLists).  Every request is filled up to the estimated size of pedonsPerBatch field
+        pedons so a request of field pedons is the same size as before but a request of lab pedons holds
+        fewer of them.  The URL limit of parsePedonsIntoLists (1,866 characters of pedonIDs) still applies.
+
+        Heavier pedons are packed first and the requests are returned largest first (largest-processing-time-first)
+        so the heaviest requests are not left for the end of the run.
+
+        pedonIDs is an optional list of pedonIDs to plan; by default all pedons in the pedonDict are planned.
+
+        This function returns a list of pedon strings and the number of pedon strings"""
+
+    try:
+        arcpy.SetProgressorLabel("Planning pedon requests")
+
+        if pedonIDs is None:
+            pedonIDs = pedonDict
+
+        targetBytes = pedonsPerBatch * costModel.fieldBytesPerPedon
+        orderedPedons = sorted(pedonIDs,key=costModel.estimate,reverse=True)
+
+        batches = list()    # (estimated bytes, pedonID string)
+        batchBytes = 0
+        pedonIDstr = ""
+
+        for pedonID in orderedPedons:
+            pedonBytes = costModel.estimate(pedonID)
+
+            # Request is full; either by estimated size or by URL length
+            if pedonIDstr and (batchBytes + pedonBytes > targetBytes or len(pedonIDstr) > 1866):
+                batches.append((batchBytes,pedonIDstr))
+                batchBytes = 0
+                pedonIDstr = ""
+
+            pedonIDstr = pedonIDstr + "," + str(pedonID) if pedonIDstr else str(pedonID)
+            batchBytes += pedonBytes
+
+        if pedonIDstr:
+            batches.append((batchBytes,pedonIDstr))
+
+        # Largest requests first
+        batches.sort(key=lambda batch: batch[0],reverse=True)
+
+        numOfLabPedons = len([pedonID for pedonID in orderedPedons if costModel.isLabPedon(pedonID)])
+        AddMsgAndPrint(f".\nPlanned {splitThousands(len(batches))} requests for {splitThousands(len(orderedPedons))} pedons ({splitThousands(numOfLabPedons)} lab pedons); "
+                       f"estimated {splitThousands(round(sum([batch[0] for batch in batches]) / 1048576.0,1))} MB")
+        arcpy.SetProgressorLabel('')
+
+        if not batches:
+            AddMsgAndPrint(".\n\tThere are no pedons to request",2)
+            exit()
+
+        return [batch[1] for batch in batches],len(batches)
+
+    except:
+        AddMsgAndPrint("Unhandled exception (planPedonBatches)", 2)
+        errorMsg()
+        exit()
+
+## ================================================================================================================
+class NASISreportFailure:
+    """ Result of organizeFutureInstanceIntoPedonDict for a report that was received but has nothing
+        to add.  It is False like the result it replaces so callers that only check for success are
+        unchanged.  The reason tells the fetch engine how to handle the request:
+            'ERROR' - NASIS ended the report with an ERROR line (i.e. 1 malformed pedon); split the request
+            'EMPTY' - the report has its tables but no records (i.e. the pedons were deleted since
+                      their IDs were listed); the pedons are missing, not bad
+            'PAGE'  - the response has no report tables at all (i.e. an HTML error or maintenance page)
+        The message is the ERROR line of the report."""
+
+    def __init__(self,reason,message=None):
+        self.reason = reason
+        self.message = message
+
+    def __bool__(self):
+        return False
+
+## ================================================================================================================
+def organizeFutureInstanceIntoPedonDict(futureObject,tablesDict=None):
+    # Description:
+    # This function will take in a "future" object representing the execution of the
+    # ThreadPoolExecutor callable.  In this case, the future object represents
+    # the content of pedon Horizon information for a list of pedon IDs.  The content
+    # will be organized it into a dictionary (pedonDBDict) whose schema follows
+    # NASIS 7.4.1 pedon schema.
+
+    # Parameters
+    # future object - Encapsulates the asynchronous execution of a callable.
+    # Future instances are created by Executor.submit().  The raw report (bytes) or any
+    # iterable of report lines (bytes) can be passed, including the line iterator of a
+    # streamed response.  Only the payload of the report is read (getReportPayload).
+    # tablesDict - dictionary of PedonTableBuffers that records are added to.  By default
+    # records are added to the pedonDBtablesDict.
+
+    # Returns
+    # True if the data was organized correctly
+    # NASISreportFailure('ERROR') if NASIS reported an error, NASISreportFailure('EMPTY') if the
+    # report has no records or NASISreportFailure('PAGE') if the response is not a report (all False)
+    # False if the object could not be organized or there was an error.
+
+    # To view a sample output report go to:
+    # https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_AnalysisPC_MAIN_URL_EXPORT&pedonid_list=14542
+
+    try:
+        theReport = futureObject
+
+        # There was an obvious error in opening the URL in the openURL function
+        if theReport is None:
+            return None
+
+        if tablesDict is None:
+            tablesDict = pedonDBtablesDict
+
+        theReport = getReportPayload(theReport,tableSelection)
+
+        invalidTable = 0    # represents tables that don't correspond with the GDB
+        invalidRecord = 0   # represents records that were not added
+        validRecord = 0
+
+        bHeader = False         # indicator that record represents fields
+        bTableFound = False     # at least 1 table block was found; the report is a NASIS report
+        currentTable = ""       # The table found in the report
+        numOfFields = ""        # The number of values a record of the table block should contain
+        columnMap = None        # report columns of the table's fields when they don't line up (getReportColumnMap)
+        partialRecord = None    # PartialRecord of a record that is not complete; append next record
+
+        """ ------------------- Begin Adding data from URL into a dictionary of lists ---------------"""
+        for theValue in theReport:
+
+            # represents the start of valid table; Typically Line #19
+            if theValue.find('@begin') > -1:
+                theTable = prefix + theValue[theValue.find('@') + 7:]  ## Isolate the table
+                bTableFound = True
+
+                # Check if the table name exists in the list of dictionaries
+                # if so, set the currentTable variable and bHeader
+                if theTable in pedonDBtablesDict:
+                    currentTable = theTable
+                    numOfFields = tableFldDict[theTable][1]
+                    columnMap = None
+                    bHeader = True  ## Next line will be the header
+
+                # the table was not selected (getPedonTableSelection)
+                elif tableSelection and not theTable[len(prefix):].lower() in tableSelection:
+                    currentTable = ""
+
+                else:
+                    AddMsgAndPrint(".\t" + theTable + " Does not exist in the FGDB schema!  Figure this out Jason Nemecek!",2)
+                    invalidTable += 1
+
+            # end of the previous table has been reached; reset currentTable
+            elif theValue.find('@end') > -1:
+
+                # the last record of the table was never completed
+                if partialRecord:
+                    AddMsgAndPrint(".\n\tIncomplete NASIS record found in " + currentTable + " table:",2)
+                    AddMsgAndPrint(".\t\tRecord should have " + str(numOfFields) + " values but " + str(partialRecord.numOfValues) + " were found",2)
+                    AddMsgAndPrint(".\t\tRecord: " + partialRecord.record(),2)
+                    invalidRecord += 1
+                    partialRecord = None
+
+                currentTable = ""
+                bHeader = False
+
+            # represents header line; map the columns of the report to the fields of the table
+            elif bHeader:
+                numOfFields,columnMap = getReportColumnMap(currentTable,theValue)
+                bHeader = False
+
+                if columnMap is False:
+                    AddMsgAndPrint(".\t\tThe " + currentTable + " table of the NASIS report could not be mapped to its fields; the report was not organized",2)
+                    return False
+
+            # this is a valid record that should be collected
+            elif not bHeader and currentTable:
+
+                # Add the record to the PedonTableBuffer of its table.  The record is not
+                # split here; the values are counted and the records of the report are
+                # split and converted at once when the buffer is read (PedonTableBuffer.convert)
+                numOfValues = theValue.count('|') + 1
+
+                # this should represent the 2nd half of a valid value
+                if partialRecord:
+                    numOfValues = partialRecord.add(theValue)  # append this record to the previous record
+
+                    # This value completed the previous value
+                    if numOfValues == numOfFields:
+                        tablesDict[currentTable].append(mapReportRecord(partialRecord.record(),columnMap) if columnMap else partialRecord.record())
+                        validRecord += 1
+                        partialRecord = None
+
+                    # appending this value still falls short of number of possible fields
+                    # add another record; this would be the 3rd record appended and may
+                    # exceed number of values.
+                    elif numOfValues < numOfFields:
+                        arcpy.SetProgressorPosition()
+                        continue
+
+                    # appending this value exceeded the number of possible fields
+                    else:
+                        AddMsgAndPrint(".\n\tIncorrectly formatted Record Found in " + currentTable + " table:",2)
+                        AddMsgAndPrint(".\t\tRecord should have " + str(numOfFields) + " values but " + str(numOfValues) + " were found",2)
+                        AddMsgAndPrint(".\t\tRecord: " + partialRecord.record(),2)
+                        AddMsgAndPrint(".\t\tCheck for incorrect usage of '|' in invidual attributes in NASIS",2)
+                        invalidRecord += 1
+                        partialRecord = None
+
+                # number of values do not equal the number of fields in the corresponding tables
+                elif numOfValues != numOfFields:
+
+                    # number of values exceed the number of fields; Big Error
+                    if numOfValues > numOfFields:
+                        AddMsgAndPrint(".\n\tIncorrectly formatted NASIS record found in " + currentTable + " table:",2)
+                        AddMsgAndPrint(".\t\tRecord should have " + str(numOfFields) + " values but " + str(numOfValues) + " were found",2)
+                        AddMsgAndPrint(".\t\tRecord: " + theValue,2)
+                        AddMsgAndPrint(".\t\tCheck for incorrect usage of '|' in invidual attributes in NASIS",2)
+                        invalidRecord += 1
+
+                    # number of values falls short of the number of correct fields
+                    else:
+                        partialRecord = PartialRecord(theValue)
+
+                # Record perfectly lines up with table schema
+                else:
+                    tablesDict[currentTable].append(mapReportRecord(theValue,columnMap) if columnMap else theValue)
+                    validRecord += 1
+
+            elif theValue.find("ERROR") > -1:
+                AddMsgAndPrint(".\n\t\t" + theValue[theValue.find("ERROR"):],2)
+                return NASISreportFailure('ERROR',theValue[theValue.find("ERROR"):].strip())
+
+            else:
+                continue
+                #invalidRecord += 1
+
+        if not validRecord:
+
+            # NASIS sent its tables without records; the pedons no longer exist
+            if bTableFound and not invalidRecord:
+                AddMsgAndPrint(".\t\tNASIS returned no records for the pedons of this request",1)
+                return NASISreportFailure('EMPTY')
+
+            AddMsgAndPrint(".\t\tThere were no valid records captured from NASIS request",2)
+
+            # NASIS sent a page instead of the report i.e. an error page
+            if not bTableFound:
+                return NASISreportFailure('PAGE')
+
+            return False
+
+        # Report any invalid tables found in report; This should take care of itself as Jason perfects the report.
+        if invalidTable and invalidRecord:
+            AddMsgAndPrint(".\t\tThere were " + splitThousands(invalidTable) + " invalid table(s) included in the report with " + splitThousands(invalidRecord) + " invalid record(s)",1)
+
+        # Report any invalid records found in report; There are 24 html lines reserved for headers and footers
+        if invalidRecord > 0:
+            AddMsgAndPrint(".\t\tThere were " + splitThousands(invalidRecord) + " invalid record(s) not captured",1)
+
+        return True
+
+    # Connection dropped while a streamed report was being read; let openURL handle it
+    except requests.exceptions.RequestException:
+        raise
+
+    except:
+        errorMsg()
+        return False
+
+## ================================================================================================================
+def initReportParser(tableInfoDict,tablePrefix,selectedTables=None):
+    # Description
+    # Initializer of the parser processes of fetchPedonReports (ProcessPoolExecutor).  A parser
+    # process does not run the main body of this script so the global variables used by
+    # organizeFutureInstanceIntoPedonDict are set here.  Messages of a parser process are
+    # collected instead of printed and are sent back with the parsed report (parsePedonReport).
+
+    # Parameters
+    # tableInfoDict - tableFldDict of the main process
+    # tablePrefix - prefix of the table names; "main." for SQLite
+    # selectedTables - tableSelection of the main process
+
+    global tableFldDict,pedonDBtablesDict,prefix,tableSelection,parserMessages,AddMsgAndPrint
+
+    tableFldDict = tableInfoDict
+    prefix = tablePrefix
+    tableSelection = selectedTables
+    pedonDBtablesDict = createPedonTableBuffers(tableInfoDict)
+    parserMessages = list()
+    AddMsgAndPrint = lambda msg,severity=0: parserMessages.append((msg,severity))
+
+## ================================================================================================================
+def parsePedonReport(theReport):
+    # Description
+    # Runs in a parser process.  Organizes 1 raw pedon report into new PedonTableBuffers and
+    # converts their records.  Only the column buffers of the tables that received records are
+    # sent back; the ProcessPoolExecutor pickles them which is a fraction of the raw report.
+
+    # Parameters
+    # theReport - raw WEB_AnalysisPC_MAIN_URL_EXPORT report (bytes)
+
+    # Returns
+    # 3 items: True if the report was organized ((reason,message) of a NASISreportFailure or False
+    # otherwise), {table:column buffers} and the list of (message,severity) of the parser.
+
+    del parserMessages[:]
+
+    batchTablesDict = {table:records.newBuffer() for table,records in pedonDBtablesDict.items()}
+    organized = organizeFutureInstanceIntoPedonDict(theReport,batchTablesDict)
+    tableColumns = dict()
+
+    if organized:
+        for table,records in batchTablesDict.items():
+            if len(records):
+                records.convert()
+                tableColumns[table] = records.columns
+
+    # a NASISreportFailure is sent back by its reason and message
+    if isinstance(organized,NASISreportFailure):
+        return (organized.reason,organized.message),tableColumns,list(parserMessages)
+
+    return bool(organized),tableColumns,list(parserMessages)
+
+## ================================================================================================================
+def importPedonData(tableInfoDict,verbose=False):
+    """ This function will purge the contents from the pedonDBtablesDict dictionary which contains all of the pedon
+        data into the pedon FGDB.  Depending on the number of pedons in the user's AOI, this function will be
+        used multiple times.  The pedonDBtablesDict dictionary could possilbly allocate all of the computer's
+        memory so a fail-safe was built in to make sure a memory exception error wasn't encountered.  This
+        function is invoked when approximately 40,000 pedons have been retrieved from the server and stored in \
+        memory."""
+
+    try:
+        if verbose: AddMsgAndPrint(".\nImporting Pedon Data into Database")
+        arcpy.SetProgressorLabel("Importing Pedon Data into Database")
+
+        # use the tableInfoDict so that tables are imported in alphabetical order
+        tblKeys = tableInfoDict.keys()
+        maxCharTable = max([len(table) for table in tblKeys]) + 1
+        maxCharAlias = max([len(value[1][0]) for value in tableInfoDict.items()])
+
+        headerName = f".\t{'Table Physical Name' : <30}{'Table Alias Name' : <55}{'# of Records' : <20}"
+        if verbose: AddMsgAndPrint(headerName)
+        if verbose: AddMsgAndPrint(".\t" + len(headerName) * "=")
+
+        tblKeys = dict(sorted(tableFldDict.items(), key=lambda item: item[0]))
+
+        # SQLite tables are bulk loaded with sqlite3 instead of InsertCursors (NASISpedons_SQLite_Loader).
+        # The pedon points need the ST_Geometry library; if it cannot be loaded the pedon table is
+        # not bulk loaded and uses an InsertCursor below like every table that was not bulk loaded.
+        rowsLoaded = dict()
+        if sqliteFormat and bBulkLoadSQLite:
+            tableColumns = dict()
+            for table in tblKeys:
+                if len(pedonDBtablesDict[table]) and table.find(prefix + 'Metadata') < 0:
+                    pedonDBtablesDict[table].convert()
+                    tableColumns[table] = pedonDBtablesDict[table].columns
+
+            rowsLoaded = sqliteLoader.bulkLoadSQLite(pedonDB,tableColumns,stGeometryLibrary,arcpy.GetInstallInfo()['InstallDir'],prefix,
+                                                     lambda table,numOfRecords: arcpy.SetProgressorLabel(f"Loading Pedon Data into {table} table: {splitThousands(numOfRecords)} Records"),
+                                                     AddMsgAndPrint)
+
+            if rowsLoaded is False:
+                return False
+
+        """ ---------------------------------------------------"""
+        arcpy.SetProgressor("step","Importing Pedon Data into FGDB table: ",0,len(tblKeys),1)
+        for table in tblKeys:
+
+            # Table was bulk loaded
+            if table in rowsLoaded:
+                if verbose:AddMsgAndPrint(f".\t{table : <30}{tableInfoDict[table][0]: <55}{'Records Added: ' + splitThousands(rowsLoaded[table]) : <20}")
+                continue
+
+            possibleNumOfRecords = len(pedonDBtablesDict[table])
+
+            arcpy.SetProgressorLabel(f"Importing Pedon Data into {table} table: {splitThousands(possibleNumOfRecords)} Records")
+            arcpy.SetProgressorPosition()
+
+            # Skip any Metadata files
+            if table.find(prefix + 'Metadata') > -1: continue
+
+            # Capture the alias name of the table
+            aliasName = tableInfoDict[table][0]
+
+            # Strictly for standardizing reporting
+            firstTab = (maxCharTable - len(table)) * " "
+
+            # check if list contains records to be added
+            if possibleNumOfRecords:
+
+                numOfRowsAdded = 0
+                GDBtable = pedonDB + os.sep + table # FGDB Pyhsical table path
+
+                """ -------------------------------- Collect field information -----------------------"""
+                # Put all the field names in a list
+                fieldList = arcpy.Describe(GDBtable).fields
+                nameOfFields = []
+
+                for field in fieldList:
+
+                    # Skip Object ID field Shape field (only for site)
+                    if not field.type.lower() in ("oid","geometry"):
+                        nameOfFields.append(field.name)
+
+                # Add a new field at the end called 'labsampleIndicator' to indicate whether
+                # record is a LAB pedon. Addd XY token to list
+                if table == prefix + 'pedon':
+
+                    # Pedon feature class will have X,Y geometry added; Add XY token to list
+                    nameOfFields.append('SHAPE@XY')
+
+                """ -------------------------------- Insert Rows ------------------------------------------
+                    Iterate through every record from a specific table in the pedonDBtablesDict dictary
+                    and add it to the appropriate FGDB table.  The values were already converted to
+                    the type of their field (truncated strings, None for empty strings) when the
+                    report was organized (PedonTableBuffer)."""
+
+                # Initiate the insert cursor object using all of the fields
+                cursor = arcpy.da.InsertCursor(GDBtable,nameOfFields)
+                recNum = 0
+
+                for rec in pedonDBtablesDict[table]:
+
+                    newRow = list(rec)  # list containing the values that will populate a new row
+
+                    # Add XY coordinates to the pedon point feature class.
+                    if table == prefix + 'pedon':
+                        xValue = newRow[-1]  # Long
+                        yValue = newRow[-2]  # Lat
+
+                        if not isinstance(xValue,float) or not isinstance(yValue,float):
+                            xValue = 0.00
+                            yValue = 90.0
+
+                        # remove the X,Y coords from the newRow list b/c X,Y
+                        # fields don't exist in the pedon Table
+                        newRow = newRow[:-2]
+
+                        newRow.append((xValue,yValue))
+                        del xValue,yValue
+
+                    try:
+                        cursor.insertRow(newRow)
+                        numOfRowsAdded += 1;recNum += 1
+
+                    except arcpy.ExecuteError:
+                        AddMsgAndPrint(".\n\tError in :" + table + " table: " + str(rec),2)
+                        AddMsgAndPrint(".\n\t" + arcpy.GetMessages(2),2)
+                        break
+                    except:
+                        AddMsgAndPrint(".\n\tError in: " + table + " table")
+                        AddMsgAndPrint(".\tNumber of Fields in GDB: " + str(len(nameOfFields)))
+                        AddMsgAndPrint(".\tNumber of fields in report: " + str(len(rec)))
+                        errorMsg()
+                        break
+
+                    del newRow
+
+                # Report the # of records added to the table
+##                if bAliasName:
+                if verbose:AddMsgAndPrint(f".\t{table : <30}{aliasName: <55}{'Records Added: ' + splitThousands(numOfRowsAdded) : <20}")
+
+                del numOfRowsAdded,GDBtable,fieldList,nameOfFields,cursor
+
+            # Table had no records; still print it out
+            else:
+                if verbose:
+                    AddMsgAndPrint(f".\t{table : <30}{aliasName: <55}{'Records Added: 0' : <20}")
+
+
+        #Resets the progressor back to its initial state
+        arcpy.ResetProgressor()
+
+        return True
+
+    except arcpy.ExecuteError:
+        AddMsgAndPrint(arcpy.GetMessages(2),2)
+        return False
+
+    except:
+        errorMsg()
+        return False
+
+## ================================================================================================================
+def dropTableIndexes(pedonDBloc,tableInfoDict):
+    # Description
+    # The pedon template has 2 or more attribute indexes on every table (i.e. I0pefmpiid and
+    # G0peiidref on pefmp) that would otherwise be updated for every record that is inserted.
+    # This function removes the attribute indexes of the pedon tables of a SQLite database before
+    # the pedon data is imported and returns their definitions so they can be built once all of
+    # the records are in (rebuildTableIndexes).  The index DDL is captured from sqlite_master;
+    # ObjectID and spatial indexes are not touched.  FGDB indexes are left in place; removing and
+    # adding them with geoprocessing tools costs more than it saves for most requests.
+
+    # Parameters
+    # pedonDBloc - path to the pedon SQLite database
+    # tableInfoDict - tableFldDict; only the indexes of these tables are removed
+
+    # Returns
+    # a list of index definitions (index name, table, CREATE INDEX statement) or False if the
+    # indexes could not be removed.
+
+    try:
+        arcpy.SetProgressorLabel("Removing table indexes before the pedon data is imported")
+        droppedIndexes = list()
+        tables = set([table[len(prefix):] if table.startswith(prefix) else table for table in tableInfoDict])
+
+        conn = sqlite3.connect(pedonDBloc,isolation_level=None)
+        try:
+            for indexName,table,indexSQL in conn.execute("SELECT name,tbl_name,sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL").fetchall():
+                if table in tables:
+                    droppedIndexes.append((indexName,table,indexSQL))
+
+            conn.execute("BEGIN")
+            for indexName,table,indexSQL in droppedIndexes:
+                conn.execute(f"DROP INDEX [{indexName}]")
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+        AddMsgAndPrint(".\tRemoved " + splitThousands(len(droppedIndexes)) + " table indexes; they will be rebuilt once the pedon data is imported")
+        arcpy.SetProgressorLabel("")
+        return droppedIndexes
+
+    except:
+        errorMsg()
+        return False
+
+## ================================================================================================================
+def rebuildTableIndexes(pedonDBloc,droppedIndexes):
+    # Description
+    # Builds the indexes that were removed by dropTableIndexes once all of the pedon data has been
+    # imported.  Building an index over the loaded table is a single sort instead of an update
+    # for every record.  A SQLite database only allows 1 writer so its indexes are built one after
+    # the other in a single transaction with the bulk load PRAGMA profile and SQLite helper threads
+    # (PRAGMA threads) sorting every index in parallel.  It is also run when the import fails so
+    # the database is never left without its indexes.
+
+    # Parameters
+    # pedonDBloc - path to the pedon SQLite database
+    # droppedIndexes - index definitions returned by dropTableIndexes
+
+    # Returns
+    # True if every index was rebuilt, False otherwise
+
+    try:
+        arcpy.SetProgressor("step","Rebuilding table indexes",0,len(droppedIndexes),1)
+        startTime = tic()
+        failedIndexes = 0
+
+        conn = sqlite3.connect(pedonDBloc,isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode = OFF")
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.execute("PRAGMA cache_size = -524288")   # 512 MB
+            conn.execute("PRAGMA temp_store = MEMORY")
+            conn.execute(f"PRAGMA threads = {min(8,multiprocessing.cpu_count())}")
+            conn.execute("BEGIN")
+
+            for indexName,table,indexSQL in droppedIndexes:
+                arcpy.SetProgressorLabel(f"Rebuilding index {indexName} of the {table} table")
+                try:
+                    conn.execute(indexSQL)
+                except sqlite3.Error as e:
+                    AddMsgAndPrint(".\tFailed to rebuild index " + indexName + " of the " + table + " table: " + str(e),2)
+                    failedIndexes += 1
+                arcpy.SetProgressorPosition()
+
+            conn.execute("COMMIT")
+
+        finally:
+            if conn.in_transaction:
+                conn.execute("COMMIT")
+            conn.execute("PRAGMA synchronous = FULL")
+            conn.execute("PRAGMA journal_mode = DELETE")
+            conn.close()
+
+        arcpy.ResetProgressor()
+        AddMsgAndPrint(".\tRebuilt " + splitThousands(len(droppedIndexes) - failedIndexes) + " table indexes in " + toc(startTime))
+        return not failedIndexes
+
+    except:
+        errorMsg()
+        return False
+
+## ================================================================================================================
+def getObjectSize(obj, handlers={}, verbose=False):
+    """ Returns the approximate memory footprint an object and all of its contents.
+
+    Automatically finds the contents of the following builtin containers and
+    their subclasses:  tuple, list, deque, dict, set and frozenset.
+    To search other containers, add handlers to iterate over their contents:
+
+        handlers = {SomeContainerClass: iter,
+                    OtherContainerClass: OtherContainerClass.get_elements}
+    """
+
+    try:
+        # lamda function to iterate through a dictionary
+        dict_handler = lambda d: chain.from_iterable(d.items())
+
+    #     Use the following lines if you want to determine the size for ANY object
+    ##    all_handlers = {tuple: iter,
+    ##                    list: iter,
+    ##                    deque: iter,
+    ##                    dict: dict_handler,
+    ##                    set: iter,
+    ##                    frozenset: iter,
+    ##                   }
+
+        # Limit the focus to just dictionaries since that is the only thing I will pass
+        all_handlers = {dict: dict_handler}
+
+        all_handlers.update(handlers)     # user handlers take precedence
+        seen = set()                      # unique list of Object's memory ID
+        default_size = getsizeof(0)       # estimate sizeof object without __sizeof__; a dict will always be 140 bytes
+
+        def sizeof(obj):
+
+            if id(obj) in seen:       # do not double count the same object's memory ID
+                return 0
+
+            seen.add(id(obj))
+            s = getsizeof(obj, default_size)
+
+            if verbose:
+                print(s, type(obj), repr(obj))
+
+            # iterate through all itemized objects (tuple,list) 'all_handlers' including their content
+            for typ, handler in all_handlers.items():
+
+                # check if the object is associated with the type at hand.  i.e. if the current
+                # type is dict then check if the object 'o' is a dict. ({'a': 1, 'c': 3, 'b': 2, 'e': 'a string of chars', 'd': [4, 5, 6, 7]})
+                # if True, go thru and add the bytes for each eleement
+                if isinstance(obj, typ):
+                    s += sum(map(sizeof, handler(obj)))   # Iterates through this function
+                    break
+
+            return s
+
+        byteSize = sizeof(obj)
+
+        if byteSize < 1024:
+            return splitThousands(byteSize) + " bytes"
+        elif byteSize > 1023 and byteSize < 1048576:
+            return splitThousands(round((byteSize / 1024.0),1)) + " KB"
+        elif byteSize > 1048575 and byteSize < 1073741824:
+            return splitThousands(round((byteSize / (1024*1024.0)),1)) + " MB"
+        elif byteSize > 1073741823:
+            return splitThousands(round(byteSize / (1024*1024*1024.0),1)) + " GB"
+
+    except:
+        errorMsg()
+        pass
+
+## ===================================================================================
+def createNASISsession(poolSize=16):
+    # Description
+    # This function will create a single HTTP session that is shared by every NASIS report
+    # request in this script.  Before, every request went through urllib.request.urlopen which
+    # opened (and TLS negotiated) a brand new connection to the NASIS Reports website.  The
+    # session keeps a bounded pool of keep-alive connections that are reused by all threads.
+    # The urllib3 connection pool behind the session is thread-safe; the session is only ever
+    # used for GET requests so no cookies or headers are modified once it is created.
+
+    # Parameters
+    # poolSize - maximum number of keep-alive connections kept open to the NASIS Reports website.
+    #            Threads requesting a connection when all of them are in use will wait (pool_block)
+    #            instead of opening additional connections.
+
+    # Returns
+    # a requests.Session object
+
+    try:
+        session = requests.Session()
+        session.headers['Accept-Encoding'] = 'gzip, deflate'   # reports are repetitive text; compress them in transit
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=poolSize, pool_block=True)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+def getNASISreport(URL):
+    # Description
+    # This function will request a NASIS report using the shared NASIS session and return
+    # the lines of the report.  It is a drop-in replacement for urllib.request.urlopen(URL).readlines()
+
+    # Parameters
+    # URL - the NASIS report URL including all of its parameters
+
+    # Returns
+    # A list of lines (bytes) from the report.  requests exceptions are raised and are
+    # expected to be handled by the calling function.
+
+    response = nasisSession.get(URL, timeout=nasisTimeout)
+    response.raise_for_status()
+    return response.content.splitlines()
+
+## ===================================================================================
+def getNASISreportPayload(URL):
+    # Description
+    # Same as getNASISreport but only the report data (payload) is returned; the html envelope
+    # of the report is never decoded.  See getReportPayload.
+
+    # Parameters
+    # URL - the NASIS report URL including all of its parameters
+
+    # Returns
+    # A list of payload lines (str).  requests exceptions are raised and are expected to be
+    # handled by the calling function.
+
+    response = nasisSession.get(URL, timeout=nasisTimeout)
+    response.raise_for_status()
+    return getReportPayload(response.content)
+
+## ===================================================================================
+def getReportPayload(theReport,tableSelection=None):
+    # Description
+    # Every NASIS report is wrapped in an html envelope (including a large __VIEWSTATE) and
+    # the report data is written after '<div id="ReportData">' up to the last 'STOP' line or
+    # the closing </div>.  Instead of decoding and stripping every line of the report to look for
+    # the start of the data, the ReportData marker and the STOP terminator are located with a
+    # byte level search of the raw report and only the payload in between is decoded.  The
+    # 'START' and 'STOP' markers are not part of the payload.
+    # A streamed report (iterator of lines) cannot be searched as a whole; its envelope lines
+    # are skipped at byte level and the payload lines are decoded as they are received.
+    # A report without the ReportData marker (i.e. an error page) is returned as a whole so
+    # the error can still be reported.
+    # If a tableSelection is passed, the '@begin <table>' ... '@end' blocks of the other tables
+    # are skipped at byte level so they are never decoded or organized.
+
+    # Parameters
+    # theReport - the raw report (bytes), a list of report lines (bytes) or an iterator of
+    #             report lines i.e. the iter_lines of a streamed response
+    # tableSelection - set of table names (getPedonTableSelection); None to keep every table
+
+    # Returns
+    # A list (iterator for streamed reports) of payload lines (str) with white spaces removed
+
+    marker = b'<div id="ReportData">'
+
+    def isSkippedTable(beginLine):
+        # the table of an '@begin <table>' line is not selected
+        return not beginLine[beginLine.find(b'@begin') + 6:].strip().decode('utf-8').lower() in tableSelection
+
+    def payloadLines(reportLines):
+        bPayload = False
+        bSkipTable = False
+
+        for line in reportLines:
+            if bSkipTable:
+                bSkipTable = line.find(b'@end') < 0
+                continue
+
+            if tableSelection and bPayload and line.find(b'@begin') > -1 and isSkippedTable(line):
+                bSkipTable = True
+                continue
+
+            if not bPayload:
+                start = line.find(marker)
+                if start < 0:
+                    continue
+
+                bPayload = True
+                line = line[start + len(marker):].strip()
+                if line.startswith(b'START'):
+                    line = line[5:].strip()
+                if line.endswith(b'STOP'):
+                    if line[:-4].strip():
+                        yield line[:-4].decode('utf-8').strip()
+                    break
+                if not line:
+                    continue
+
+            theValue = line.decode('utf-8').strip()
+            if theValue == 'STOP' or theValue.startswith('</div>'):
+                break
+
+            yield theValue
+
+        # read the rest of the envelope so the response is received completely
+        for line in reportLines:
+            pass
+
+    if isinstance(theReport,list):
+        theReport = b"\n".join(theReport)
+
+    if not isinstance(theReport,(bytes,bytearray)):
+        return payloadLines(theReport)
+
+    start = theReport.find(marker)
+    if start < 0:
+        return [line.decode('utf-8').strip() for line in theReport.splitlines()]
+
+    # The STOP line is the last line of the payload; only the html footer follows it
+    start += len(marker)
+    end = theReport.rfind(b'\nSTOP',start)
+    if end < 0:
+        end = theReport.find(b'</div>',start)
+
+    payload = theReport[start:end if end > -1 else len(theReport)].strip()
+    if payload.startswith(b'START'):
+        payload = payload[5:].strip()
+    if payload.endswith(b'STOP'):
+        payload = payload[:-4].strip()
+
+    # Cut the blocks of the tables that were not selected out of the payload
+    if tableSelection:
+        selectedBlocks = list()
+        position = 0
+        blockStart = payload.find(b'@begin')
+
+        while blockStart > -1:
+            lineEnd = payload.find(b'\n',blockStart)
+            lineEnd = lineEnd if lineEnd > -1 else len(payload)
+
+            if isSkippedTable(payload[blockStart:lineEnd]):
+                blockEnd = payload.find(b'@end',lineEnd)
+                blockEnd = payload.find(b'\n',blockEnd) if blockEnd > -1 else -1
+                selectedBlocks.append(payload[position:blockStart])
+                position = blockEnd + 1 if blockEnd > -1 else len(payload)
+                blockStart = payload.find(b'@begin',position)
+            else:
+                blockStart = payload.find(b'@begin',lineEnd)
+
+        selectedBlocks.append(payload[position:])
+        payload = b''.join(selectedBlocks)
+
+    return list(map(str.strip,payload.decode('utf-8').split('\n'))) if payload else []
+
+## ===================================================================================
+def summarizeReportTransfer(transferStats):
+    # Description
+    # This function will report the number of bytes that were received from NASIS for the pedon
+    # requests.  Reports are requested with gzip/deflate compression; the number of bytes sent over
+    # the wire (compressed) is compared to the number of bytes after decompression.
+
+    # Parameters
+    # transferStats - list of (number of pedons, compressed bytes, uncompressed bytes, content encoding)
+    #                 tuples; one for every pedon request.
+
+    # Returns
+    # Nothing
+
+    try:
+        if not transferStats:
+            return
+
+        compressedBytes = sum([stat[1] for stat in transferStats])
+        uncompressedBytes = sum([stat[2] for stat in transferStats])
+        numOfCompressed = len([stat for stat in transferStats if stat[3] in ('gzip','deflate')])
+
+        AddMsgAndPrint(f".\nReceived {splitThousands(round(compressedBytes / 1048576.0,1))} MB from NASIS for {splitThousands(len(transferStats))} requests "
+                       f"({splitThousands(round(uncompressedBytes / 1048576.0,1))} MB uncompressed)")
+
+        if uncompressedBytes:
+            AddMsgAndPrint(f".\t{splitThousands(numOfCompressed)} compressed responses; bandwidth saved: {round(100 - (compressedBytes / uncompressedBytes * 100),1)}%")
+
+    except:
+        errorMsg()
+
+## ===================================================================================
+def openURL(url,bStream=False,failureType=None):
+    # Description
+    # This function will open a URL, read the lines and send back the response.
+    # It is used within the ThreadPoolExecutor to send multiple NASIS server
+    # requests.  The primary URL passed to this function from this script will be:
+    # https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_AnalysisPC_MAIN_URL_EXPORT&pedonid_list=14542
+    # This function also replaces the 'getPedonHorizon' function that not only opened
+    # the URL but also organized the contents into a dictionary that followed the NASIS schema.
+    # The function of organizing the URL content is now handled by the 'organizeFutureInstance' function
+
+    # When bStream is True the response is not read into memory as a whole.  The report is
+    # organized line by line while it is being received from the socket so parsing overlaps
+    # with the network transfer.  The records are collected in a dictionary of PedonTableBuffers
+    # that only belongs to this request and is merged into the pedonDBtablesDict by the caller.
+    # Reports are requested with gzip/deflate compression and are decompressed while they are
+    # streamed.  The compressed and uncompressed size of every report is added to the global
+    # reportTransferStats list along with the pedonID string of the request.
+    # If the global reportCache is set, reports are served from the on-disk cache without
+    # touching the network.  Reports that are downloaded are added to the cache.  In streaming
+    # mode a cached report that cannot be organized is removed and requested from NASIS.
+    # If the global reportArchive is set, streamed reports that were organized are archived.
+    # When a failureType list is passed, the reason the URL could not be opened is appended to it
+    # so the caller can tell an overloaded server ('timeout', 'server' (5xx or 429), 'connection')
+    # from a request NASIS rejected ('client' i.e. 414 URI Too Long) or a local error ('error').
+
+    # Parameters
+    # url - the url that connection will be establised to and whose contents will be returned.
+    # bStream - organize the report while it is being streamed instead of returning its lines
+    # failureType - optional list that the reason for returning None is appended to
+    # 1 global variable will be updated within this function.
+
+    # Returns
+    # This function returns the contents of a URL.  However, within this script, the openURL
+    # function is being called within the ThreadPoolExecutor asynchronous callables which returns
+    # a "future" object representing the execution of the callable.
+    # In streaming mode the dictionary of table lists is returned or the False result of
+    # organizeFutureInstanceIntoPedonDict (False or NASISreportFailure) if the report could not
+    # be organized.  None is returned if the URL could not be opened.
+
+    try:
+
+        # isolate the pedonIDs from the URL - strictly for formatting
+        thisPedonString = url.split('=')[2]
+        numOfPedonsInThisString = len(thisPedonString.split(','))
+
+        # Update Global variables
+        global i
+
+        """ Strictly for formatting print message """
+        if numOfPedonStrings > 1:
+            AddMsgAndPrint(".\tRequest " + splitThousands(i) + " of " + splitThousands(numOfPedonStrings) + " for " + str(numOfPedonsInThisString) + " pedons")
+            arcpy.SetProgressorLabel("Request " + splitThousands(i) + " of " + splitThousands(numOfPedonStrings) + " for " + str(numOfPedonsInThisString) + " pedons")
+        else:
+            AddMsgAndPrint("Retrieving pedon data from NASIS for " + str(numOfPedonsInThisString) + " pedons.")
+            arcpy.SetProgressorLabel("Retrieving pedon data from NASIS for " + str(numOfPedonsInThisString) + " pedons.")
+
+        # update request number
+        if not i == len(URLlist):
+            i+=1  # request number
+
+        # Serve the report from the on-disk cache
+        if reportCache:
+            theReport = reportCache.read(url)
+
+            if theReport is not None:
+                arcpy.SetProgressorLabel("")
+
+                if not bStream:
+                    return theReport
+
+                batchTablesDict = {table:records.newBuffer() for table,records in pedonDBtablesDict.items()}
+                organized = organizeFutureInstanceIntoPedonDict(theReport,batchTablesDict)
+
+                if organized:
+                    reportCache.servedURLs.discard(url)
+                    if reportArchive:
+                        reportArchive.write(url,theReport)
+                    return batchTablesDict
+
+                # the cached report is bad; request it from NASIS
+                AddMsgAndPrint(".\tThe cached report of this request could not be organized; requesting it from NASIS",1)
+                reportCache.servedURLs.discard(url)
+                reportCache.remove(url)
+
+        response = nasisSession.get(url, timeout=nasisTimeout, stream=bStream)
+        arcpy.SetProgressorLabel("")
+
+        if response.status_code != 200:
+            response.close()
+            AddMsgAndPrint(".\nFailed to open URL: " + str(url),2)
+
+            if failureType is not None:
+                failureType.append('server' if response.status_code >= 500 or response.status_code == 429 else 'client')
+            return None
+
+        if bStream:
+            batchTablesDict = {table:records.newBuffer() for table,records in pedonDBtablesDict.items()}
+            uncompressedBytes = [0]
+            bOrganized = False
+            cacheEntry = reportCache.newEntry(url) if reportCache else None
+            archiveEntry = reportArchive.newEntry() if reportArchive else None
+
+            # iter_lines decompresses the report as it is received; count the decompressed bytes
+            def reportLines():
+                for line in response.iter_lines(chunk_size=65536):
+                    uncompressedBytes[0] += len(line) + 1
+
+                    if cacheEntry:
+                        cacheEntry[2].write(line + b"\n")
+
+                    if archiveEntry:
+                        reportArchive.writeEntry(archiveEntry,line + b"\n")
+
+                    yield line
+
+            # Only complete reports that were organized are kept in the cache
+            try:
+                with response:
+                    bOrganized = organizeFutureInstanceIntoPedonDict(reportLines(),batchTablesDict)
+                    reportTransferStats.append((numOfPedonsInThisString,response.raw.tell(),uncompressedBytes[0],response.headers.get('Content-Encoding','identity'),thisPedonString))
+            finally:
+                if cacheEntry:
+                    reportCache.closeEntry(cacheEntry,bOrganized)
+
+            if archiveEntry:
+                reportArchive.closeEntry(archiveEntry,url,bOrganized)
+
+            return batchTablesDict if bOrganized else bOrganized
+
+        theReport = response.content
+        reportTransferStats.append((numOfPedonsInThisString,response.raw.tell(),len(theReport),response.headers.get('Content-Encoding','identity'),thisPedonString))
+
+        if reportCache:
+            reportCache.write(url,theReport)
+
+        return theReport
+
+    except requests.exceptions.HTTPError as e:
+        AddMsgAndPrint('HTTP Error' + str(e),2)
+        if failureType is not None:
+            failureType.append('server')
+        return None
+
+    except requests.exceptions.Timeout as e:
+        AddMsgAndPrint("Server Timeout Error", 2)
+        if failureType is not None:
+            failureType.append('timeout')
+        return None
+
+    except requests.exceptions.ConnectionError as e:
+        AddMsgAndPrint("NASIS Reports Website connection failure", 2)
+        if failureType is not None:
+            failureType.append('connection')
+        return None
+
+    except:
+        errorMsg()
+        if failureType is not None:
+            failureType.append('error')
+        return None
+
+## ===================================================================================
+class NASISreportCache:
+    """ On-disk cache of raw NASIS report responses.  Re-running an AOI extract or re-running after
+        a crash would otherwise download every pedon request again even if nothing has changed.
+
+        Every report is stored gzip compressed in the cache folder under the report name plus a
+        SHA1 hash of the sorted pedonIDs in the request, i.e.
+        WEB_AnalysisPC_MAIN_URL_EXPORT_3f786850e387550fdab836ed7e6dc881de23001b.gz
+
+        A cached report is used for ttlDays after it was downloaded (file modified time).  The last
+        time a report was used is kept in the file access time; when the cache grows beyond maxSizeMB
+        the least recently used reports are removed first (evict).
+
+        The URLs of the reports that were served from the cache are kept in servedURLs until the
+        fetch engine has organized them; a cached report that cannot be organized is removed and
+        requested from NASIS again."""
+
+    def __init__(self,cacheFolder,ttlDays=7,maxSizeMB=2048):
+
+        self.cacheFolder = cacheFolder
+        self.ttl = ttlDays * 86400
+        self.maxSize = maxSizeMB * 1048576
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.servedURLs = set()
+
+        if not os.path.exists(cacheFolder):
+            os.makedirs(cacheFolder)
+
+    def entryPath(self,url):
+        reportName = url.split('report_name=')[1].split('&')[0]
+        pedonIDs = sorted(url.split('pedonid_list=')[1].split(','))
+        key = hashlib.sha1(",".join(pedonIDs).encode('utf-8')).hexdigest()
+        return os.path.join(self.cacheFolder,f"{reportName}_{key}.gz")
+
+    def countLookup(self,bHit):
+        with self.lock:
+            if bHit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def read(self,url):
+        # returns the cached report (bytes) or None if it is not cached, expired or unreadable
+        path = self.entryPath(url)
+
+        try:
+            modifiedTime = os.path.getmtime(path)
+
+            if time.time() - modifiedTime > self.ttl:
+                os.remove(path)
+                self.countLookup(False)
+                return None
+
+            with gzip.open(path,'rb') as f:
+                theReport = f.read()
+
+            # update the access time for LRU eviction; keep the modified time for the TTL
+            os.utime(path,(time.time(),modifiedTime))
+            self.countLookup(True)
+            self.servedURLs.add(url)
+            return theReport
+
+        except FileNotFoundError:
+            self.countLookup(False)
+            return None
+
+        # corrupt or partially written cache file
+        except (OSError,EOFError):
+            self.remove(url)
+            self.countLookup(False)
+            return None
+
+    def write(self,url,theReport):
+        entry = self.newEntry(url)
+        entry[2].write(theReport)
+        self.closeEntry(entry,True)
+
+    def newEntry(self,url):
+        # returns (path, temporary path, open gzip file) for a report that will be written line by line.
+        # The report only shows up in the cache once closeEntry is called with bKeep=True.
+        path = self.entryPath(url)
+        tempPath = f"{path}.{threading.get_ident()}.tmp"
+        return (path,tempPath,gzip.open(tempPath,'wb',compresslevel=6))
+
+    def closeEntry(self,entry,bKeep):
+        path,tempPath,cacheFile = entry
+        cacheFile.close()
+
+        try:
+            if bKeep:
+                os.replace(tempPath,path)
+            else:
+                os.remove(tempPath)
+        except OSError:
+            pass
+
+    def remove(self,url):
+        try:
+            os.remove(self.entryPath(url))
+        except OSError:
+            pass
+
+    def evict(self):
+        # removes expired reports and then the least recently used reports until the cache is under maxSize.
+        # returns the number of reports removed
+        entries = list()
+        numOfRemoved = 0
+        now = time.time()
+
+        for fileName in os.listdir(self.cacheFolder):
+            path = os.path.join(self.cacheFolder,fileName)
+            fileStat = os.stat(path)
+
+            if fileName.endswith('.gz') and now - fileStat.st_mtime <= self.ttl:
+                entries.append((fileStat.st_atime,fileStat.st_size,path))
+                continue
+
+            # expired report or left over temporary file
+            try:
+                os.remove(path)
+                numOfRemoved += 1
+            except OSError:
+                pass
+
+        cacheSize = sum([entry[1] for entry in entries])
+
+        for lastAccess,fileSize,path in sorted(entries):
+            if cacheSize <= self.maxSize:
+                break
+            try:
+                os.remove(path)
+                cacheSize -= fileSize
+                numOfRemoved += 1
+            except OSError:
+                pass
+
+        return numOfRemoved
+
+## ===================================================================================
+class NASISreportArchive:
+    """ Append-only archive of the raw 'WEB_AnalysisPC_MAIN_URL_EXPORT' reports of a run.  When the
+        FGDB/SQLite template changes (new field, PII rule, alias fix) the pedon database can be rebuilt
+        from the archive with replayReportArchive instead of requesting every pedon from NASIS again.
+
+        Every report is gzip compressed on its own and appended to a segment file (segment_00001.gz,
+        segment_00002.gz...).  A new segment is started once a segment is larger than maxSegmentSizeMB.
+        For every report a line is appended to archive_index.txt:
+
+            runID|segment file|offset|compressed length|report name|pedonIDs
+            20261018093000|segment_00001.gz|0|48211|WEB_AnalysisPC_MAIN_URL_EXPORT|36186,59976,60464
+
+        Once the pedon requests of a run are done (closeRun) the pedonIDs that were requested are
+        written to run_<runID>_pedonIDs.txt and a line is appended to archive_runs.txt:
+
+            runID|# of pedons requested
+            20261018093000|6812
+
+        A run that is not in archive_runs.txt crashed or was cancelled and its reports are partial.
+
+        Nothing is ever rewritten.  Every run gets its own runID and a replay uses the reports of the
+        most recent complete run (replayRun); pedons that were requested but not archived in that run
+        are reported as missing."""
+
+    def __init__(self,archiveFolder,maxSegmentSizeMB=256):
+
+        self.archiveFolder = archiveFolder
+        self.indexPath = os.path.join(archiveFolder,"archive_index.txt")
+        self.runsPath = os.path.join(archiveFolder,"archive_runs.txt")
+        self.maxSegmentSize = maxSegmentSizeMB * 1048576
+        self.runID = time.strftime("%Y%m%d%H%M%S")
+        self.lock = threading.Lock()
+
+        if not os.path.exists(archiveFolder):
+            os.makedirs(archiveFolder)
+
+        segments = sorted([f for f in os.listdir(archiveFolder) if f.startswith("segment_") and f.endswith(".gz")])
+        self.segmentNumber = int(segments[-1][8:13]) if segments else 1
+
+    def segmentPath(self,segmentName):
+        return os.path.join(self.archiveFolder,segmentName)
+
+    def newEntry(self):
+        # returns a [compressor, list of compressed chunks] entry for a report that is written line by line
+        return [zlib.compressobj(6,zlib.DEFLATED,31),list()]
+
+    def writeEntry(self,entry,data):
+        entry[1].append(entry[0].compress(data))
+
+    def closeEntry(self,entry,url,bKeep):
+        if bKeep:
+            entry[1].append(entry[0].flush())
+            self.append(url,b"".join(entry[1]))
+
+    def write(self,url,theReport):
+        self.append(url,gzip.compress(theReport,compresslevel=6))
+
+    def append(self,url,compressedReport):
+        reportName = url.split('report_name=')[1].split('&')[0]
+        pedonIDs = url.split('pedonid_list=')[1]
+
+        with self.lock:
+            segmentName = f"segment_{self.segmentNumber:05d}.gz"
+            segmentPath = self.segmentPath(segmentName)
+            offset = os.path.getsize(segmentPath) if os.path.exists(segmentPath) else 0
+
+            # start a new segment
+            if offset and offset + len(compressedReport) > self.maxSegmentSize:
+                self.segmentNumber += 1
+                segmentName = f"segment_{self.segmentNumber:05d}.gz"
+                segmentPath = self.segmentPath(segmentName)
+                offset = 0
+
+            with open(segmentPath,'ab') as segment:
+                segment.write(compressedReport)
+
+            # the index line is only written once the report is in the segment
+            with open(self.indexPath,'a') as index:
+                index.write(f"{self.runID}|{segmentName}|{offset}|{len(compressedReport)}|{reportName}|{pedonIDs}\n")
+
+    def requestedPedonsPath(self,runID):
+        return os.path.join(self.archiveFolder,f"run_{runID}_pedonIDs.txt")
+
+    def closeRun(self,pedonIDs):
+        # records that the pedon requests of this run are done and the pedonIDs that were requested
+        pedonIDs = list(pedonIDs)
+
+        with self.lock:
+            with open(self.requestedPedonsPath(self.runID),'w') as requestedPedons:
+                requestedPedons.write(",".join([str(pedonID) for pedonID in pedonIDs]))
+
+            # the run is only complete once the line is written
+            with open(self.runsPath,'a') as runs:
+                runs.write(f"{self.runID}|{len(pedonIDs)}\n")
+
+    def completeRuns(self):
+        # returns the runIDs of the runs that were closed
+        if not os.path.exists(self.runsPath):
+            return []
+
+        with open(self.runsPath,'r') as runs:
+            return [line.split('|')[0] for line in runs if line.strip()]
+
+    def records(self):
+        # returns all of the index records
+        if not os.path.exists(self.indexPath):
+            return []
+
+        with open(self.indexPath,'r') as index:
+            return [line.strip().split('|') for line in index if line.strip()]
+
+    def replayRun(self):
+        # returns the runID of the most recent complete run and True or, if no run of the archive
+        # is complete, the runID of the most recent run and False.  None if the archive is empty.
+        archivedRuns = set([record[0] for record in self.records()])
+        completeRuns = [runID for runID in self.completeRuns() if runID in archivedRuns]
+
+        if completeRuns:
+            return max(completeRuns),True
+
+        return (max(archivedRuns) if archivedRuns else None),False
+
+    def index(self):
+        # returns the index records of the run that is replayed (replayRun)
+        runID = self.replayRun()[0]
+        return [record for record in self.records() if record[0] == runID]
+
+    def pedonIDs(self):
+        # returns the pedonIDs that were requested in the run that is replayed; the archived pedonIDs
+        # if the run did not record them
+        runID = self.replayRun()[0]
+
+        if runID and os.path.exists(self.requestedPedonsPath(runID)):
+            with open(self.requestedPedonsPath(runID),'r') as requestedPedons:
+                return [pedonID for pedonID in requestedPedons.read().split(',') if pedonID]
+
+        return [pedonID for record in self.index() for pedonID in record[5].split(',')]
+
+    def reports(self):
+        # yields the pedonIDs and the raw report (bytes) of every report of the most recent run
+        for runID,segmentName,offset,length,reportName,pedonIDs in self.index():
+            with open(self.segmentPath(segmentName),'rb') as segment:
+                segment.seek(int(offset))
+                yield pedonIDs.split(','),gzip.decompress(segment.read(int(length)))
+
+## ===================================================================================
+def replayReportArchive(archive):
+    # Description
+    # This function will organize every report of the most recent complete run of a NASISreportArchive
+    # into the pedonDBtablesDict.  No requests are sent to NASIS.
+
+    # Parameters
+    # archive - NASISreportArchive to replay
+
+    # Returns
+    # the number of reports that were replayed or False if the archive is empty.
+
+    try:
+        numOfReports = len(archive.index())
+
+        if not numOfReports:
+            AddMsgAndPrint(".\n\tThere are no reports in " + archive.archiveFolder,2)
+            return False
+
+        AddMsgAndPrint(".\nReplaying " + splitThousands(numOfReports) + " archived NASIS reports from " + archive.archiveFolder)
+        arcpy.SetProgressor("step", "Replaying archived NASIS reports", 0, numOfReports, 1)
+
+        for pedonIDs,theReport in archive.reports():
+            if not organizeFutureInstanceIntoPedonDict(theReport):
+                AddMsgAndPrint(".\tFailed to organize archived report for " + str(len(pedonIDs)) + " pedons",2)
+            arcpy.SetProgressorPosition()
+
+        arcpy.ResetProgressor()
+        return numOfReports
+
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+class AIMDController:
+    """ Additive-Increase/Multiplicative-Decrease (AIMD) controller for the number of pedon requests
+        that are sent to the NASIS Reports website at one time.  NASIS latency varies a lot during
+        the day so a fixed number of requests either underuses the server or causes socket timeouts.
+
+        The window (number of requests allowed in flight) grows by 1 for every window's worth of
+        successful responses as long as the p95 latency and the error rate of the most recent
+        responses stay under their targets.  A request that failed b/c of the server (timeout, 5xx,
+        429 or connection error; see openURL failureType) cuts the window by backoffFactor.  Requests
+        that NASIS rejected (4xx) and local cache or parse errors are not a sign of congestion and
+        are not recorded.  Only one cut is made per round of requests: failures of
+        requests that were sent before the last cut are ignored."""
+
+    def __init__(self,initialWindow=4,minWindow=1,maxWindow=16,latencyTarget=120,errorRateTarget=0.05,backoffFactor=0.5,sampleSize=20):
+
+        self.window = float(initialWindow)
+        self.minWindow = minWindow
+        self.maxWindow = maxWindow
+        self.latencyTarget = latencyTarget        # seconds; p95 latency that is considered healthy
+        self.errorRateTarget = errorRateTarget    # fraction of failed responses that is considered healthy
+        self.backoffFactor = backoffFactor
+
+        self.latencies = deque(maxlen=sampleSize) # latency of the most recent successful responses
+        self.outcomes = deque(maxlen=sampleSize)  # True/False for the most recent responses
+        self.lastDecrease = 0.0                   # time the window was last cut
+        self.inFlight = 0
+        self.condition = None                     # asyncio.Condition; created inside the event loop
+
+    def currentWindow(self):
+        return max(self.minWindow,int(self.window))
+
+    def p95Latency(self):
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def errorRate(self):
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def recordResponse(self,sentTime,latency,bSuccess):
+
+        self.outcomes.append(bSuccess)
+
+        if bSuccess:
+            self.latencies.append(latency)
+
+            # Additive increase: +1 per window's worth of healthy responses
+            if self.p95Latency() <= self.latencyTarget and self.errorRate() <= self.errorRateTarget:
+                self.window = min(self.maxWindow,self.window + 1.0 / self.currentWindow())
+
+        # Multiplicative decrease; only once per round of requests
+        elif sentTime >= self.lastDecrease:
+            self.window = max(self.minWindow,self.window * self.backoffFactor)
+            self.lastDecrease = time.time()
+
+    async def acquire(self):
+        if self.condition is None:
+            self.condition = asyncio.Condition()
+
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.inFlight < self.currentWindow())
+            self.inFlight += 1
+
+    async def release(self):
+        async with self.condition:
+            self.inFlight -= 1
+            self.condition.notify_all()
+
+## ===================================================================================
+def probeNASIS(coordinates,timeout=30):
+    # Description
+    # This function will check if the NASIS Reports website is up by requesting the cheap
+    # 'WEB_ANALYSIS_PC_PEDON_NUMBER_SUM' report for a tiny box.  The request is only sent once
+    # and is not retried.
+
+    # Parameters
+    # coordinates - bounding box of the probe i.e. "&Lat1=38.90&Lat2=38.91&Long1=-77.04&Long2=-77.03"
+    # timeout - seconds to wait for the server to send data
+
+    # Returns
+    # True if NASIS returned a valid report; False otherwise
+
+    try:
+        URL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_ANALYSIS_PC_PEDON_NUMBER_SUM' + coordinates
+        response = nasisSession.get(URL, timeout=(nasisConnectTimeout,timeout))
+
+        if response.status_code != 200:
+            return False
+
+        return response.content.find(b'<div id="ReportData">START') > -1
+
+    except:
+        return False
+
+## ===================================================================================
+class NASISCircuitBreaker:
+    """ Circuit breaker for the pedon requests.  When NASIS is down or in maintenance every request
+        would wait for its full socket timeout and then be retried.  After failureThreshold failed
+        requests in a row the breaker opens: no new requests are sent and NASIS is probed with
+        probeNASIS every probeInterval seconds.  Requests resume as soon as a probe succeeds.
+        If NASIS has not come back after maxOutage seconds the breaker gives up and the requests
+        that are waiting fail without being sent.
+
+        Only NASIS failures are counted: timeouts, connection errors, 5xx responses and reports
+        that are an ERROR or an error page.  4xx responses and reports that could not be organized
+        locally are not recorded either way."""
+
+    def __init__(self,failureThreshold=10,probeInterval=60,maxOutage=1800,probeBox="&Lat1=38.90&Lat2=38.91&Long1=-77.04&Long2=-77.03"):
+
+        self.failureThreshold = failureThreshold
+        self.probeInterval = probeInterval
+        self.maxOutage = maxOutage
+        self.probeBox = probeBox
+
+        self.consecutiveFailures = 0
+        self.bOpen = False
+        self.bGaveUp = False
+        self.openedTime = 0.0
+        self.numOfOutages = 0
+        self.condition = None       # asyncio.Condition; created inside the event loop
+        self.probeTask = None
+
+    def recordResponse(self,bSuccess):
+
+        if bSuccess:
+            self.consecutiveFailures = 0
+            return
+
+        self.consecutiveFailures += 1
+
+        if self.consecutiveFailures >= self.failureThreshold and not self.bOpen and not self.bGaveUp:
+            self.bOpen = True
+            self.openedTime = time.time()
+            self.numOfOutages += 1
+            AddMsgAndPrint(f".\n\t{self.consecutiveFailures} pedon requests failed in a row; pausing requests until the NASIS Reports website responds",1)
+
+    def waitForNASIS(self):
+        # Probes NASIS until it responds or maxOutage seconds have passed.  Returns True if NASIS is up.
+        startTime = time.time()
+
+        while not probeNASIS(self.probeBox):
+            if time.time() - startTime >= self.maxOutage:
+                AddMsgAndPrint(f".\nThe NASIS Reports website did not respond for {round(self.maxOutage / 60.0,1)} minutes",2)
+                return False
+
+            AddMsgAndPrint(f".\tThe NASIS Reports website is not responding; checking again in {self.probeInterval} seconds",1)
+            time.sleep(self.probeInterval)
+
+        return True
+
+    async def probe(self):
+        loop = asyncio.get_running_loop()
+
+        while self.bOpen:
+            await asyncio.sleep(self.probeInterval)
+
+            if await loop.run_in_executor(None,probeNASIS,self.probeBox):
+                AddMsgAndPrint(f".\tThe NASIS Reports website is responding again after {round((time.time() - self.openedTime) / 60.0,1)} minutes; resuming requests",1)
+                self.bOpen = False
+                self.consecutiveFailures = 0
+
+            elif time.time() - self.openedTime >= self.maxOutage:
+                AddMsgAndPrint(f".\nThe NASIS Reports website did not respond for {round(self.maxOutage / 60.0,1)} minutes; remaining requests are cancelled",2)
+                self.bOpen = False
+                self.bGaveUp = True
+
+        async with self.condition:
+            self.condition.notify_all()
+
+    async def waitUntilClosed(self):
+        # Returns True once requests can be sent; False if the breaker gave up on NASIS
+        if self.condition is None:
+            self.condition = asyncio.Condition()
+
+        if self.bOpen:
+            if self.probeTask is None or self.probeTask.done():
+                self.probeTask = asyncio.ensure_future(self.probe())
+
+            async with self.condition:
+                await self.condition.wait_for(lambda: not self.bOpen)
+
+        return not self.bGaveUp
+
+## ===================================================================================
+async def fetchPedonReports(URLlist,controller,maxRetries=4,retryBudget=100,baseDelay=2,maxDelay=60,bStream=False,secondsPerPedon=None,breaker=None,urlQueue=None,parseProcesses=0,parseBacklog=4,splitBudget=500):
+    # Description
+    # This function is the fetch engine for the 'WEB_AnalysisPC_MAIN_URL_EXPORT' pedon requests.
+    # It replaces ThreadPoolExecutor(max_workers=multiprocessing.cpu_count()) which tied the number
+    # of simultaneous NASIS requests to the number of cores on the machine.  The AIMD controller
+    # decides how many requests are in flight and adjusts it from the latency and failures of
+    # every response.  Each request is still a blocking requests call made by openURL so it is
+    # handed off to a thread pool that is sized to the controller's maximum window;
+    # no more threads are created than requests that are allowed to be in flight.
+    # Results are handed to organizeFutureInstanceIntoPedonDict in the order they complete,
+    # the same as concurrent.futures.as_completed.
+    #
+    # A request that fails (openURL returns None) is put back in line and retried after an
+    # exponential backoff with full jitter (random value between 0 and baseDelay * 2^n seconds
+    # where n is the number of retries already made, capped at maxDelay).  A request gives up after maxRetries retries or once the
+    # retryBudget for the whole run has been used up.  The request does not hold its slot in
+    # the controller window while it waits to be retried.
+    #
+    # A report that NASIS ends with an 'ERROR' line b/c of one malformed pedon (NASISreportFailure)
+    # would otherwise cost every pedon in the request.  Any records that were collected from it
+    # are removed and the request is split in half; each half is parsed with parsePedonsIntoLists
+    # and requested again.  This repeats until the offending pedons are isolated in requests of
+    # 1 pedon.  These are returned as poison pedons.  Splitting stops and the pedons are returned
+    # as unrecoverable when NASIS is failing rather than 1 pedon: both halves of a request fail
+    # with the same ERROR line, most of the last requests failed with an ERROR, or the splitBudget
+    # of requests for the whole run has been used up.  A report without records is not split; its
+    # pedons no longer exist in NASIS and are reported with the missing pedons at the end of the
+    # run.  The pedons of a report that could not be organized for any other reason are returned
+    # as unrecoverable.
+    #
+    # When bStream is True every report is organized by openURL while it is being received and
+    # only the organized records of a request are handed back and merged.  The raw report is never
+    # held in memory as a whole so memory is bounded by the number of requests in flight.
+    #
+    # If a urlQueue is passed, URLs that are put in it while the engine runs are requested as well
+    # until None is received (see streamAllPedonIDs).
+    #
+    # When parseProcesses is set the reports are not organized in this process.  The raw reports
+    # are put in a bounded parse queue and organized by a ProcessPoolExecutor of parser processes
+    # (parsePedonReport); the converted column buffers are sent back and merged as they complete.
+    # A request holds its slot in the controller window until its report is in the parse queue so
+    # no more reports are downloaded than the parsers can take (backpressure).  This replaces bStream.
+    # If the process pool fails (i.e. BrokenProcessPool b/c a parser process could not be started)
+    # the report is organized in this process and so is every report after it.
+    #
+    # If a NASISCircuitBreaker is passed, requests are paused while it is open (NASIS outage) and
+    # a request that failed while the breaker opened is sent again once NASIS responds without
+    # using up its retries.  If the breaker gives up on NASIS the remaining requests fail unsent.
+    #
+    # The latency and number of records per table of every request are added to the global
+    # fetchBatchStats list and the rows of every pedon to the global pedonRowCounts (PedonRowCounts).
+    # The rows are counted in a thread (countRowsPerPedon) so the next report is not held up.  The time left is estimated from secondsPerPedon (previous runs)
+    # until 5% of the pedons have been received and from the pace of this run after that.
+
+    # Parameters
+    # URLlist - list of pedon report URLs to request
+    # controller - AIMDController that sets the number of requests sent to NASIS at one time
+    # maxRetries - number of times a single request will be retried
+    # retryBudget - total number of retries allowed for all requests in this run
+    # baseDelay - max seconds to wait before the first retry
+    # maxDelay - max number of seconds to wait between retries
+    # bStream - organize reports while they are streamed from NASIS (see openURL)
+    # secondsPerPedon - fetch seconds per pedon of previous runs; None if there is no history
+    # breaker - NASISCircuitBreaker; None to send requests regardless of NASIS outages
+    # urlQueue - queue.Queue of additional URLs to request; None if URLlist is complete
+    # parseProcesses - number of parser processes; 0 to organize reports in this process
+    # parseBacklog - max number of raw reports waiting in the parse queue
+    # splitBudget - total number of requests that splitting failed requests may add in this run
+
+    # Returns
+    # 2 lists: pedonIDs from requests that could not be recovered after retrying or organized and
+    # pedonIDs that NASIS could not report on (poison pedons).
+    # The pedonDBtablesDict is populated by organizeFutureInstanceIntoPedonDict
+
+    loop = asyncio.get_running_loop()
+    numOfURLs = len(URLlist)
+    numOfCompleted = 0
+    numOfPedons = sum([len(url.split('=')[2].split(',')) for url in URLlist])
+    numOfPedonsDone = 0
+    fetchStartTime = time.time()
+    retriesLeft = [retryBudget]   # shared by all requests
+    splitsLeft = splitBudget
+    splitSiblings = dict()        # {url:url of the other half} of split requests that have not completed
+    splitOutcomes = dict()        # {url:ERROR line or None} of split requests whose other half has not completed
+    parkedSplits = dict()         # {url:pedonIDs} of failed split requests waiting for their other half
+    recentErrors = collections.deque(maxlen=20)   # True for every recent request that failed with an ERROR
+    unsplitPedons = 0             # pedons of failed requests that were not split
+    unrecoverablePedons = list()
+    poisonPedons = list()
+    parseQueue = asyncio.Queue(maxsize=parseBacklog) if parseProcesses else None
+    bParserFailed = [False]       # the parser processes failed; organize the reports in this process
+    rowCounters = set()           # countRowsPerPedon futures that have not completed
+
+    with ThreadPoolExecutor(max_workers=controller.maxWindow) as executor, \
+         (ProcessPoolExecutor(max_workers=parseProcesses,initializer=initReportParser,initargs=(tableFldDict,prefix,tableSelection)) if parseProcesses else contextlib.nullcontext()) as parser:
+
+        async def parse():
+            # Parse stage: hands the raw reports of the parse queue to the parser processes
+            while True:
+                theReport,parsedReport = await parseQueue.get()
+                try:
+                    parsedReport.set_result(await loop.run_in_executor(parser,parsePedonReport,theReport))
+                except Exception as e:
+                    parsedReport.set_exception(e)
+
+        def organizeReport(url,theReport):
+            # Organizes a raw report in this process when the parser processes are not available;
+            # returns the same as receiveParsedReport
+            batchTablesDict = {table:records.newBuffer() for table,records in pedonDBtablesDict.items()}
+            organized = organizeFutureInstanceIntoPedonDict(theReport,batchTablesDict)
+
+            if not organized:
+                if reportCache:
+                    reportCache.remove(url)
+                return organized
+
+            if reportArchive:
+                reportArchive.write(url,theReport)
+
+            return batchTablesDict
+
+        async def receiveParsedReport(url,theReport,parsedReport):
+            # Returns the dictionary of PedonTableBuffers of a parsed report or False (NASISreportFailure)
+            # if the report could not be organized; the same as openURL in streaming mode.
+            try:
+                organized,tableColumns,parserMessages = await parsedReport
+
+            except Exception as e:
+                if not bParserFailed[0]:
+                    AddMsgAndPrint(f".\tThe parser processes failed ({type(e).__name__}: {e}); pedon reports will be organized in this process",1)
+                    bParserFailed[0] = True
+
+                return organizeReport(url,theReport)
+
+            for msg,severity in parserMessages:
+                AddMsgAndPrint(msg,severity)
+
+            if organized is not True:
+                if reportCache:
+                    reportCache.remove(url)
+                return NASISreportFailure(*organized) if organized else False
+
+            if reportArchive:
+                reportArchive.write(url,theReport)
+
+            batchTablesDict = {table:records.newBuffer() for table,records in pedonDBtablesDict.items()}
+            for table,columns in tableColumns.items():
+                batchTablesDict[table].columns = columns
+
+            return batchTablesDict
+
+        async def fetch(url):
+            attempt = 0
+
+            while True:
+                await controller.acquire()
+                try:
+                    # Requests that were waiting for a slot when NASIS went down wait for it to come back
+                    if breaker and not await breaker.waitUntilClosed():
+                        return url,None,0.0
+
+                    sentTime = time.time()
+                    failureType = list()
+                    theReport = await loop.run_in_executor(executor, openURL, url, bStream and not parseProcesses, failureType)
+                    latency = time.time() - sentTime
+
+                    # Only a server that is struggling cuts the window; a 4xx or a local error says nothing about the load
+                    if theReport is not None:
+                        controller.recordResponse(sentTime,latency,True)
+                    elif failureType and failureType[0] in ('timeout','server','connection'):
+                        controller.recordResponse(sentTime,latency,False)
+
+                    # the response of a report is recorded once it is organized
+                    if breaker and theReport is None and failureType and failureType[0] in ('timeout','server','connection'):
+                        breaker.recordResponse(False)
+
+                    # Wait for room in the parse queue before the slot is given up
+                    if parseProcesses and theReport is not None and not bParserFailed[0]:
+                        parsedReport = loop.create_future()
+                        await parseQueue.put((theReport,parsedReport))
+                    else:
+                        parsedReport = None
+                finally:
+                    await controller.release()
+
+                if parseProcesses and theReport is not None:
+                    if parsedReport is None:
+                        return url,organizeReport(url,theReport),latency
+                    return url,await receiveParsedReport(url,theReport,parsedReport),latency
+
+                # NASIS is down; wait for it to come back instead of using up retries
+                if theReport is None and breaker and (breaker.bOpen or breaker.bGaveUp):
+                    continue
+
+                if theReport is not None or attempt >= maxRetries or retriesLeft[0] < 1:
+                    return url,theReport,latency
+
+                # the first retry waits up to baseDelay seconds, the second up to 2 * baseDelay...
+                delay = random.uniform(0,min(maxDelay,baseDelay * 2 ** attempt))
+                attempt += 1
+                retriesLeft[0] -= 1
+
+                AddMsgAndPrint(f".\tRetrying request for {len(url.split('=')[2].split(','))} pedons in {round(delay,1)} seconds (retry {attempt} of {maxRetries})",1)
+                await asyncio.sleep(delay)
+
+        pending = {asyncio.ensure_future(fetch(url)) for url in URLlist}
+        parsers = [asyncio.ensure_future(parse()) for parserNo in range(parseProcesses)]
+
+        # wait for the next URL of the urlQueue in a thread of its own
+        queueTask = asyncio.ensure_future(loop.run_in_executor(None,urlQueue.get)) if urlQueue else None
+        if queueTask:
+            pending.add(queueTask)
+
+        # handle reports as they are done; requests are added to pending when a report is split.
+        while pending:
+            done,pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+
+                # A new URL was received from the urlQueue
+                if task is queueTask:
+                    url = task.result()
+
+                    if url is not None:
+                        pending.add(asyncio.ensure_future(fetch(url)))
+                        numOfURLs += 1
+                        numOfPedons += len(url.split('=')[2].split(','))
+
+                        queueTask = asyncio.ensure_future(loop.run_in_executor(None,urlQueue.get))
+                        pending.add(queueTask)
+                    continue
+
+                url,theReport,latency = task.result()
+                pedonIDs = url.split('=')[2].split(',')
+                numOfCompleted += 1
+                bCachedReport = bool(reportCache) and url in reportCache.servedURLs
+
+                if theReport is None:
+                    unrecoverablePedons.extend(pedonIDs)
+                    numOfPedonsDone += len(pedonIDs)
+
+                else:
+                    # Streamed and parsed reports come back already organized; merge them
+                    if bStream or parseProcesses:
+                        organized = theReport
+                        bOrganized = isinstance(theReport,dict)
+
+                        if bOrganized:
+                            for table,records in theReport.items():
+                                if records:
+                                    pedonDBtablesDict[table].extend(records)
+
+                            batchTablesDict = theReport
+
+                    else:
+                        # number of records in every table before this report is organized
+                        tableLengths = {table:len(records) for table,records in pedonDBtablesDict.items()}
+                        organized = organizeFutureInstanceIntoPedonDict(theReport)
+                        bOrganized = bool(organized)
+
+                        # remove any records that were collected before the report failed
+                        if not bOrganized:
+                            for table,numOfRecords in tableLengths.items():
+                                del pedonDBtablesDict[table][numOfRecords:]
+
+                            if reportCache:
+                                reportCache.remove(url)
+
+                        else:
+                            batchTablesDict = {table:records[tableLengths[table]:] for table,records in pedonDBtablesDict.items()}
+
+                            if reportArchive:
+                                reportArchive.write(url,theReport)
+
+                    # A cached report that could not be organized was removed from the cache; request it from NASIS
+                    if bCachedReport:
+                        reportCache.servedURLs.discard(url)
+
+                        if not bOrganized:
+                            AddMsgAndPrint(".\tThe cached report of a request for " + str(len(pedonIDs)) + " pedons could not be organized; requesting it from NASIS",1)
+                            reportCache.remove(url)
+                            pending.add(asyncio.ensure_future(fetch(url)))
+                            numOfCompleted -= 1
+                            continue
+
+                    # NASIS responded with a report or with an error; local errors are not NASIS' fault
+                    if breaker:
+                        if bOrganized or getattr(organized,'reason',None) == 'EMPTY':
+                            breaker.recordResponse(True)
+                        elif getattr(organized,'reason',None) in ('ERROR','PAGE'):
+                            breaker.recordResponse(False)
+
+                    if bOrganized:
+                        fetchBatchStats.append((url.split('=')[2],latency,True,{table:len(records) for table,records in batchTablesDict.items()}))
+                        rowCounter = loop.run_in_executor(None,countRowsPerPedon,batchTablesDict,pedonTableTree)
+                        rowCounter.add_done_callback(lambda counter: pedonRowCounts.add(counter.result()))
+                        rowCounters.add(rowCounter)
+                        rowCounter.add_done_callback(rowCounters.discard)
+                        numOfPedonsDone += len(pedonIDs)
+                    else:
+                        fetchBatchStats.append((url.split('=')[2],latency,False,{}))
+                        failureReason = getattr(organized,'reason',None)
+
+                        # NASIS has no records for these pedons; they are reported with the missing pedons
+                        if failureReason == 'EMPTY':
+                            numOfPedonsDone += len(pedonIDs)
+
+                        # the report is not a NASIS error; splitting it would not isolate anything
+                        elif failureReason != 'ERROR':
+                            unrecoverablePedons.extend(pedonIDs)
+                            numOfPedonsDone += len(pedonIDs)
+
+                        # reports that failed with an ERROR are split below
+
+                # A split request is judged together with its other half; if both halves fail with
+                # the same ERROR line NASIS is failing, not 1 pedon
+                errorMessage = organized.message if theReport is not None and getattr(organized,'reason',None) == 'ERROR' else None
+                recentErrors.append(errorMessage is not None)
+                failedRequests = list()   # (pedonIDs,ERROR line) of the requests to split
+
+                sibling = splitSiblings.pop(url,None)
+                if sibling is None:
+                    if errorMessage is not None:
+                        failedRequests.append((pedonIDs,errorMessage))
+
+                elif sibling not in splitOutcomes:
+                    splitOutcomes[url] = errorMessage
+                    if errorMessage is not None:
+                        parkedSplits[url] = pedonIDs
+
+                else:
+                    siblingMessage = splitOutcomes.pop(sibling)
+                    siblingIDs = parkedSplits.pop(sibling,None)
+
+                    if errorMessage is not None and errorMessage == siblingMessage:
+                        AddMsgAndPrint(f".\tBoth halves of a failed request of {len(pedonIDs) + len(siblingIDs)} pedons failed the same way; they will not be split",1)
+                        unrecoverablePedons.extend(siblingIDs + pedonIDs)
+                        numOfPedonsDone += len(siblingIDs) + len(pedonIDs)
+                    else:
+                        if siblingIDs:
+                            failedRequests.append((siblingIDs,siblingMessage))
+                        if errorMessage is not None:
+                            failedRequests.append((pedonIDs,errorMessage))
+
+                for failedIDs,errorMessage in failedRequests:
+
+                    if len(failedIDs) == 1:
+                        AddMsgAndPrint(f".\tPedon {failedIDs[0]} could not be retrieved from NASIS",2)
+                        poisonPedons.extend(failedIDs)
+                        numOfPedonsDone += 1
+
+                    # NASIS is failing most requests or splitting has cost too many requests already
+                    elif splitsLeft < 2 or sum(recentErrors) > recentErrors.maxlen * 0.75:
+                        unsplitPedons += len(failedIDs)
+                        unrecoverablePedons.extend(failedIDs)
+                        numOfPedonsDone += len(failedIDs)
+
+                    else:
+                        baseURL = url[:url.find('pedonid_list=') + len('pedonid_list=')]
+                        half = len(failedIDs) // 2
+                        halfURLs = list()
+
+                        AddMsgAndPrint(f".\tSplitting failed request of {len(failedIDs)} pedons in half to isolate bad pedons",1)
+                        for halfOfPedons in (failedIDs[:half],failedIDs[half:]):
+                            for pedonString in parsePedonsIntoLists(halfOfPedons)[0]:
+                                halfURLs.append(baseURL + pedonString)
+                                pending.add(asyncio.ensure_future(fetch(baseURL + pedonString)))
+                                numOfURLs += 1
+                                splitsLeft -= 1
+
+                        if len(halfURLs) == 2:
+                            splitSiblings[halfURLs[0]] = halfURLs[1]
+                            splitSiblings[halfURLs[1]] = halfURLs[0]
+
+                # Estimate the time left from previous runs until this run has a pace of its own
+                if numOfPedonsDone >= numOfPedons * 0.05 or not secondsPerPedon:
+                    pace = (time.time() - fetchStartTime) / max(numOfPedonsDone,1)
+                else:
+                    pace = secondsPerPedon
+                minutesLeft = round(pace * (numOfPedons - numOfPedonsDone) / 60.0,1)
+
+                arcpy.SetProgressorLabel(f"Received {splitThousands(numOfCompleted)} of {splitThousands(numOfURLs)} requests -- "
+                                         f"{controller.currentWindow()} concurrent requests (p95 latency: {round(controller.p95Latency(),1)} sec) -- "
+                                         f"about {minutesLeft} minutes left")
+                arcpy.SetProgressorPosition()
+
+        for parserTask in parsers:
+            parserTask.cancel()
+
+        # wait for the rows of the last requests to be counted
+        if rowCounters:
+            await asyncio.wait(rowCounters)
+
+    if retriesLeft[0] < 1:
+        AddMsgAndPrint(f".\tThe retry budget of {retryBudget} retries was used up",1)
+
+    if unsplitPedons:
+        AddMsgAndPrint(f".\t{splitThousands(unsplitPedons)} pedons of requests that failed with an ERROR were not split; NASIS was failing most requests"
+                       + (f" or the split budget of {splitBudget} requests was used up" if splitsLeft < 2 else ""),1)
+
+    return unrecoverablePedons,poisonPedons
+
+## ===================================================================================
+def addPedonReportHyperlink(pedonFC):
+    # Description:
+    # This function will add a field called 'pedondescriptionreport' to the pedon layer to
+    # to store a hyperlink to the pedon description report for every user pedon ID.
+
+    # Parameters
+    # path to the 'pedon' layer within the output database
+
+    # Returns
+    # True if the data was organized correctly
+    # False if the object was empty or there was an error.
+
+    # 2 similar reports to choose from
+    #pedonDescLink = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=Pedon%20Description%20html%20(userpedid)&pedon_id='
+    #pedonDescLink = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=Pedon_Site_Description_usepedonid&pedon_id='
+
+    try:
+        arcpy.SetProgressorLabel("Adding Pedon Description Hyperlink to Pedon layer")
+
+        # New field that will be added to PedonFC
+        fieldName = "pedondescriptionreport"
+        arcpy.AddField_management(pedonFC, fieldName,'TEXT',field_length=215, field_alias="Pedon Description Report", field_is_nullable="NULLABLE")
+
+        expression = "createPedonDescLink(!upedonid!)"
+
+        codeblock = """
+def createPedonDescLink(pedonID):
+
+    pedonDescLink = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=Pedon_Site_Description_usepedonid&pedon_id=' + pedonID
+    #hyperLinkName = pedonID + r' Pedon Description Report'
+    hyperLinkName = r'Pedon Description Report'
+    arcGISProHyperLink = r'<a href="' + pedonDescLink + r'" target="_top">' + hyperLinkName + r'</a>'
+
+    return arcGISProHyperLink"""
+
+        # Execute CalculateField
+        arcpy.CalculateField_management(pedonFC, fieldName, expression, "PYTHON3",codeblock)
+        return True
+
+    except:
+        errorMsg()
+        return False
+
+## ===================================================================================
+def removePIIfields(pedonDB,fldsToDelete,tableFldDict):
+
+    try:
+
+        AddMsgAndPrint(f"\nDeleting attributes that may contain PII information from the following fields:" )
+        AddMsgAndPrint(f".\t{'Table Name' : <25}{'Field Name' : <25}")
+        AddMsgAndPrint(f".\t{'=' * 40}")
+
+        # Open Metadata table containing information for other pedon tables
+        theMDTable = f"{pedonDB}\{prefix}MetadataTable"
+        maxCharTable = max([len(table) for table in fldsToDelete]) + 1
+
+        for table in fldsToDelete:
+            tablePath = f"{pedonDB}\{table}"
+            tblAlias = tableFldDict[table][0]
+            fieldName = fldsToDelete[table]
+
+            if arcpy.Exists(tablePath):
+                try:
+                    arcpy.CalculateField_management(tablePath,fieldName,'""',"PYTHON3")
+                except:
+                    AddMsgAndPrint(f".\tFailed to remove attributes from {fieldName} field",1)
+
+                aliasExpression = f"{arcpy.AddFieldDelimiters(tablePath, 'tabphynm')} = \'{table}\' AND {arcpy.AddFieldDelimiters(tablePath, 'attphynm')} =  \'{fieldName}\'"
+                fldAlias = [row[0] for row in arcpy.da.SearchCursor(theMDTable, ("collab"), where_clause=aliasExpression)][0]
+                AddMsgAndPrint(f".\t{tblAlias : <25}{fldAlias: <25}")
+
+    except:
+        errorMsg()
+        return False
+
+#===================================================================================================================================
+""" ----------------------------------------My Notes -------------------------------------------------"""
+
+""" --------------- Column Headers
+Column order
+1.	Row_Number2,
+2.	upedonid,
+3.	peiid,
+4.	pedlabsampnum,
+5.	longstddecimaldegrees ,
+6.	latstddecimaldegrees
+                    ----------------------"""
+
+""" 1st Report """
+# If user choses to download all Pedons then the 1st report is to get a list of ALL NASIS pedonIDs:
+# https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_PEDON_PEIID_LIST_ALL_OF_NASIS'
+
+# If the user choses to download pedons by AOI then the 1st report is to get a count of pedons within a bounding box
+# https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_ANALYSIS_PC_PEDON_NUMBER_SUM&lat1=43&lat2=45&long1=-90&long2=-88
+
+""" 2nd Report """
+# Used to get a list of peiids based on bounding box coordinates; This peiid list will passed over to the 3rd report
+# https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_EXPORT_PEDON_BOX_COUNT&lat1=43&lat2=45&long1=-90&long2=-88
+
+""" 3rd Report """
+# This report will return all NASIS pedon related information that will be parsed into a FGDB.
+
+# Original Report URL
+# https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=TEST_sub_pedon_pc_6.1_phorizon&pedonid_list=
+
+# Updated Report URL
+# https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_AnalysisPC_MAIN_URL_EXPORT&pedonid_list=
+
+# Sample URL with pedonIDs:
+# https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_AnalysisPC_MAIN_URL_EXPORT&pedonid_list=36186,59976,60464,60465,101219,102867,106105,106106
+#===================================================================================================================================
+
+
+# =========================================== Main Body ==========================================
+# Import modules
+import sys, string, os, traceback, re, arcpy, socket, time, urllib, multiprocessing, requests, asyncio, random, gzip, hashlib, threading, zlib, sqlite3, queue, array, bisect, functools, contextlib, datetime, collections
+import NASISpedons_SQLite_Loader as sqliteLoader
+from arcpy import env
+from sys import getsizeof, stderr
+from itertools import chain
+from collections import deque
+
+from urllib.error import HTTPError, URLError
+from urllib.request import Request
+
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+if __name__ == '__main__':
+
+    try:
+
+        try:
+            # This set of parameters corresponds to the 'Extract Pedons from NASIS by AOI' tool
+            inputFeatures = arcpy.GetParameter(0)
+            DBname = arcpy.GetParameter(1)
+            outputFolder = arcpy.GetParameterAsText(2)
+            sqliteFormat = arcpy.GetParameter(3)
+            allPedons = arcpy.GetParameter(4)
+
+        except:
+            # This set of parameters corresponds to the 'Extract All Pedons from NASIS' tool
+            DBname = arcpy.GetParameter(0)
+            outputFolder = arcpy.GetParameterAsText(1)
+            sqliteFormat = arcpy.GetParameter(2)
+            allPedons = arcpy.GetParameter(3)
+
+##        inputFeatures = r'E:\Temp\scratch\scratch.gdb\PedonTest'
+##        DBname = 'PedonTest'
+##        outputFolder = r'E:\Temp\scratch'
+##        sqliteFormat = False
+##        allPedons = False
+
+        if sqliteFormat == True:
+            prefix = "main."
+        else:
+            prefix = ""
+
+        # Tables to extract: "" for all tables, a profile ("morphology", "lab") or a comma separated list of tables
+        pedonTableProfile = ""
+        tableSelection = getPedonTableSelection(pedonTableProfile)
+
+        arcpy.env.parallelProcessingFactor = "100%"
+        arcpy.env.overwriteOutput = True
+
+        # Connection settings for the NASIS Reports website.  All report requests share
+        # a single keep-alive session instead of opening a new connection per request.
+        minRequestsInFlight = 1      # the number of pedon requests sent to NASIS at one time is tuned by the
+        initialRequestsInFlight = 4  # AIMD controller between these limits; independent of CPU count
+        maxRequestsInFlight = 16
+        latencyTarget = 120          # seconds; p95 response time above which concurrency stops growing
+        maxRetriesPerRequest = 4     # number of times a failed pedon request is retried in this run
+        retryBudget = 100            # total number of retries allowed for all pedon requests in this run
+        splitBudget = 500            # total number of requests that splitting failed pedon requests may add in this run
+        bStreamReports = True        # organize pedon reports while they are received instead of reading them whole
+        parseProcesses = 0           # processes that organize pedon reports off the main process i.e. min(4,multiprocessing.cpu_count() - 1); 0 to use bStreamReports
+        parseBacklog = 8             # max number of downloaded reports waiting for a parser process
+        bBulkLoadSQLite = False      # load SQLite databases with sqlite3 instead of arcpy InsertCursors (bulkLoadSQLite); not yet verified with the ST_Geometry library
+        stGeometryLibrary = ""       # path to stgeometry_sqlite.dll (libstgeometry_sqlite.so); "" to use NASIS_STGEOMETRY_LIBRARY or the ArcGIS installation
+        bDeferIndexes = True         # SQLite only; remove the table indexes before the pedon data is imported and rebuild them afterwards
+
+        # ArcGIS Pro runs this script inside ArcGISPro.exe; parser processes must be started with its python
+        if parseProcesses > 0 and sys.platform == 'win32':
+            multiprocessing.set_executable(os.path.join(sys.exec_prefix,'pythonw.exe'))
+
+        bPipelineDiscovery = True    # all pedons: send pedon requests while the list of pedonIDs is still being received
+        fetchStatsDB = os.path.join(outputFolder,"NASIS_Pedon_Fetch_Stats.sqlite")  # per-request and per-pedon statistics of every run
+        nasisPoolSize = maxRequestsInFlight  # max number of pooled connections to the NASIS Reports website
+        nasisConnectTimeout = 15     # seconds to wait for a connection to be established
+        nasisReadTimeout = 300       # seconds to wait for the server to send data
+        nasisTimeout = (nasisConnectTimeout,nasisReadTimeout)
+        nasisSession = createNASISsession(nasisPoolSize)
+
+        # Circuit breaker for NASIS outages
+        breakerFailureThreshold = 10 # failed pedon requests in a row after which requests are paused and NASIS is probed
+        breakerProbeInterval = 60    # seconds between probes while NASIS is not responding
+        breakerMaxOutage = 30        # minutes to wait for NASIS to respond before the run is abandoned
+        nasisBreaker = NASISCircuitBreaker(breakerFailureThreshold,breakerProbeInterval,breakerMaxOutage * 60)
+
+        # On-disk cache of raw pedon reports from previous runs
+        bUseReportCache = False      # serve pedon reports from the cache instead of NASIS when available
+        reportCacheFolder = os.path.join(outputFolder,"NASIS_Report_Cache")
+        reportCacheTTL = 7           # days a cached report is used before it is requested from NASIS again
+        reportCacheMaxSize = 2048    # MB; least recently used reports are removed once the cache is larger
+
+        # Append-only archive of the raw pedon reports of a run that can be replayed without NASIS
+        bArchiveReports = False      # archive every pedon report of this run
+        reportArchiveFolder = os.path.join(outputFolder,str(DBname) + "_ReportArchive")
+        replayArchiveFolder = ''     # rebuild the database from the reports in this archive; no NASIS requests are made
+
+        textFilePath = outputFolder + os.sep + DBname + "_logFile.txt"
+        startTime = tic()
+
+        # Make sure NASIS is up before anything is requested; fails quickly during an outage
+        if not replayArchiveFolder and not nasisBreaker.waitForNASIS():
+            AddMsgAndPrint(".\nThe NASIS Reports website is unavailable.  Try again later",2)
+            exit()
+
+        # Statistics of previous runs used to plan the pedon requests
+        fetchStatsStore = PedonFetchStatsStore(fetchStatsDB)
+        pedonCostModel = PedonCostModel(fetchStatsStore)
+        bPipelined = allPedons and bPipelineDiscovery and not replayArchiveFolder
+
+        # Rebuild the pedon database from an archive of raw reports
+        if replayArchiveFolder:
+            replayArchive = NASISreportArchive(replayArchiveFolder)
+            replayRunID,bCompleteRun = replayArchive.replayRun()
+
+            if replayRunID and not bCompleteRun:
+                AddMsgAndPrint(".\nArchived run " + replayRunID + " did not complete; the pedon database will only have the pedons of the reports that were archived",1)
+
+            pedonDict = PedonIndex(replayArchive.pedonIDs())
+            totalPedons = len(pedonDict)
+
+            if not pedonDict:
+                AddMsgAndPrint(".\nThere are no pedons in the report archive: " + replayArchiveFolder,2)
+                exit()
+
+        # User has chosen to download all pedons; the list of pedonIDs is received in its own thread
+        # while the pedon database is created.  Pedon requests are sent as the pedonIDs arrive.
+        elif bPipelined:
+            pedonDict = PedonIndex()
+            URLlist = list()              # List of unique URLs of pedonIDs
+            numOfPedonStrings = 0
+            bPedonIDsComplete = False
+            pedonURLqueue = queue.Queue()
+            pedonIDthread = threading.Thread(target=streamAllPedonIDs,args=(pedonURLqueue,pedonCostModel),daemon=True)
+            pedonIDthread.start()
+
+        # User has chosen to donwload all pedons
+        elif allPedons:
+            pedonDict = getDictionaryOfAllPedonIDs()
+            totalPedons = len(pedonDict)
+            #pedonDict = dict(d.items()[len(d)/2:])
+
+            AddMsgAndPrint(".\nProcessing " + str(splitThousands(totalPedons)) + " pedons")
+
+            if not pedonDict:
+                AddMsgAndPrint(".\nFailed to obtain a list of ALL NASIS Pedon IDs",2)
+                exit()
+
+        # User has chosen to extract pedons by AOI
+        else:
+
+            # Get Bounding box coordinates of AOI
+            # Lat1 = 43.8480050;Lat2 = 44.1962;Long1 = -93.7678808;Long2 = -93.40649;
+            Lat1,Lat2,Long1,Long2 = getBoundingCoordinates(inputFeatures)
+
+            if not Lat1:
+                AddMsgAndPrint(".\nFailed to acquire Lat/Long coordinates to pass over; Try a new input feature",2)
+                exit()
+
+            coordStr = "&Lat1=" + str(Lat1) + "&Lat2=" + str(Lat2) + "&Long1=" + str(Long1) + "&Long2=" + str(Long2)
+
+            # Get a number of PedonIDs that are within the bounding box from NASIS
+            # Exit if pedon count is 0
+            # Uses the 'WEB_ANALYSIS_PC_PEDON_NUMBER_SUM' NASIS report
+            areaPedonCount = getNASISpedonCountbyBox(coordStr)
+
+            if areaPedonCount:
+                AddMsgAndPrint(".\tThere are " + splitThousands(areaPedonCount) + " pedons within the bounding coordinates")
+            else:
+                AddMsgAndPrint(".\nThere are no records found within the area of interest.  Try using a larger area",2)
+                exit()
+
+            # Get a list of PedonIDs that are within the bounding box from NASIS
+            # Uses the 'WEB_EXPORT_PEDON_BOX_COUNT' NASIS report
+            # populate the pedonDict with the pedons that fall within the bounding coordinates of the AOI
+            # PedonIndex of peiid: (siteID,Labnum,X,Y) -- pedonDict['122647'] = ('84IA0130011', '85P0558', -92.3241653, 42.3116684)
+            pedonDict = getNASISpedonIDsByBox(coordStr)
+
+            if not pedonDict:
+                AddMsgAndPrint(".\n\tFailed to get a list of pedonIDs from NASIS \n",2)
+                exit()
+
+            # Filter pedons by those that fall completely within the AOI; This will update the pedonDict
+            totalPedons = filterPedonsByFeature(inputFeatures)
+
+            if not totalPedons:
+                AddMsgAndPrint(".\n\tFailed to filter list of Pedons by Area of Interest. EXITING! \n",2)
+                exit()
+
+            """ ------------------------------------------------------Create New File Geodatabaes and get Table Aliases for printing -------------------------------------------------------------------
+                Create a new FGDB using a pre-established XML workspace schema.  All tables will be empty
+                and relationships established.  A dictionary of empty lists will be created as a placeholder
+                for the values from the XML report.  The name and quantity of lists will be the same as the FGDB"""
+
+        # Create a FGDB or sqlite database
+        pedonDB = createPedonDB()
+        arcpy.env.workspace = pedonDB
+
+        if not pedonDB:
+            AddMsgAndPrint(".\nFailed to Initiate Empty Pedon Database.  Error in createPedonDB() function. Exiting!",2)
+            exit()
+
+        # Create 2 Dictionaries that will be used throughout this script
+        pedonDBtablesDict,tableFldDict = createReferenceObjects(pedonDB)
+
+        if not tableFldDict:
+            AddMsgAndPrint(".\nCould not retrieve alias names from " + prefix + "\'MetadataTable\'",1)
+            exit()
+
+        """ ------------------------------------------ Get Site, Pedon, and Pedon Horizon information from NASIS -------------------------------------------------------------------------
+        ----------------------------------------------- Uses the 'WEB_AnalysisPC_MAIN_URL_EXPORT' NASIS report ---------------------------------------------------------------------------
+        In order to request pedon information, the pedonIDs need to be split up into manageable
+        lists of about 265 pedons due to URL limitations.  Submit these individual lists of pedon
+        to the server """
+
+        # Organize the reports of a previous run; no requests are sent to NASIS
+        if replayArchiveFolder:
+            reportArchive = None
+            numOfPedonStrings = replayReportArchive(replayArchive)
+            i = numOfPedonStrings
+
+            if not numOfPedonStrings:
+                AddMsgAndPrint(".\nFailed to replay the report archive: " + replayArchiveFolder,2)
+                exit()
+
+        # Pedon requests are already being planned by streamAllPedonIDs
+        elif bPipelined:
+            i = 1   # represents the request number; only used for ArcMap formatting
+            arcpy.SetProgressor("default", "Sending Pedon Requests")
+
+        else:
+            # Pack pedonIDs into requests by estimated report size; about 265 field pedons per request
+            listOfPedonStrings,numOfPedonStrings = planPedonBatches(pedonCostModel)
+
+            if numOfPedonStrings > 1:
+                AddMsgAndPrint("\nDue to URL limitations there will be " + splitThousands(len(listOfPedonStrings))+ " seperate requests to NASIS:",1)
+            else:
+                AddMsgAndPrint(".\n")
+
+            i = 1   # represents the request number; only used for ArcMap formatting
+
+            multiThreadStartTime = tic()
+            URLlist = list()              # List of unique URLs of pedonIDs
+            futureResults = []            # List of html results from opening URLs
+
+            # Iterate through a list of pedons strings to create a list of URLs by concatenating the URL
+            # base with the pedon strings.
+            for pedonString in listOfPedonStrings:
+                URL = r'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx?report_name=WEB_AnalysisPC_MAIN_URL_EXPORT&pedonid_list=' + pedonString
+                URLlist.append(URL)
+
+            arcpy.SetProgressor("step", "Sending Pedon Requests", 0, len(URLlist), 1)
+
+        if not replayArchiveFolder:
+            # Send the pedon requests through the asyncio fetch engine.  The number of requests
+            # sent to NASIS at one time is adjusted by the AIMD controller from NASIS response times.
+            fetchController = AIMDController(initialRequestsInFlight,minRequestsInFlight,maxRequestsInFlight,latencyTarget)
+            reportTransferStats = list()  # (# of pedons, compressed bytes, uncompressed bytes, encoding, pedonIDs) for every request
+            reportCache = NASISreportCache(reportCacheFolder,reportCacheTTL,reportCacheMaxSize) if bUseReportCache else None
+            reportArchive = NASISreportArchive(reportArchiveFolder) if bArchiveReports else None
+            fetchBatchStats = list()      # (pedonIDs, seconds, organized, {table:# of records}) for every request
+            pedonRowCounts = PedonRowCounts()  # peiids and their # of rows
+            pedonTableTree = getPedonTableTree(tableFldDict)
+            fetchStartTime = time.time()
+            unrecoverablePedons,poisonPedons = asyncio.run(fetchPedonReports([] if bPipelined else URLlist,fetchController,maxRetriesPerRequest,retryBudget,bStream=bStreamReports,
+                                                                             secondsPerPedon=fetchStatsStore.secondsPerPedon(),breaker=nasisBreaker,
+                                                                             urlQueue=pedonURLqueue if bPipelined else None,parseProcesses=parseProcesses,parseBacklog=parseBacklog,
+                                                                             splitBudget=splitBudget))
+
+            # Every pedon has been requested once the list of pedonIDs is complete
+            if bPipelined:
+                pedonIDthread.join()
+                totalPedons = len(pedonDict)
+
+                if not bPedonIDsComplete:
+                    AddMsgAndPrint(".\nFailed to obtain a list of ALL NASIS Pedon IDs",2)
+                    exit()
+
+                AddMsgAndPrint(".\nRequested " + str(splitThousands(totalPedons)) + " pedons in " + splitThousands(len(URLlist)) + " requests")
+
+            # Do not build a partial database when NASIS went down during the run
+            if nasisBreaker.bGaveUp:
+                AddMsgAndPrint(".\nThe NASIS Reports website became unavailable during the run.  Try again later",2)
+                exit()
+
+            # The archived run is complete; record the pedons that were requested so a replay reports the missing ones
+            if reportArchive:
+                reportArchive.closeRun(pedonDict.keys())
+
+            summarizeReportTransfer(reportTransferStats)
+            pedonCostModel.update(reportTransferStats)
+
+            # Record the statistics of this run and report pedons whose number of rows exploded
+            fetchRunID = fetchStatsStore.recordRun(len(pedonDict),time.time() - fetchStartTime,reportTransferStats,fetchBatchStats,pedonRowCounts,pedonCostModel)
+
+            if fetchRunID:
+                explodedPedons = fetchStatsStore.explodedPedons(fetchRunID)
+
+                if explodedPedons:
+                    AddMsgAndPrint(".\n" + splitThousands(len(explodedPedons)) + " pedons have more than 3 times the rows they had in a previous run:",1)
+                    for peiid,previousRows,numOfRows in explodedPedons[:10]:
+                        AddMsgAndPrint(f".\t\tPedon {peiid}: {splitThousands(previousRows)} rows -> {splitThousands(numOfRows)} rows",1)
+
+            if reportCache:
+                AddMsgAndPrint(f".\tReport cache: {splitThousands(reportCache.hits)} hits, {splitThousands(reportCache.misses)} misses")
+                reportCache.evict()
+
+            if unrecoverablePedons:
+                AddMsgAndPrint(".\n" + splitThousands(len(unrecoverablePedons)) + " pedons could not be retrieved from NASIS after retrying or could not be organized",2)
+
+            # Log pedons that NASIS could not report on into a text file
+            poisonFile = outputFolder + os.sep + DBname + "_poisonPedons.txt"
+
+            if os.path.exists(poisonFile):
+                os.remove(poisonFile)
+
+            if poisonPedons:
+                AddMsgAndPrint(".\n" + splitThousands(len(poisonPedons)) + " pedons caused NASIS report errors and were isolated from their requests",2)
+
+                with open(poisonFile,'w') as f:
+                    f.write("\n".join(poisonPedons))
+
+                AddMsgAndPrint(".\tThese pedons have been written to " + poisonFile,2)
+
+            arcpy.ResetProgressor()
+
+##        with ProcessPoolExecutor() as executor:
+##            for result in futureResults:
+##                organizeFutureInstanceIntoPedonDict(result)
+
+
+# The next 10 lines were used to test the ProcessPoolExecutor with arcpy.da.editor
+# The test was successful but it was way too slow.
+##        edit = arcpy.da.Editor(pedonDB)
+##        pedonDBtables = pedonDBtablesDict.keys()  # A list of pedonDB tables extracted from tblAliases dict
+##        pedonDBtables.sort()                       # Sort the list so that tables are alphabetical order
+##
+##        maxCharTable = max([len(table) for table in pedonDBtables]) + 1
+##        maxCharAlias = max([len(value[1]) for value in tblAliases.items()])
+##
+##        with ProcessPoolExecutor() as executor:
+##            for table in pedonDBtables:
+##                importPedonDataByTable(table)
+
+        # Import Pedon Information into Pedon FGDB
+        if len(pedonDBtablesDict[prefix + 'pedon']):
+
+            # Build the table indexes once the records are in instead of updating them for every record;
+            # they are rebuilt even if the import fails.
+            droppedIndexes = dropTableIndexes(pedonDB,tableFldDict) if bDeferIndexes and sqliteFormat else list()
+
+            try:
+                bImported = importPedonData(tableFldDict,verbose=(True if i==numOfPedonStrings else False))
+            finally:
+                if droppedIndexes:
+                    rebuildTableIndexes(pedonDB,droppedIndexes)
+
+            if not bImported:
+                exit()
+
+        # Pedon FGDB path
+        pedonDBfc = os.path.join(pedonDB,prefix + 'pedon')
+
+        # Add Hyperlink to Pedon Description Report
+        if addPedonReportHyperlink(pedonDBfc):
+            AddMsgAndPrint(".\nSuccessfully added Pedon Description Report Hyperlink to Pedon Table")
+        else:
+            AddMsgAndPrint(".\nPedon Description Report Hyperlink Could not be added",2)
+
+        # Remove fields that could potentially have PII
+        fldsToRemove = {'siteobstext':'textentry','sitetext':'textentry','petext':'textentry'}
+        fldsToRemove = {table:field for table,field in fldsToRemove.items() if prefix + table in tableFldDict}
+        if fldsToRemove:
+            removePIIfields(pedonDB,fldsToRemove,tableFldDict)
+
+        """ ------------------------------------ Report Summary of results -----------------------------------"""
+        pedonCount = int(arcpy.GetCount_management(pedonDBfc).getOutput(0))
+
+        # Text file that will be created with pedonIDs that did not get collected
+        errorFile = outputFolder + os.sep + os.path.basename(pedonDB).split('.')[0] + "_error.txt"
+
+        if os.path.exists(errorFile):
+            os.remove(errorFile)
+
+        if totalPedons == pedonCount:
+            AddMsgAndPrint(".\nSuccessfully downloaded " + splitThousands(totalPedons) + " pedons from NASIS")
+
+        else:
+            difference = totalPedons - pedonCount
+            AddMsgAndPrint(".\nDownloaded " + splitThousands(pedonCount) + " from NASIS",2)
+            AddMsgAndPrint(".\tFailed to download " + splitThousands(difference) + " pedons from NASIS:",2)
+
+            FGDBpedons = [str(row[0]) for row in arcpy.da.SearchCursor(pedonDBfc,'peiid')]
+            missingPedons = list(set(pedonDict.keys()) - set(FGDBpedons))
+
+            # Log pedons that did not download successfully into a text file
+            f = open(errorFile,'a+')
+            i=1
+            for miaPedon in missingPedons:
+                if i != len(missingPedons):
+                    f.write(miaPedon + "\n")
+                else:
+                    f.write(miaPedon)
+                i+=1
+            f.close()
+
+            if difference < 20:
+                AddMsgAndPrint(".")
+                AddMsgAndPrint(".\t\t" + str(missingPedons))
+
+            AddMsgAndPrint(".\n\tThe Missing Pedons have been written to " + errorFile + " files",2)
+
+        """ ---------------------------Add Pedon Feature Class to ArcGIS Pro Session if available ------------------"""
+        try:
+            if arcpy.GetCount_management(pedonDBfc).inputCount > 0:
+                aprx = arcpy.mp.ArcGISProject("CURRENT")
+                aprxMap = aprx.listMaps()[0]
+                aprxMap.addDataFromPath(pedonDBfc)
+                AddMsgAndPrint(".\nAdded the pedon feature class to your ArcGIS Pro Session\n\n")
+        except:
+            pass
+
+##        FinishTime = toc(startTime)
+##        AddMsgAndPrint("Total Time = " + str(FinishTime))
+##        AddMsgAndPrint(".\n")
+##        AddMsgAndPrint("Dictionary Size: " + str(getObjectSize(pedonDBtablesDict)))
+
+    except:
+        FinishTime = toc(startTime)
+        AddMsgAndPrint("Total Time = " + str(FinishTime))
+        #AddMsgAndPrint("Size of pedonDBtablesDict  = " + str(objSize) )
+        errorMsg()
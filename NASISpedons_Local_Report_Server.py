@@ -0,0 +1,560 @@
+#-------------------------------------------------------------------------------
+# Name:  NASISpedons_Local_Report_Server.py
+#
+# Author: Adolfo.Diaz
+# e-mail: adolfo.diaz@wi.usda.gov
+# phone: 608.662.4422 ext. 216
+#
+# Created:     10/18/2026
+# Copyright:   (c) Adolfo.Diaz 2026
+#
+# Local stand-in for the NASIS Reports website (limsreport.aspx) that serves synthetic
+# pedons.  It is used to benchmark and regression test the pedon extraction scripts without
+# sending any requests to nasis.sc.egov.usda.gov.  See NASISpedons_Benchmark_Local_Report_Server.py
+#
+# The following reports are emulated using the same layout as the NASIS Reports website:
+#
+#   WEB_PEDON_PEIID_LIST_ALL_OF_NASIS     START 1204126, 1204127, 1204128 STOP
+#   WEB_ANALYSIS_PC_PEDON_NUMBER_SUM      START 94 STOP
+#   WEB_EXPORT_PEDON_BOX_COUNT            Row_Number|upedonid|peiid|pedlabsampnum|long|lat|Undisclosed
+#   WEB_NASIS_Pedons_WFS_Metrics_AD       peiid|pedlabsampnum|Undisclosed
+#   WEB_AnalysisPC_MAIN_URL_EXPORT        @begin <table> ... @end for every table in the template
+#   WEB_Pedon_Web_Feature_Service         @begin <table> ... @end for the WFS tables
+#
+# The pedon tables and fields are read from the MetadataTable of the NASIS pedon SQLite template
+# (NASISPedonsSQLiteTemplate.sqlite) so that the reports line up with the tables that the
+# extraction scripts create.  Every pedon is generated from a seed and its pedonID so the
+# same pedon always returns the same records no matter how the pedons are batched.
+#
+# Latency, errors and payload size can be configured:
+#
+#   python NASISpedons_Local_Report_Server.py --port 8080 --pedons 100000 --latency 0.5 --http-error-rate 0.02
+#
+# The extraction scripts can be pointed at the server by replacing
+# 'https://nasis.sc.egov.usda.gov/NasisReportsWebSite/limsreport.aspx' with
+# 'http://localhost:8080/NasisReportsWebSite/limsreport.aspx'
+
+# Import modules
+import sys, os, traceback, random, time, gzip, socket, sqlite3, threading, argparse, urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from collections import OrderedDict
+
+## ===================================================================================
+def AddMsgAndPrint(msg, severity=0):
+    # prints message to screen
+    try:
+        print(msg)
+    except:
+        pass
+
+## ===================================================================================
+def errorMsg():
+    try:
+
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        theMsg = "\t" + traceback.format_exception(exc_type, exc_value, exc_traceback)[1] + "\n\t" + traceback.format_exception(exc_type, exc_value, exc_traceback)[-1]
+
+        if theMsg.find("exit") > -1:
+            AddMsgAndPrint("\n\n")
+            pass
+        else:
+            AddMsgAndPrint(theMsg,2)
+
+    except:
+        AddMsgAndPrint("Unhandled error in unHandledException method", 2)
+        pass
+
+## ===================================================================================
+def getReportSchema(templateDB,wfsTables=('site','siteobs','pedon')):
+    # Description
+    # This function will read the MetadataTable of the NASIS pedon SQLite template and return
+    # the tables and fields that the WEB_AnalysisPC_MAIN_URL_EXPORT report returns.  The
+    # fields of a table are the fields of the template table minus the OBJECTID and Shape
+    # fields.  The pedon table has 2 additional fields for the X,Y coordinates.
+
+    # Parameters
+    # templateDB - path to NASISPedonsSQLiteTemplate.sqlite
+    # wfsTables - tables that are returned by the WEB_Pedon_Web_Feature_Service report
+
+    # Returns
+    # a dictionary of tables; each table has a list of [alias name, list of (field, datatype)]
+    # i.e. {'petext': ['Pedon Text',[('peiidref','Integer'),('seqnum','Integer'),...]]}
+    # and a list of the WFS tables.  False,False is returned if anything goes wrong
+
+    try:
+        conn = sqlite3.connect(templateDB)
+
+        templateTables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+
+        # {(table,field):datatype} i.e. {('phorizon','hzdept'):'Integer'}
+        fieldTypes = dict()
+        tableAliases = dict()
+
+        for table,alias,field,dataType in conn.execute("SELECT tabphynm, tablab, attphynm, cholabtxt FROM MetadataTable ORDER BY tabphynm, coldefseq"):
+            fieldTypes[(table,field)] = dataType
+            if not table in tableAliases:
+                tableAliases[table] = alias
+
+        reportSchema = dict()
+
+        for table in sorted(tableAliases):
+
+            # The metadata table has more tables than what is in the DB template
+            if not table in templateTables or table.lower().find('metadata') > -1:
+                continue
+
+            fields = [row[1] for row in conn.execute(f"PRAGMA table_info('{table}')") if not row[1].lower() in ('objectid','oid','geometry','fid','shape')]
+            reportSchema[table] = [tableAliases[table],[(field,fieldTypes.get((table,field),'String')) for field in fields]]
+
+            # X,Y coordinates are added to the end of every pedon record
+            if table == 'pedon':
+                reportSchema[table][1].extend([('x','Float'),('y','Float')])
+
+        conn.close()
+        return reportSchema,[table for table in wfsTables if table in reportSchema]
+
+    except:
+        errorMsg()
+        return False,False
+
+## ===================================================================================
+class SyntheticPedons:
+    """ Collection of synthetic pedons that the local report server returns.  Every pedon has a
+        pedonID (peiid), user pedon ID, optional lab sample number, location and an undisclosed
+        flag.  The records of the WEB_AnalysisPC_MAIN_URL_EXPORT report are generated on request
+        from the seed and pedonID.
+
+        Pedon locations are clustered around survey areas within CONUS with a small number of
+        pedons scattered across the rest of the world so that pedon density is uneven like in NASIS."""
+
+    def __init__(self,reportSchema,numOfPedons=50000,seed=2016,horizonsPerPedon=6,childRecords=1,childTableFraction=0.25,
+                 textSize=300,splitRecordRate=0.01,poisonRate=0.0,undisclosedRate=0.05,labRate=0.10,cacheSize=10000):
+
+        self.reportSchema = reportSchema
+        self.seed = seed
+        self.horizonsPerPedon = horizonsPerPedon        # number of phorizon records per pedon
+        self.childRecords = childRecords                # number of records per pedon or horizon in the other tables
+        self.childTableFraction = childTableFraction    # fraction of the other tables that have records for a pedon
+        self.textSize = textSize                        # number of characters of narrative text values
+        self.splitRecordRate = splitRecordRate          # fraction of narrative text values that contain a line break
+        self.poisonRate = poisonRate                    # fraction of pedons that cause a NASIS report error
+
+        # Generating the records of a pedon is slow in python; the records of the most recently
+        # requested pedons are kept so that repeated benchmark runs are not limited by the server
+        self.cacheSize = cacheSize
+        self.recordCache = OrderedDict()
+        self.cacheLock = threading.Lock()
+
+        rand = random.Random(seed)
+
+        # Survey area clusters within CONUS (lat,long,std dev in degrees)
+        clusters = [(rand.uniform(25,49),rand.uniform(-124,-67),rand.uniform(0.2,2.5)) for i in range(60)]
+
+        self.pedonIDs = list()          # ordered list of pedonIDs
+        self.pedons = dict()            # {peiid:(upedonid,pedlabsampnum,long,lat,undisclosed)}
+
+        peiid = 1000000
+        for i in range(numOfPedons):
+            peiid += rand.randint(1,3)
+
+            # 2% of pedons are outside of CONUS
+            if rand.random() < 0.02:
+                lat,long = rand.uniform(-60,70),rand.uniform(-180,180)
+            else:
+                lat,long,stdDev = rand.choice(clusters)
+                lat = min(max(rand.gauss(lat,stdDev),24.0),49.0)
+                long = min(max(rand.gauss(long,stdDev),-125.0),-65.0)
+
+            labSampleNum = f"{rand.randint(40,99)}P{rand.randint(0,9999):04d}" if rand.random() < labRate else None
+            undisclosed = 'Y' if rand.random() < undisclosedRate else 'N'
+            userPedonID = f"S{rand.randint(1950,2026)}XX{rand.randint(1,199):03d}{rand.randint(1,999):03d}"
+
+            self.pedonIDs.append(str(peiid))
+            self.pedons[str(peiid)] = (userPedonID,labSampleNum,round(long,7),round(lat,7),undisclosed)
+
+    def pedonsInBox(self,lat1,lat2,long1,long2):
+        # returns the pedonIDs whose location is within the bounding coordinates
+        return [pedonID for pedonID in self.pedonIDs if lat1 <= self.pedons[pedonID][3] <= lat2 and long1 <= self.pedons[pedonID][2] <= long2]
+
+    def isPoison(self,pedonID):
+        # The same pedons always cause an error
+        return self.poisonRate > 0 and random.Random(f"poison-{self.seed}-{pedonID}").random() < self.poisonRate
+
+    def fieldValue(self,rand,field,dataType,keys):
+        # Description
+        # Returns a synthetic value for a field.  Key fields (peiid, siteiid, phiid...) are
+        # filled in from keys so that the records of a pedon are related to each other.
+
+        if field in keys:
+            return str(keys[field])
+
+        if field.endswith('iid') or field.endswith('iidref'):
+            return str(rand.randint(1,999999))
+
+        if field == 'seqnum':
+            return str(keys.get('seqnum',1))
+
+        if dataType in ('Integer','Boolean'):
+            return '' if rand.random() < 0.3 else str(rand.randint(0,1) if dataType == 'Boolean' else rand.randint(0,500))
+
+        if dataType == 'Float':
+            return '' if rand.random() < 0.3 else f"{rand.uniform(0,500):.4f}"
+
+        if dataType == 'Date/Time':
+            return f"{rand.randint(1,12)}/{rand.randint(1,28)}/{rand.randint(1950,2026)} 12:00:00 AM"
+
+        if dataType == 'Narrative Text':
+            text = " ".join(rand.choice(('loam','silt','clay','sandy','moist','friable','slope','gravelly','horizon','roots'))
+                            for i in range(max(self.textSize // 7,1)))[:self.textSize]
+
+            # NASIS does not escape line breaks within narrative text; the record continues on the next line
+            if rand.random() < self.splitRecordRate:
+                position = len(text) // 2
+                text = text[:position] + "\r\n" + text[position:]
+
+            return '"' + text + '"'
+
+        if rand.random() < 0.4:
+            return ''
+
+        return '"' + rand.choice(('very deep','well drained','moderately','Typic','loamy','mixed','mesic','active','superactive','NULL'))[:20] + '"'
+
+    def reportTables(self,pedonID,tables):
+        # Description
+        # Returns the records of a pedon for the requested tables.
+
+        # Returns
+        # a dictionary of {table:[record,record]} where every record is a '|' delimited string
+
+        cacheKey = (pedonID,tuple(tables))
+
+        with self.cacheLock:
+            if cacheKey in self.recordCache:
+                self.recordCache.move_to_end(cacheKey)
+                return self.recordCache[cacheKey]
+
+        records = self.generateTables(pedonID,tables)
+
+        with self.cacheLock:
+            self.recordCache[cacheKey] = records
+            while len(self.recordCache) > self.cacheSize:
+                self.recordCache.popitem(last=False)
+
+        return records
+
+    def generateTables(self,pedonID,tables):
+        # Generates the records of a pedon for the requested tables from the seed and pedonID
+
+        rand = random.Random(f"{self.seed}-{pedonID}")
+        userPedonID,labSampleNum,long,lat,undisclosed = self.pedons[pedonID]
+
+        peiid = int(pedonID)
+        siteiid = peiid + 5000000
+        siteobsiid = peiid + 6000000
+        horizonIDs = [peiid * 100 + h for h in range(self.horizonsPerPedon)]
+
+        keys = {'peiid':peiid,'peiidref':peiid,'siteiid':siteiid,'siteiidref':siteiid,'siteobsiid':siteobsiid,
+                'siteobsiidref':siteobsiid,'upedonid':f'"{userPedonID}"','usiteid':f'"{userPedonID}"',
+                'pedlabsampnum':f'"{labSampleNum}"' if labSampleNum else '','x':long,'y':lat,
+                'longstddecimaldegrees':long,'latstddecimaldegrees':lat}
+
+        records = dict()
+
+        for table in tables:
+            fields = self.reportSchema[table][1]
+
+            if table in ('pedon','site','siteobs'):
+                keySets = [{}]
+
+            elif table == 'phorizon':
+                keySets = [{'phiid':horizonIDs[h],'seqnum':h+1} for h in range(self.horizonsPerPedon)]
+
+            # only a fraction of the other tables have records for a pedon
+            elif rand.random() >= self.childTableFraction:
+                continue
+
+            # Horizon tables have records for every horizon
+            elif table.startswith('ph'):
+                keySets = [{'phiidref':horizonIDs[h],'seqnum':c+1} for h in range(self.horizonsPerPedon) for c in range(self.childRecords)]
+
+            else:
+                keySets = [{'seqnum':c+1} for c in range(self.childRecords)]
+
+            records[table] = ["|".join(self.fieldValue(rand,field,dataType,dict(keys,**keySet)) for field,dataType in fields) for keySet in keySets]
+
+        return records
+
+## ===================================================================================
+class LocalReportHandler(BaseHTTPRequestHandler):
+    """ Request handler for /NasisReportsWebSite/limsreport.aspx.  The server settings are
+        stored on the server object (self.server.settings)."""
+
+    protocol_version = "HTTP/1.1"   # keep-alive connections like the NASIS Reports website
+
+    def log_message(self,format,*args):
+        if self.server.settings.get('verbose'):
+            BaseHTTPRequestHandler.log_message(self,format,*args)
+
+    def do_GET(self):
+        try:
+            settings = self.server.settings
+            pedons = self.server.pedons
+            stats = self.server.stats
+
+            url = urllib.parse.urlsplit(self.path)
+            params = {key.lower():value[0] for key,value in urllib.parse.parse_qs(url.query).items()}
+            reportName = params.get('report_name','')
+            rand = random.Random()
+
+            with self.server.statsLock:
+                stats['requests'] += 1
+
+            if not url.path.lower().endswith('limsreport.aspx'):
+                return self.sendError(404)
+
+            """ --------------------------------------  Error Injection ------------------------------------"""
+            if rand.random() < settings['httpErrorRate']:
+                with self.server.statsLock:
+                    stats['httpErrors'] += 1
+                return self.sendError(rand.choice((500,502,503)))
+
+            """ --------------------------------------  Build the report ------------------------------------"""
+            if reportName == 'WEB_PEDON_PEIID_LIST_ALL_OF_NASIS':
+                pedonIDs = pedons.pedonIDs
+                reportLines = [", ".join(pedonIDs)]
+
+            elif reportName in ('WEB_ANALYSIS_PC_PEDON_NUMBER_SUM','WEB_EXPORT_PEDON_BOX_COUNT','WEB_NASIS_Pedons_WFS_Metrics_AD'):
+                pedonIDs = pedons.pedonsInBox(float(params['lat1']),float(params['lat2']),float(params['long1']),float(params['long2']))
+
+                if reportName == 'WEB_ANALYSIS_PC_PEDON_NUMBER_SUM':
+                    reportLines = [str(len(pedonIDs))]
+
+                elif reportName == 'WEB_EXPORT_PEDON_BOX_COUNT':
+                    reportLines = [f"{rowNum}|{pedons.pedons[pedonID][0]}|{pedonID}|{pedons.pedons[pedonID][1] or 'Null'}|{pedons.pedons[pedonID][2]}|{pedons.pedons[pedonID][3]}|{pedons.pedons[pedonID][4]}"
+                                   for rowNum,pedonID in enumerate(pedonIDs,1)]
+                else:
+                    reportLines = [f"{pedonID}|{pedons.pedons[pedonID][1] or 'Null'}|{pedons.pedons[pedonID][4]}" for pedonID in pedonIDs]
+
+            elif reportName in ('WEB_AnalysisPC_MAIN_URL_EXPORT','WEB_Pedon_Web_Feature_Service'):
+                pedonIDs = [pedonID for pedonID in params.get('pedonid_list','').split(',') if pedonID in pedons.pedons]
+                tables = self.server.wfsTables if reportName == 'WEB_Pedon_Web_Feature_Service' else sorted(pedons.reportSchema)
+                reportLines = self.pedonTableReport(pedonIDs,tables)
+
+            else:
+                return self.sendError(404)
+
+            """ --------------------------------------  Simulate NASIS response time ------------------------------------"""
+            # Listing pedons is much cheaper than reporting on them
+            if reportName in ('WEB_AnalysisPC_MAIN_URL_EXPORT','WEB_Pedon_Web_Feature_Service'):
+                latency = settings['latency'] + settings['latencyPerPedon'] * len(pedonIDs)
+            else:
+                latency = settings['latency'] + settings['latencyPerListedPedon'] * len(pedonIDs)
+
+            latency *= rand.lognormvariate(0,settings['latencyJitter']) if settings['latencyJitter'] else 1
+
+            # A few requests take much longer than the rest
+            if rand.random() < settings['slowRequestRate']:
+                latency *= settings['slowRequestFactor']
+
+            if latency > 0:
+                time.sleep(latency)
+
+            self.sendReport(reportName,reportLines,rand.random() < settings['dropRate'])
+
+        except (BrokenPipeError,ConnectionResetError):
+            pass
+
+        except:
+            errorMsg()
+            self.sendError(500)
+
+    def pedonTableReport(self,pedonIDs,tables):
+        # Description
+        # Returns the lines of the WEB_AnalysisPC_MAIN_URL_EXPORT report for a list of pedons.
+        # If one of the pedons is a poison pedon the report ends with an error message like
+        # NASIS does.
+
+        pedons = self.server.pedons
+        tableRecords = {table:[] for table in tables}
+        reportLines = list()
+
+        for pedonID in pedonIDs:
+            if pedons.isPoison(pedonID):
+                with self.server.statsLock:
+                    self.server.stats['reportErrors'] += 1
+                return [f"ERROR: An error occurred while running the report for pedon {pedonID}."]
+
+            for table,records in pedons.reportTables(pedonID,tables).items():
+                tableRecords[table].extend(records)
+
+        for table in tables:
+            reportLines.append(f"@begin {table}")
+            reportLines.append("|".join([field for field,dataType in pedons.reportSchema[table][1]]))
+            reportLines.extend(tableRecords[table])
+            reportLines.append("@end")
+
+        return reportLines
+
+    def sendReport(self,reportName,reportLines,bDropConnection=False):
+        # Description
+        # Wraps the report lines in the html envelope of the NASIS Reports website and sends
+        # them.  The response is gzip compressed if the client accepts it.  If bDropConnection
+        # is True the connection is closed half way through the response.
+
+        settings = self.server.settings
+        envelope = ['<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN" "http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">',
+                    '<html xmlns="http://www.w3.org/1999/xhtml">',
+                    f'<head><title>{reportName}</title></head>',
+                    '<body>',
+                    f'<form name="aspnetForm" method="post" action="./limsreport.aspx?report_name={reportName}" id="aspnetForm">',
+                    '<input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE" value="' + 'A' * settings['envelopeSize'] + '" />',
+                    '<div id="ReportData">START']
+
+        body = "\r\n".join(envelope + reportLines + ['STOP','</div>','</form>','</body>','</html>']).encode('utf-8')
+        uncompressedSize = len(body)
+
+        bGzip = 'gzip' in self.headers.get('Accept-Encoding','')
+        if bGzip:
+            body = gzip.compress(body,compresslevel=6)
+
+        self.send_response(200)
+        self.send_header('Content-Type','text/html; charset=utf-8')
+        self.send_header('Content-Length',str(len(body)))
+        if bGzip:
+            self.send_header('Content-Encoding','gzip')
+        self.end_headers()
+
+        with self.server.statsLock:
+            self.server.stats['bytesSent'] += len(body)
+            self.server.stats['bytesUncompressed'] += uncompressedSize
+
+        if bDropConnection:
+            with self.server.statsLock:
+                self.server.stats['droppedConnections'] += 1
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return
+
+        self.wfile.write(body)
+
+    def sendError(self,statusCode):
+        body = f"<html><body>Server Error {statusCode}</body></html>".encode('utf-8')
+        self.send_response(statusCode)
+        self.send_header('Content-Type','text/html; charset=utf-8')
+        self.send_header('Content-Length',str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+## ===================================================================================
+def startLocalReportServer(settings):
+    # Description
+    # This function will create the synthetic pedons and start the local report server
+    # on a background thread.
+
+    # Parameters
+    # settings - dictionary of server settings (see defaultSettings)
+
+    # Returns
+    # the ThreadingHTTPServer object; server.reportsURL is the base URL of limsreport.aspx.
+    # Use server.shutdown() to stop the server.  False is returned if the server could not start.
+
+    try:
+        theSettings = dict(defaultSettings)
+        theSettings.update(settings)
+
+        reportSchema,wfsTables = getReportSchema(theSettings['templateDB'],theSettings['wfsTables'])
+        if not reportSchema:
+            AddMsgAndPrint("\nCould not read the pedon schema from " + theSettings['templateDB'],2)
+            return False
+
+        server = ThreadingHTTPServer((theSettings['host'],theSettings['port']),LocalReportHandler)
+        server.daemon_threads = True
+        server.settings = theSettings
+        server.wfsTables = wfsTables
+        server.pedons = SyntheticPedons(reportSchema,theSettings['pedons'],theSettings['seed'],theSettings['horizonsPerPedon'],
+                                        theSettings['childRecords'],theSettings['childTableFraction'],theSettings['textSize'],
+                                        theSettings['splitRecordRate'],theSettings['poisonRate'],cacheSize=theSettings['cacheSize'])
+        server.stats = {'requests':0,'httpErrors':0,'reportErrors':0,'droppedConnections':0,'bytesSent':0,'bytesUncompressed':0}
+        server.statsLock = threading.Lock()
+        server.reportsURL = f"http://{theSettings['host']}:{server.server_address[1]}/NasisReportsWebSite/limsreport.aspx"
+
+        serverThread = threading.Thread(target=server.serve_forever,daemon=True)
+        serverThread.start()
+
+        return server
+
+    except:
+        errorMsg()
+        return False
+
+# =========================================== Main Body ==========================================
+defaultSettings = {'host':'127.0.0.1',
+                   'port':8080,
+                   'templateDB':os.path.join(os.path.dirname(os.path.abspath(__file__)),"NASISPedonsSQLiteTemplate.sqlite"),
+                   'wfsTables':('site','siteobs','pedon'),
+                   'pedons':50000,              # number of synthetic pedons in NASIS
+                   'seed':2016,                 # the same seed always creates the same pedons
+                   'horizonsPerPedon':6,
+                   'childRecords':1,            # records per pedon or horizon in the other pedon tables
+                   'childTableFraction':0.25,   # fraction of the other pedon tables that have records for a pedon
+                   'textSize':300,              # characters of narrative text values
+                   'splitRecordRate':0.01,      # fraction of narrative text values split across 2 lines
+                   'envelopeSize':20000,        # characters of html envelope (__VIEWSTATE) around every report
+                   'latency':0.2,               # seconds; base response time of every request
+                   'latencyPerPedon':0.002,     # seconds; additional response time per pedon in a pedon table report
+                   'latencyPerListedPedon':0.00002,  # seconds; additional response time per pedon in a pedon ID or count report
+                   'latencyJitter':0.3,         # sigma of the lognormal multiplier applied to the response time
+                   'slowRequestRate':0.02,      # fraction of requests that are much slower than the rest
+                   'slowRequestFactor':10,
+                   'httpErrorRate':0.0,         # fraction of requests that return HTTP 500/502/503
+                   'dropRate':0.0,              # fraction of requests whose connection is closed mid-response
+                   'poisonRate':0.0,            # fraction of pedons that cause a NASIS report error
+                   'cacheSize':10000,           # number of generated pedons kept in memory
+                   'verbose':False}
+
+if __name__ == '__main__':
+
+    try:
+        parser = argparse.ArgumentParser(description="Local stand-in for the NASIS Reports website that serves synthetic pedons")
+        parser.add_argument('--host',default=defaultSettings['host'])
+        parser.add_argument('--port',type=int,default=defaultSettings['port'])
+        parser.add_argument('--template',dest='templateDB',default=defaultSettings['templateDB'],help="NASIS pedon SQLite template containing the MetadataTable")
+        parser.add_argument('--pedons',type=int,default=defaultSettings['pedons'])
+        parser.add_argument('--seed',type=int,default=defaultSettings['seed'])
+        parser.add_argument('--horizons',dest='horizonsPerPedon',type=int,default=defaultSettings['horizonsPerPedon'])
+        parser.add_argument('--child-records',dest='childRecords',type=int,default=defaultSettings['childRecords'])
+        parser.add_argument('--child-table-fraction',dest='childTableFraction',type=float,default=defaultSettings['childTableFraction'])
+        parser.add_argument('--text-size',dest='textSize',type=int,default=defaultSettings['textSize'])
+        parser.add_argument('--split-record-rate',dest='splitRecordRate',type=float,default=defaultSettings['splitRecordRate'])
+        parser.add_argument('--envelope-size',dest='envelopeSize',type=int,default=defaultSettings['envelopeSize'])
+        parser.add_argument('--latency',type=float,default=defaultSettings['latency'])
+        parser.add_argument('--latency-per-pedon',dest='latencyPerPedon',type=float,default=defaultSettings['latencyPerPedon'])
+        parser.add_argument('--latency-per-listed-pedon',dest='latencyPerListedPedon',type=float,default=defaultSettings['latencyPerListedPedon'])
+        parser.add_argument('--latency-jitter',dest='latencyJitter',type=float,default=defaultSettings['latencyJitter'])
+        parser.add_argument('--slow-request-rate',dest='slowRequestRate',type=float,default=defaultSettings['slowRequestRate'])
+        parser.add_argument('--slow-request-factor',dest='slowRequestFactor',type=float,default=defaultSettings['slowRequestFactor'])
+        parser.add_argument('--http-error-rate',dest='httpErrorRate',type=float,default=defaultSettings['httpErrorRate'])
+        parser.add_argument('--drop-rate',dest='dropRate',type=float,default=defaultSettings['dropRate'])
+        parser.add_argument('--poison-rate',dest='poisonRate',type=float,default=defaultSettings['poisonRate'])
+        parser.add_argument('--cache-size',dest='cacheSize',type=int,default=defaultSettings['cacheSize'])
+        parser.add_argument('--verbose',action='store_true')
+        settings = vars(parser.parse_args())
+
+        server = startLocalReportServer(settings)
+        if not server:
+            exit()
+
+        AddMsgAndPrint(f"\nServing {len(server.pedons.pedonIDs):,} synthetic pedons at {server.reportsURL}")
+        AddMsgAndPrint("Press Ctrl+C to stop the server")
+
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            server.shutdown()
+            AddMsgAndPrint(f"\n{server.stats}")
+
+    except:
+        errorMsg()
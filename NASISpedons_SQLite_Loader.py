@@ -0,0 +1,246 @@
+#-------------------------------------------------------------------------------
+# Name:  NASISpedons_SQLite_Loader.py
+#
+# Author: Adolfo.Diaz
+# e-mail: adolfo.diaz@wi.usda.gov
+# phone: 608.662.4422 ext. 216
+#
+# Created:     10/18/2026
+# Copyright:   (c) Adolfo.Diaz 2026
+#
+# Loads pedon records into an ArcGIS SQLite pedon database (NASISPedonsSQLiteTemplate.sqlite)
+# with sqlite3 instead of arcpy InsertCursors.  This module does not use arcpy so the pedon
+# database can be loaded on machines without ArcGIS (i.e. Linux workers); it is used by
+# NASISpedons_Extract_Pedons_from_NASIS _MultiThreading_ArcGISPro_SQL.py (importPedonData).
+#
+# The pedon points (Shape) are ST_Geometry values that can only be created by the ST_Geometry
+# library for SQLite (stgeometry_sqlite.dll on Windows, libstgeometry_sqlite.so on Linux).
+# The library is taken from, in order:
+#
+#   the stGeometryLibrary argument
+#   the NASIS_STGEOMETRY_LIBRARY environment variable
+#   DatabaseSupport\SQLite of the ArcGIS installation folder (installDir argument)
+#
+# If the library cannot be loaded the pedon table is not loaded; the other tables are.
+#
+#   import NASISpedons_SQLite_Loader as sqliteLoader
+#   rowsLoaded = sqliteLoader.bulkLoadSQLite(r'E:\Pedons\Temp\test.sqlite',{'pedon':pedonColumns,'phorizon':phorizonColumns})
+
+# Import modules
+import sys, os, traceback, sqlite3, datetime
+
+## ===================================================================================
+def AddMsgAndPrint(msg, severity=0):
+    # prints message to screen; the extraction script passes its own function to bulkLoadSQLite
+    try:
+        print(msg)
+    except:
+        pass
+
+## ===================================================================================
+def errorMsg(AddMsgAndPrint=AddMsgAndPrint):
+    try:
+
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        theMsg = "\t" + traceback.format_exception(exc_type, exc_value, exc_traceback)[1] + "\n\t" + traceback.format_exception(exc_type, exc_value, exc_traceback)[-1]
+
+        if theMsg.find("exit") > -1:
+            AddMsgAndPrint("\n\n")
+            pass
+        else:
+            AddMsgAndPrint(theMsg,2)
+
+    except:
+        AddMsgAndPrint("Unhandled error in unHandledException method", 2)
+        pass
+
+## ===================================================================================
+def convertToJulianDay(value,julianDays={}):
+    # Converts a NASIS date ('4/15/1958 12:00:00 AM') to the Julian day stored in a realdate
+    # field of an ArcGIS SQLite database.  Values that are not dates are returned as is.
+    # Dates are cached in julianDays (not passed); most dates are repeated.
+    if value in julianDays:
+        return julianDays[value]
+
+    # The date is split instead of parsed with strptime which is far slower
+    try:
+        theDate,theTime,meridiem = (value.split(' ') + ['0:0:0','AM'])[:3]
+        month,day,year = theDate.split('/')
+        hours,minutes,seconds = theTime.split(':')
+        hours = int(hours) % 12 + (12 if meridiem.upper() == 'PM' else 0)
+        julianDay = datetime.date(int(year),int(month),int(day)).toordinal() + 1721424.5 + (hours * 3600 + int(minutes) * 60 + int(seconds)) / 86400.0
+    except (AttributeError,TypeError,ValueError):
+        return value
+
+    if len(julianDays) < 100000:
+        julianDays[value] = julianDay
+    return julianDay
+
+## ===================================================================================
+def getSTGeometryLibrary(stGeometryLibrary="",installDir=""):
+    # Description
+    # Returns the path to the ST_Geometry library for SQLite (stgeometry_sqlite.dll on Windows,
+    # libstgeometry_sqlite.so on Linux) that provides st_point and the spatial index functions
+    # used by the triggers of the pedon table.
+
+    # Parameters
+    # stGeometryLibrary - path to the library; "" to use the NASIS_STGEOMETRY_LIBRARY environment variable
+    # installDir - ArcGIS installation folder i.e. arcpy.GetInstallInfo()['InstallDir']; "" if there is none
+
+    # Returns
+    # the path to the library and a description of where it was looked for.  The path is None
+    # if the library was not found.
+
+    library = stGeometryLibrary or os.environ.get('NASIS_STGEOMETRY_LIBRARY','')
+
+    if library:
+        return (library if os.path.exists(library) else None),library
+
+    if installDir:
+        libraryFolder = os.path.join(installDir,"DatabaseSupport","SQLite")
+        libraries = (os.path.join(libraryFolder,"Windows64","stgeometry_sqlite.dll"),os.path.join(libraryFolder,"Linux64","libstgeometry_sqlite.so"))
+
+        for library in libraries:
+            if os.path.exists(library):
+                return library,library
+
+        return None,", ".join(libraries)
+
+    return None,"stGeometryLibrary and NASIS_STGEOMETRY_LIBRARY are not set"
+
+## ===================================================================================
+def bulkLoadSQLite(sqliteDB,tablesDict,stGeometryLibrary="",installDir="",tablePrefix="",progress=None,AddMsgAndPrint=AddMsgAndPrint):
+    # Description
+    # Loads the pedon tables of an ArcGIS SQLite database with sqlite3 instead of arcpy InsertCursors.
+    # Every table is loaded with executemany in a single transaction using a bulk load PRAGMA profile
+    # (no journal, no syncs, large cache) that is set back to the safe settings once the load is done.
+    # The fields of every table are read from the database (PRAGMA table_info).  Dates are stored as
+    # Julian days (realdate fields).
+    #
+    # The pedon point (Shape) is created with st_point of the ST_Geometry library (getSTGeometryLibrary);
+    # the insert trigger of the pedon table also updates its spatial index through it.  If the library
+    # cannot be loaded a warning is reported and the pedon table is left out; the caller loads it
+    # another way (i.e. an arcpy InsertCursor).
+    #
+    # A table that fails to load is reported along with the record that failed; the records that
+    # were inserted before it are kept the same as with an InsertCursor.
+
+    # Parameters
+    # sqliteDB - path to the pedon SQLite database
+    # tablesDict - {table name:columns}; the values of every field of the table in a list, in the order
+    #              of the fields of the table without OBJECTID and Shape.  The pedon table has 2 more
+    #              columns; the Y and X of the pedon point.  Values must be of the type of their field.
+    # stGeometryLibrary - path to the ST_Geometry library; see getSTGeometryLibrary
+    # installDir - ArcGIS installation folder; see getSTGeometryLibrary
+    # tablePrefix - prefix of the table names in the tablesDict ('main.'); removed from the names
+    # progress - optional function that is called with (table,# of records) before a table is loaded
+    # AddMsgAndPrint - function that is called with (message,severity) to report messages; print by default
+
+    # Returns
+    # a dictionary of the number of records added to every table that was loaded or False if the
+    # database could not be loaded.  The pedon table is missing if the library could not be loaded.
+
+    try:
+        rowsLoaded = dict()
+        pedonTable = tablePrefix + 'pedon'
+
+        conn = sqlite3.connect(sqliteDB,isolation_level=None)
+
+        try:
+            # The pedon table can only be loaded with the ST_Geometry library
+            if pedonTable in tablesDict and tablesDict[pedonTable] and len(tablesDict[pedonTable][0]):
+                library,searched = getSTGeometryLibrary(stGeometryLibrary,installDir)
+
+                try:
+                    if not library:
+                        raise FileNotFoundError(searched)
+
+                    conn.enable_load_extension(True)
+                    conn.execute("SELECT load_extension(?,'SDE_SQL_funcs_init')",(library,))
+
+                except Exception as e:
+                    AddMsgAndPrint(".\n\tThe ST_Geometry library for SQLite could not be loaded: " + str(e),1)
+                    AddMsgAndPrint(".\tSet stGeometryLibrary or the NASIS_STGEOMETRY_LIBRARY environment variable to the path of "
+                                   "stgeometry_sqlite.dll (libstgeometry_sqlite.so); the " + pedonTable + " table was not loaded",1)
+                    tablesDict = {table:columns for table,columns in tablesDict.items() if table != pedonTable}
+
+            conn.execute("PRAGMA journal_mode = OFF")
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.execute("PRAGMA cache_size = -524288")   # 512 MB
+            conn.execute("PRAGMA temp_store = MEMORY")
+            conn.execute("PRAGMA locking_mode = EXCLUSIVE")
+            conn.execute("BEGIN")
+
+            for table,columns in tablesDict.items():
+
+                numOfRecords = len(columns[0]) if columns else 0
+                if not numOfRecords:
+                    continue
+
+                tableName = table[len(tablePrefix):] if tablePrefix and table.startswith(tablePrefix) else table
+
+                if progress:
+                    progress(table,numOfRecords)
+
+                # Fields in the order of the records; skip the ObjectID and Shape fields
+                fieldInfo = [(row[1],row[2].lower()) for row in conn.execute(f"PRAGMA table_info([{tableName}])") if not (row[5] or row[2].lower() == 'geometryblob')]
+                fieldNames = ",".join([f"[{field}]" for field,fieldType in fieldInfo])
+
+                if len(columns) != len(fieldInfo) + (2 if table == pedonTable else 0):
+                    AddMsgAndPrint(".\n\tError in: " + table + " table",2)
+                    AddMsgAndPrint(".\tNumber of Fields in database: " + str(len(fieldInfo)),2)
+                    AddMsgAndPrint(".\tNumber of fields in report: " + str(len(columns)),2)
+                    rowsLoaded[table] = 0
+                    continue
+
+                dateColumns = [fieldNo for fieldNo,(field,fieldType) in enumerate(fieldInfo) if fieldType == 'realdate']
+                if dateColumns:
+                    columns = list(columns)
+                    for fieldNo in dateColumns:
+                        columns[fieldNo] = [convertToJulianDay(value) for value in columns[fieldNo]]
+
+                # The pedon point is created from the X,Y (last 2 values) of the record
+                if table == pedonTable:
+                    srid = conn.execute("SELECT srid FROM st_geometry_columns WHERE f_table_name = 'pedon'").fetchone()
+                    srid = srid[0] if srid else 4326
+                    insertSQL = f"INSERT INTO [{tableName}] ({fieldNames},[Shape]) VALUES ({','.join(['?'] * len(fieldInfo))},st_point(?,?,{srid}))"
+                    xValues = [x if isinstance(x,float) and isinstance(y,float) else 0.0 for x,y in zip(columns[-1],columns[-2])]
+                    yValues = [y if isinstance(x,float) and isinstance(y,float) else 90.0 for x,y in zip(columns[-1],columns[-2])]
+                    columns = list(columns[:len(fieldInfo)]) + [xValues,yValues]
+                else:
+                    insertSQL = f"INSERT INTO [{tableName}] ({fieldNames}) VALUES ({','.join(['?'] * len(fieldInfo))})"
+
+                # keep track of the record being inserted so a failed record can be reported
+                currentRecord = [0,None]
+                def tableRecords():
+                    for record in zip(*columns):
+                        currentRecord[0] += 1
+                        currentRecord[1] = record
+                        yield record
+
+                try:
+                    conn.executemany(insertSQL,tableRecords())
+                    rowsLoaded[table] = numOfRecords
+
+                except sqlite3.Error as e:
+                    AddMsgAndPrint(".\n\tError in :" + table + " table: " + str(currentRecord[1]),2)
+                    AddMsgAndPrint(".\n\t" + str(e),2)
+                    rowsLoaded[table] = currentRecord[0] - 1
+
+            conn.execute("COMMIT")
+
+        finally:
+            # Keep the records that were loaded (there is no journal to roll back) and
+            # set the safe settings for the finished database
+            if conn.in_transaction:
+                conn.execute("COMMIT")
+            conn.execute("PRAGMA locking_mode = NORMAL")
+            conn.execute("PRAGMA synchronous = FULL")
+            conn.execute("PRAGMA journal_mode = DELETE")
+            conn.close()
+
+        return rowsLoaded
+
+    except:
+        errorMsg(AddMsgAndPrint)
+        return False